@@ -0,0 +1,85 @@
+"""
+Preparing the wallet for many markets against a LocalNet-like algod stand-in: the
+previous per-asset flow (an `account_info` read for every opt-in and balance check, one
+opt-in group per asset, waiting for each) against the account mirror with batched
+opt-ins. Checks that the mirror matches the account afterwards.
+
+Usage: python benchmarks/bench_account_state.py
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from algokit_utils import AlgorandClient
+from algosdk import account, mnemonic
+from algosdk.v2client.algod import AlgodClient
+
+from stub_algod import StubAlgod
+from helpers.algorand_helper import AlgorandHelper
+from models.market import MarketCore
+
+MARKET_COUNT = 20
+BLOCK_TIME = 0.3
+
+
+def markets(first_asset_id: int):
+    return [
+        MarketCore(
+            id=f"bench-{index}", marketAppId=1000 + index, feeBasePercent=70_000,
+            yesAssetId=first_asset_id + 2 * index, noAssetId=first_asset_id + 2 * index + 1
+        )
+        for index in range(MARKET_COUNT)
+    ]
+
+
+async def per_asset(helper: AlgorandHelper, market_list) -> None:
+    address = helper.session.address
+    for market in market_list:
+        for asset_id in (market.yesAssetId, market.noAssetId):
+            info = helper.algod_client.account_info(address)
+            if not any(asset.get("asset-id") == asset_id for asset in info.get("assets", [])):
+                await helper.opt_in_to_asset(asset_id)
+    for market in market_list:
+        for asset_id in (helper.USDC_ASSET_ID, market.yesAssetId, market.noAssetId):
+            info = helper.algod_client.account_info(address)
+            next((asset["amount"] for asset in info["assets"] if asset["asset-id"] == asset_id), 0)
+
+
+async def mirrored(helper: AlgorandHelper, market_list) -> None:
+    await helper.opt_in_to_markets(market_list)
+    for market in market_list:
+        await helper.get_market_balances(market)
+
+
+def main() -> None:
+    private_key, address = account.generate_account()
+    os.environ["SENDER_MNEMONIC"] = mnemonic.from_private_key(private_key)
+
+    with StubAlgod(block_time=BLOCK_TIME) as algod:
+        algod.fund(address, 100_000_000, {AlgorandHelper.USDC_ASSET_ID: 500_000_000})
+        print(f"{MARKET_COUNT} markets, {2 * MARKET_COUNT} opt-ins, {3 * MARKET_COUNT} balance checks")
+        print(f"{'flow':<12} {'seconds':>8} {'algod reqs':>11} {'groups':>7}")
+        for name, flow, first_asset_id in (("per-asset", per_asset, 7_000_000), ("mirrored", mirrored, 8_000_000)):
+            helper = AlgorandHelper(AlgorandClient.from_clients(algod=AlgodClient("a" * 64, algod.url)))
+            market_list = markets(first_asset_id)
+            algod.reset_counters()
+            start = time.perf_counter()
+            asyncio.run(flow(helper, market_list))
+            elapsed = time.perf_counter() - start
+            print(f"{name:<12} {elapsed:>8.2f} {algod.request_count:>11} {algod.groups_submitted:>7}")
+
+        state = helper.account_state
+        info = helper.algod_client.account_info(address)
+        held = {asset["asset-id"]: asset["amount"] for asset in info["assets"]}
+        assert state.assets == held, "mirror assets differ from the account"
+        assert state.algo_balance == info["amount"], "mirror ALGO balance differs from the account"
+        assert state.min_balance == info["min-balance"], "mirror minimum balance differs from the account"
+        print(f"mirror matches account: {len(held)} assets, {state.spendable_algo} microALGO spendable")
+
+
+if __name__ == "__main__":
+    main()
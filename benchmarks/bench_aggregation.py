@@ -0,0 +1,90 @@
+"""
+Order aggregation: the original four-pass dict aggregation against the single-pass
+array-backed AlphaHelper._aggregate_orderbook, on books of 10k-100k escrows.
+
+Usage: python benchmarks/bench_aggregation.py
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fixtures import make_escrow_apps
+from helpers.alpha_helper import AlphaHelper
+from models.orderbook import OrderbookEntry
+
+ORDER_COUNTS = (10_000, 50_000, 100_000)
+REPEATS = 5
+MICRO_UNIT = 1_000_000
+
+
+def _filter_orders(orders: List[Dict[str, Any]], side: int, position: int) -> List[Dict[str, Any]]:
+    return [
+        order for order in orders
+        if (order.get('side') == side and
+            order.get('position') == position and
+            order.get('quantity', 0) > order.get('quantity_filled', 0) and
+            order.get('slippage', 0) == 0)
+    ]
+
+
+def _aggregate_orders(orders: List[Dict[str, Any]]) -> List[OrderbookEntry]:
+    price_map: Dict[int, int] = {}
+    for order in orders:
+        remaining_qty = order.get("quantity", 0) - order.get("quantity_filled", 0)
+        price = order.get("price", 0)
+        if remaining_qty > 0 and price > 0:
+            price_map[price] = price_map.get(price, 0) + remaining_qty
+    return [
+        OrderbookEntry(
+            price=round(price / MICRO_UNIT, 6),
+            quantity=round(quantity / MICRO_UNIT, 6),
+            total=round((price * quantity) / (MICRO_UNIT ** 2), 6)
+        )
+        for price, quantity in price_map.items()
+    ]
+
+
+def legacy_aggregate(orders: List[Dict[str, Any]]) -> Dict[str, Dict[str, List[OrderbookEntry]]]:
+    """The aggregation as it was before the array-backed path."""
+    return {
+        "yes": {"bids": _aggregate_orders(_filter_orders(orders, 1, 1)),
+                "asks": _aggregate_orders(_filter_orders(orders, 0, 1))},
+        "no": {"bids": _aggregate_orders(_filter_orders(orders, 1, 0)),
+               "asks": _aggregate_orders(_filter_orders(orders, 0, 0))},
+    }
+
+
+def best_of(run, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    alpha = AlphaHelper()
+    print(f"{'orders':>8} {'legacy_ms':>10} {'array_ms':>9} {'speedup':>8}")
+    for count in ORDER_COUNTS:
+        orders = [alpha.escrow_decoder.decode(app) for app in make_escrow_apps(count)]
+        order_dicts = [order.to_dict() for order in orders]
+
+        legacy = legacy_aggregate(order_dicts)
+        book = alpha._aggregate_orderbook(orders)
+        for position in ("yes", "no"):
+            for side in ("bids", "asks"):
+                expected = sorted((e.price, e.quantity) for e in legacy[position][side])
+                actual = sorted((e.price, e.quantity) for e in getattr(book, position)[side])
+                assert expected == actual, f"mismatch on {position} {side}"
+
+        legacy_ms = best_of(lambda: legacy_aggregate(order_dicts))
+        array_ms = best_of(lambda: alpha._aggregate_orderbook(orders))
+        print(f"{count:>8} {legacy_ms:>10.1f} {array_ms:>9.1f} {legacy_ms / array_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Orderbook snapshot latency against a local stub indexer, as the escrow count grows.
+
+Compares the sequential per-escrow lookup with EscrowStateFetcher, with and without
+`global-state` included in the creator lookup response.
+
+Usage: python benchmarks/bench_escrow_fetch.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from algosdk.v2client.indexer import IndexerClient
+
+from fixtures import make_escrow_apps
+from stub_indexer import StubIndexer
+from helpers.alpha_helper import AlphaHelper
+from helpers.escrow_fetcher import EscrowStateFetcher
+
+ESCROW_COUNTS = (50, 200, 1000)
+LATENCY = 0.002
+
+
+def sequential_snapshot(alpha: AlphaHelper, indexer: IndexerClient) -> int:
+    orders = indexer.lookup_account_application_by_creator("MARKET")
+    details = [alpha.escrow_decoder.decode(indexer.applications(app["id"])) for app in orders["applications"]]
+    alpha._aggregate_orderbook(details)
+    return len(details)
+
+
+def fetcher_snapshot(alpha: AlphaHelper, fetcher: EscrowStateFetcher) -> int:
+    details = [alpha.escrow_decoder.decode(app) for app in fetcher.fetch_applications("MARKET")]
+    alpha._aggregate_orderbook(details)
+    return len(details)
+
+
+def main() -> None:
+    alpha = AlphaHelper()
+    print(f"{'escrows':>8} {'mode':<28} {'requests':>9} {'latency_ms':>11}")
+    for count in ESCROW_COUNTS:
+        apps = make_escrow_apps(count)
+        for include_state in (False, True):
+            with StubIndexer(apps, latency=LATENCY, include_global_state=include_state) as stub:
+                indexer = IndexerClient("", stub.url)
+                fetcher = EscrowStateFetcher(indexer)
+                runs = [
+                    ("sequential", lambda: sequential_snapshot(alpha, indexer)),
+                    ("fetcher", lambda: fetcher_snapshot(alpha, fetcher)),
+                ]
+                for name, run in runs:
+                    if include_state and name == "sequential":
+                        continue
+                    stub.request_count = 0
+                    start = time.perf_counter()
+                    fetched = run()
+                    elapsed = (time.perf_counter() - start) * 1000
+                    assert fetched == count
+                    label = f"{name}{' (inline state)' if include_state else ''}"
+                    print(f"{count:>8} {label:<28} {stub.request_count:>9} {elapsed:>11.1f}")
+                fetcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+API call latency against a local mock server: blocking `requests` calls inside coroutines
+(as the helpers used to make them) against the shared pooled AsyncHttpClient.
+
+Reports wall time for a burst of concurrent calls, per-call p50/p99, connections opened
+and the worst event-loop stall observed while the burst ran.
+
+Usage: python benchmarks/bench_http_client.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+for name, value in (("INTERVAL_SECONDS", "5"), ("LOG_LEVEL", "INFO"), ("CONTAINER_NAME", "bench"),
+                    ("ODDS_API_KEY", "bench"), ("SENDER_MNEMONIC", "bench")):
+    os.environ.setdefault(name, value)
+
+import requests
+
+from fixtures import make_market, make_odds_events
+from stub_api import StubApi
+from helpers.alpha_helper import AlphaHelper
+from helpers.http_client import AsyncHttpClient
+from helpers.odds_helper import OddsAPIHelper
+
+MARKET_CALLS = 40
+ODDS_CALLS = 10
+LATENCY = 0.01
+
+
+async def watch_loop_lag(stop: asyncio.Event, interval: float = 0.001) -> float:
+    """Returns the largest delay seen between scheduled wake-ups of the event loop."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+async def run_burst(make_calls) -> dict:
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop_lag(stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(timed(call) for call in make_calls()))
+    wall = time.perf_counter() - start
+    stop.set()
+    lag = await watcher
+    latencies = sorted(latencies)
+    return {
+        "wall_ms": wall * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "stall_ms": lag * 1000,
+    }
+
+
+async def main() -> None:
+    market_body = make_market()
+    odds_body = make_odds_events(1)
+    routes = {
+        "/api/get-market": lambda query: (200, market_body, {}),
+        "/v4/sports/baseball_mlb/odds": lambda query: (200, odds_body, {}),
+    }
+
+    with StubApi(routes, latency=LATENCY) as stub:
+        market_url = f"{stub.url}/api/get-market"
+        odds_url = f"{stub.url}/v4/sports/baseball_mlb/odds/"
+
+        async def blocking_market():
+            requests.get(market_url, params={"marketId": "m"}).json()
+
+        async def blocking_odds():
+            requests.get(odds_url, params={"eventIds": "e"}).json()
+
+        def blocking_calls():
+            return [blocking_market() for _ in range(MARKET_CALLS)] + [blocking_odds() for _ in range(ODDS_CALLS)]
+
+        http_client = AsyncHttpClient()
+        alpha = AlphaHelper(http_client=http_client)
+        alpha.BASE_API_URL = f"{stub.url}/api"
+        odds = OddsAPIHelper(http_client=http_client)
+        odds.base_url = f"{stub.url}/v4/sports"
+
+        def pooled_calls():
+            return ([alpha.get_market_info("m") for _ in range(MARKET_CALLS)] +
+                    [odds.get_matchup_odds("baseball_mlb", "e") for _ in range(ODDS_CALLS)])
+
+        print(f"{MARKET_CALLS} market + {ODDS_CALLS} odds calls, {LATENCY * 1000:.0f} ms server latency, "
+              f"http2={http_client.http2}")
+        print(f"{'client':<24} {'wall_ms':>8} {'p50_ms':>8} {'p99_ms':>8} {'stall_ms':>9} {'conns':>6}")
+        for name, calls in (("requests (blocking)", blocking_calls), ("AsyncHttpClient", pooled_calls),
+                            ("AsyncHttpClient warm", pooled_calls)):
+            stub.reset_counters()
+            result = await run_burst(calls)
+            print(f"{name:<24} {result['wall_ms']:>8.1f} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+                  f"{result['stall_ms']:>9.1f} {stub.connection_count:>6}")
+
+        await http_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
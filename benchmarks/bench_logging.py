@@ -0,0 +1,116 @@
+"""
+Logging cost on the event loop per orderbook snapshot: the previous synchronous
+RotatingFileHandler with eager f-string messages (the full order list at INFO) against
+the queue-based pipeline with lazy, structured records, plus per-order messages with
+and without sampling and the cost of a `get_logger` call.
+
+Usage: python benchmarks/bench_logging.py
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fixtures import make_escrow_apps
+from helpers.alpha_helper import AlphaHelper
+from helpers.log_helpers import get_logger, log_queue_size, set_sample_rate, shutdown_logging
+
+ESCROW_COUNT = 1000
+SNAPSHOTS = 50
+MARKET_APP_ID = 1000
+
+
+def legacy_logger(name: str, folder: str) -> logging.Logger:
+    """The previous get_logger: makedirs on every call and a synchronous file handler per logger."""
+    os.makedirs(folder, exist_ok=True)
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if logger.handlers:
+        return logger
+    handler = RotatingFileHandler(os.path.join(folder, "legacy.log"), maxBytes=10 * 1024 * 1024, backupCount=5, encoding='utf-8')
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", "%Y-%m-%d %H:%M:%S"))
+    logger.addHandler(handler)
+    return logger
+
+
+def per_snapshot_ms(run) -> float:
+    # Let the writer catch up first so earlier cases do not compete with this one
+    while log_queue_size():
+        time.sleep(0.01)
+    start = time.perf_counter()
+    for _ in range(SNAPSHOTS):
+        run()
+    return (time.perf_counter() - start) / SNAPSHOTS * 1000
+
+
+def main() -> None:
+    alpha = AlphaHelper()
+    orders = [alpha.escrow_decoder.decode({"application": app}) for app in make_escrow_apps(ESCROW_COUNT)]
+    book = alpha._aggregate_orderbook(orders)
+
+    with tempfile.TemporaryDirectory() as folder:
+        legacy = legacy_logger("bench.legacy", folder)
+        pipeline = get_logger("bench.pipeline")
+        sampled = get_logger("bench.sampled")
+        set_sample_rate("bench.sampled", 0.1)
+
+        def legacy_snapshot():
+            legacy.info(f"Fetched {len(orders)} orders for market {MARKET_APP_ID}: {orders}")
+            legacy.info(f"Aggregated orderbook for market {MARKET_APP_ID}: {book}")
+
+        def pipeline_snapshot():
+            pipeline.debug("Fetched %d orders for market %d: %s", len(orders), MARKET_APP_ID, orders)
+            pipeline.info(
+                "Aggregated orderbook for market %d", MARKET_APP_ID,
+                extra={"data": {"market_app_id": MARKET_APP_ID, "yes_bid": book.best_bid(1), "yes_ask": book.best_ask(1),
+                                "no_bid": book.best_bid(0), "no_ask": book.best_ask(0)}}
+            )
+
+        def per_order(logger):
+            def run():
+                for order in orders:
+                    logger.info("Order %d at %d qty %d", order.app_id, order.price, order.remaining)
+            return run
+
+        def legacy_per_order():
+            for order in orders:
+                legacy.info(f"Order {order.app_id} at {order.price} qty {order.remaining}")
+
+        print(f"{ESCROW_COUNT} escrows per snapshot, caller-side cost")
+        print(f"{'case':<42} {'ms/snapshot':>12}")
+        for name, run in (
+            ("snapshot, sync file + f-strings", legacy_snapshot),
+            ("snapshot, queue + lazy structured", pipeline_snapshot),
+            ("per-order INFO, sync file + f-strings", legacy_per_order),
+            ("per-order INFO, queue", per_order(pipeline)),
+            ("per-order INFO, queue sampled 1/10", per_order(sampled)),
+        ):
+            print(f"{name:<42} {per_snapshot_ms(run):>12.3f}")
+
+        calls = 10_000
+        start = time.perf_counter()
+        for _ in range(calls):
+            legacy_logger("bench.legacy", folder)
+        legacy_us = (time.perf_counter() - start) / calls * 1e6
+        start = time.perf_counter()
+        for _ in range(calls):
+            get_logger("bench.pipeline")
+        pipeline_us = (time.perf_counter() - start) / calls * 1e6
+        print(f"{'get_logger, makedirs every call (us)':<42} {legacy_us:>12.3f}")
+        print(f"{'get_logger, shared pipeline (us)':<42} {pipeline_us:>12.3f}")
+
+        start = time.perf_counter()
+        shutdown_logging()
+        print(f"writer drained its backlog in {(time.perf_counter() - start) * 1000:.0f} ms after the run")
+        for handler in legacy.handlers:
+            handler.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Market metadata on the hot path: validating the full pydantic Market on every lookup
+(AlphaHelper._parse_market) against the slotted MarketCore projection and cached
+MarketCache lookups, reported per call along with per-record memory.
+
+Usage: python benchmarks/bench_market_cache.py
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fixtures import make_market
+from helpers.alpha_helper import AlphaHelper
+from helpers.market_cache import MarketCache
+from models.market import MarketCore
+
+CALLS = 20_000
+REPEATS = 5
+
+
+def best_of(run, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def allocated(build) -> float:
+    tracemalloc.start()
+    records = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(records)
+
+
+async def cached_lookups(cache: MarketCache, market_id: str, calls: int) -> None:
+    for _ in range(calls):
+        await cache.get(market_id)
+
+
+def main() -> None:
+    alpha = AlphaHelper()
+    record = make_market()["market"]
+    fetches = 0
+
+    async def fetch_record(market_id):
+        nonlocal fetches
+        fetches += 1
+        return record
+
+    cache = MarketCache(fetch_record, volatile_ttl_seconds=30.0)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(cache.get(record["id"]))
+
+    full = best_of(lambda: [alpha._parse_market(record) for _ in range(CALLS)])
+    core = best_of(lambda: [MarketCore.from_record(record) for _ in range(CALLS)])
+    cached = best_of(lambda: loop.run_until_complete(cached_lookups(cache, record["id"], CALLS)))
+    loop.close()
+
+    full_bytes = allocated(lambda: [alpha._parse_market(record) for _ in range(1000)])
+    core_bytes = allocated(lambda: [MarketCore.from_record(record) for _ in range(1000)])
+
+    print(f"{'lookup':<28} {'us/call':>10} {'bytes/record':>14}")
+    print(f"{'Market (pydantic)':<28} {full / CALLS * 1e6:>10.2f} {full_bytes:>14.0f}")
+    print(f"{'MarketCore.from_record':<28} {core / CALLS * 1e6:>10.2f} {core_bytes:>14.0f}")
+    print(f"{'MarketCache.get (cached)':<28} {cached / CALLS * 1e6:>10.2f} {'-':>14}")
+    print(f"record fetches: {fetches}")
+
+
+if __name__ == "__main__":
+    main()
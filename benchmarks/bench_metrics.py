@@ -0,0 +1,100 @@
+"""
+Cost of the latency instrumentation: per-call overhead of a `timed` function with
+metrics disabled and enabled, and full orderbook snapshots against a local stub indexer
+with metrics off and on. Ends by scraping the `/metrics` endpoint and printing the
+summary the periodic log would write.
+
+Usage: python benchmarks/bench_metrics.py
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import httpx
+from algosdk.v2client.indexer import IndexerClient
+
+from fixtures import make_escrow_apps
+from stub_indexer import StubIndexer
+from helpers.alpha_helper import AlphaHelper
+from helpers.escrow_fetcher import EscrowStateFetcher
+from helpers.metrics import MetricsServer, get_metrics, timed
+
+CALLS = 200_000
+ESCROW_COUNT = 1000
+SNAPSHOTS = 20
+MARKET_APP_ID = 1000
+
+
+def plain(value: int) -> int:
+    return value + 1
+
+
+timed_plain = timed("bench_call_seconds")(plain)
+
+
+def per_call_ns(func) -> float:
+    start = time.perf_counter()
+    for i in range(CALLS):
+        func(i)
+    return (time.perf_counter() - start) / CALLS * 1e9
+
+
+def per_snapshot_ms(alpha: AlphaHelper) -> float:
+    start = time.perf_counter()
+    for _ in range(SNAPSHOTS):
+        alpha.get_orderbook(MARKET_APP_ID, full_rebuild=True)
+    return (time.perf_counter() - start) / SNAPSHOTS * 1000
+
+
+async def scrape() -> str:
+    server = MetricsServer(port=0)
+    await server.start()
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"http://{server.host}:{server.port}/metrics")
+            response.raise_for_status()
+            return response.text
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    metrics = get_metrics()
+
+    print(f"{'case':<36} {'ns/call':>10}")
+    print(f"{'uninstrumented':<36} {per_call_ns(plain):>10.1f}")
+    print(f"{'timed, metrics disabled':<36} {per_call_ns(timed_plain):>10.1f}")
+    metrics.enabled = True
+    print(f"{'timed, metrics enabled':<36} {per_call_ns(timed_plain):>10.1f}")
+    metrics.enabled = False
+    metrics.reset()
+
+    alpha = AlphaHelper()
+    # Only the indexer is served locally; the market's escrows are created by "MARKET"
+    alpha.algorand = SimpleNamespace(app=SimpleNamespace(get_by_id=lambda app_id: SimpleNamespace(app_address="MARKET")))
+    with StubIndexer(make_escrow_apps(ESCROW_COUNT), latency=0.0) as stub:
+        alpha.escrow_fetcher = EscrowStateFetcher(IndexerClient("", stub.url))
+        per_snapshot_ms(alpha)  # Warm up connections
+
+        print(f"\n{ESCROW_COUNT} escrows, full rebuild")
+        print(f"{'case':<36} {'ms/snapshot':>12}")
+        disabled_ms = per_snapshot_ms(alpha)
+        metrics.enabled = True
+        enabled_ms = per_snapshot_ms(alpha)
+        print(f"{'metrics disabled':<36} {disabled_ms:>12.2f}")
+        print(f"{'metrics enabled':<36} {enabled_ms:>12.2f}")
+        alpha.escrow_fetcher.close()
+
+    body = asyncio.run(scrape())
+    samples = [line for line in body.splitlines() if line and not line.startswith("#")]
+    print(f"\n/metrics: {len(body)} bytes, {len(samples)} samples")
+    for line in metrics.summary():
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
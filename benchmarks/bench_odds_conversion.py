@@ -0,0 +1,68 @@
+"""
+Odds conversion: the scalar DataFormatter helpers in a Python loop against the NumPy
+batch API, plus de-vig and consensus throughput for full-slate OddsOrderbooks.
+
+Usage: python benchmarks/bench_odds_conversion.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import numpy as np
+
+from fixtures import BOOKMAKERS, make_odds_events
+from helpers.data_formatter import DataFormatter
+from models.odds_orderbook import OddsOrderbook
+
+PRICE_COUNT = 100_000
+REPEATS = 5
+
+
+def best_of(run, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    rng = random.Random(42)
+    decimal_prices = [round(rng.uniform(1.05, 8.0), 2) for _ in range(PRICE_COUNT)]
+    american_prices = [DataFormatter.decimal_to_american(price) for price in decimal_prices]
+    decimal_array = np.array(decimal_prices)
+    american_array = np.array(american_prices)
+
+    print(f"{PRICE_COUNT} prices")
+    print(f"{'conversion':<26} {'scalar_ms':>10} {'batch_ms':>9} {'speedup':>8}")
+    rows = (
+        ("decimal_to_probability",
+         lambda: [DataFormatter.decimal_to_probability(p) for p in decimal_prices],
+         lambda: DataFormatter.decimal_to_probability_batch(decimal_array)),
+        ("american_to_probability",
+         lambda: [DataFormatter.american_to_probability(p) for p in american_prices],
+         lambda: DataFormatter.american_to_probability_batch(american_array)),
+        ("decimal_to_american",
+         lambda: [DataFormatter.decimal_to_american(p) for p in decimal_prices],
+         lambda: DataFormatter.decimal_to_american_batch(decimal_array)),
+    )
+    for name, scalar, batch in rows:
+        scalar_ms, batch_ms = best_of(scalar), best_of(batch)
+        print(f"{name:<26} {scalar_ms:>10.1f} {batch_ms:>9.2f} {scalar_ms / batch_ms:>7.0f}x")
+
+    implied = DataFormatter.decimal_to_probability_batch(decimal_array.reshape(-1, 2))
+    print(f"\nde-vig of {implied.shape[0]} two-way markets")
+    for method in DataFormatter.DEVIG_METHODS:
+        print(f"{method:<26} {best_of(lambda: DataFormatter.devig(implied, method)):>9.2f} ms")
+
+    events = [OddsOrderbook(**event) for event in make_odds_events(15, bookmakers=len(BOOKMAKERS))]
+    consensus_ms = best_of(lambda: [DataFormatter.consensus_fair_probabilities(event) for event in events])
+    print(f"\nconsensus fair value, {len(events)} events x {len(BOOKMAKERS)} bookmakers: {consensus_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Odds API payload parsing: `response.json()` plus full OddsOrderbook validation (and the two
+debug re-serializations the helper used to do) against the streaming parser with a
+bookmaker/market whitelist and lazy validation of the events actually looked up.
+
+Reports CPU time and peak traced memory per poll as the payload grows.
+
+Usage: python benchmarks/bench_odds_parsing.py
+"""
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fixtures import BOOKMAKERS, make_odds_events
+from helpers.odds_stream import LazyOddsOrderbooks, OddsEventFilter, iter_odds_events
+from models.odds_orderbook import OddsOrderbook
+
+EVENT_COUNTS = (15, 60, 240)
+LOOKUPS = 5
+CHUNK_SIZE = 16 * 1024
+WHITELIST = OddsEventFilter(bookmakers=BOOKMAKERS[:4], markets=["h2h"])
+
+
+def full_parse(body: bytes) -> int:
+    data = json.loads(body)
+    json.dumps(data, indent=2)
+    orderbooks = [OddsOrderbook(**event) for event in data]
+    for orderbook in orderbooks:
+        orderbook.model_dump_json(indent=2)
+    return len(orderbooks)
+
+
+async def _chunks(body: bytes):
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start:start + CHUNK_SIZE]
+
+
+async def _stream_parse(body: bytes) -> int:
+    raw_events = {}
+    async for event in iter_odds_events(_chunks(body), WHITELIST):
+        raw_events[event["id"]] = event
+    orderbooks = LazyOddsOrderbooks(raw_events, lambda event: OddsOrderbook(**event))
+    for event_id in list(orderbooks)[:LOOKUPS]:
+        orderbooks[event_id]
+    return len(orderbooks)
+
+
+def stream_parse(body: bytes) -> int:
+    return asyncio.run(_stream_parse(body))
+
+
+def measure(run, body: bytes):
+    start = time.process_time()
+    run(body)
+    cpu = time.process_time() - start
+    tracemalloc.start()
+    run(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu * 1000, peak / 1024
+
+
+def main() -> None:
+    print(f"{'events':>7} {'payload_kb':>11} {'mode':<8} {'cpu_ms':>8} {'peak_kb':>9}")
+    for count in EVENT_COUNTS:
+        body = json.dumps(make_odds_events(count, bookmakers=len(BOOKMAKERS))).encode()
+        for name, run in (("full", full_parse), ("stream", stream_parse)):
+            run(body)
+            cpu_ms, peak_kb = measure(run, body)
+            print(f"{count:>7} {len(body) / 1024:>11.0f} {name:<8} {cpu_ms:>8.1f} {peak_kb:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Finding our own resting orders on a market against a local stub indexer, as the book
+grows: listing and decoding every escrow and filtering by owner, against OrderRegistry
+lookups. Also times the startup reconcile of a registry loaded from disk, which reads
+only our escrows.
+
+Usage: python benchmarks/bench_open_orders.py
+"""
+import base64
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from algosdk import account, encoding
+from algosdk.v2client.indexer import IndexerClient
+
+from fixtures import make_escrow_apps
+from stub_indexer import StubIndexer
+from helpers.escrow_fetcher import EscrowStateFetcher
+from helpers.order_registry import OrderRegistry
+from helpers.state_decoder import EscrowStateDecoder
+
+ESCROW_COUNTS = (1000, 10000)
+OUR_ORDERS = 25
+MARKET_APP_ID = 1000
+LATENCY = 0.002
+LOOKUPS = 1000
+
+
+def make_book(count: int, owner: str):
+    """Builds `count` escrows, OUR_ORDERS of them owned by `owner`."""
+    apps = make_escrow_apps(count, market_app_id=MARKET_APP_ID)
+    owner_b64 = base64.b64encode(encoding.decode_address(owner)).decode()
+    ours = apps[::count // OUR_ORDERS][:OUR_ORDERS]
+    for app in ours:
+        for item in app["params"]["global-state"]:
+            if base64.b64decode(item["key"]) == b"owner":
+                item["value"]["bytes"] = owner_b64
+    return apps, ours
+
+
+def book_scan(fetcher: EscrowStateFetcher, decoder: EscrowStateDecoder, owner: str, level) -> list:
+    position, side, price = level
+    orders = [decoder.decode(app) for app in fetcher.fetch_applications("MARKET")]
+    return [
+        order for order in orders
+        if order.owner == owner and (order.position, order.side, order.price) == (position, side, price)
+    ]
+
+
+def main() -> None:
+    _, owner = account.generate_account()
+    decoder = EscrowStateDecoder.from_app_spec()
+    print(f"{OUR_ORDERS} of our orders per book")
+    print(f"{'escrows':>8} {'book scan ms':>13} {'reqs':>6} {'registry us':>12} {'reconcile ms':>13} {'reqs':>6}")
+
+    for count in ESCROW_COUNTS:
+        apps, ours = make_book(count, owner)
+        with StubIndexer(apps, latency=LATENCY, include_global_state=True) as indexer:
+            fetcher = EscrowStateFetcher(IndexerClient("", indexer.url))
+
+            start = time.perf_counter()
+            level_state = decoder.decode({"application": ours[0]})
+            level = (level_state.position, level_state.side, level_state.price)
+            found = book_scan(fetcher, decoder, owner, level)
+            scan_ms = (time.perf_counter() - start) * 1000
+            scan_requests = indexer.request_count
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, "open_orders.json")
+                registry = OrderRegistry(path)
+                registry.adopt((decoder.decode({"application": app}) for app in apps), owner)
+                assert len(registry) == OUR_ORDERS
+
+                start = time.perf_counter()
+                for _ in range(LOOKUPS):
+                    registry.at_price(MARKET_APP_ID, *level)
+                    registry.exposure(MARKET_APP_ID, level[0], level[1])
+                registry_us = (time.perf_counter() - start) / LOOKUPS * 1e6
+                assert {o.escrow_app_id for o in registry.at_price(MARKET_APP_ID, *level)} == {o.app_id for o in found}
+
+                restored = OrderRegistry(path)
+                indexer.request_count = 0
+                start = time.perf_counter()
+                restored.reconcile(fetcher, decoder.decode)
+                reconcile_ms = (time.perf_counter() - start) * 1000
+                assert len(restored) == OUR_ORDERS
+
+            print(f"{count:>8} {scan_ms:>13.1f} {scan_requests:>6} {registry_us:>12.2f} "
+                  f"{reconcile_ms:>13.1f} {indexer.request_count:>6}")
+            fetcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Order placement throughput against a LocalNet-like algod stand-in: one `create_bet` per
+order (one group, waiting for confirmation each time) against `create_bets`, which packs
+five orders per 15-transaction group and submits the groups concurrently.
+
+Usage: python benchmarks/bench_order_batching.py
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from algokit_utils import AlgorandClient
+from algosdk import account, mnemonic
+from algosdk.v2client.algod import AlgodClient
+
+from stub_algod import StubAlgod
+from helpers.algorand_helper import AlgorandHelper
+from models.market import MarketCore
+from models.order import OrderRequest
+
+ORDER_COUNT = 40
+BLOCK_TIME = 0.3
+
+
+def ladder(count: int):
+    return [
+        OrderRequest(is_buying=index % 2 == 0, quantity=10, price=round(0.30 + (index // 2) * 0.01, 2), position=1)
+        for index in range(count)
+    ]
+
+
+async def sequential(helper: AlgorandHelper, market: MarketCore, orders) -> list:
+    return [
+        await helper.create_bet(order.is_buying, order.quantity, order.price, order.position, order.slippage, market)
+        for order in orders
+    ]
+
+
+def main() -> None:
+    private_key, _ = account.generate_account()
+    os.environ["SENDER_MNEMONIC"] = mnemonic.from_private_key(private_key)
+    market = MarketCore(id="bench", marketAppId=1000, yesAssetId=1001, noAssetId=1002, feeBasePercent=70_000)
+    orders = ladder(ORDER_COUNT)
+
+    with StubAlgod(block_time=BLOCK_TIME) as algod:
+        helper = AlgorandHelper(AlgorandClient.from_clients(algod=AlgodClient("a" * 64, algod.url)))
+
+        print(f"{'placement':<24} {'orders':>7} {'groups':>7} {'seconds':>9} {'orders/s':>9}")
+        for name, place in (("create_bet (one by one)", sequential), ("create_bets (batched)", None)):
+            algod.reset_counters()
+            start = time.perf_counter()
+            if place is None:
+                escrow_ids = asyncio.run(helper.create_bets(orders, market))
+            else:
+                escrow_ids = asyncio.run(place(helper, market, orders))
+            elapsed = time.perf_counter() - start
+            assert len(escrow_ids) == ORDER_COUNT and None not in escrow_ids
+            assert len(set(escrow_ids)) == ORDER_COUNT
+            print(f"{name:<24} {ORDER_COUNT:>7} {algod.groups_submitted:>7} {elapsed:>9.2f} {ORDER_COUNT / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
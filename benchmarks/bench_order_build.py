@@ -0,0 +1,96 @@
+"""
+Order build latency (everything before submission) against an algod stand-in with a
+remote-node round trip: the previous per-call setup (mnemonic derivation, a
+`suggested_params` request, a fresh ABI Method and fresh AppClients for every call)
+against the cached AlgorandSession.
+
+Usage: python benchmarks/bench_order_build.py
+"""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from algokit_utils import AlgoAmount, AlgorandClient, AppClient, AppClientMethodCallParams, AppClientParams
+from algosdk import account, mnemonic
+from algosdk.atomic_transaction_composer import AccountTransactionSigner, AtomicTransactionComposer, TransactionWithSigner
+from algosdk.v2client.algod import AlgodClient
+
+from stub_algod import StubAlgod
+from helpers.algorand_helper import AlgorandHelper
+from helpers.algorand_session import build_create_escrow_method
+from models.market import MarketCore
+from models.order import OrderRequest
+
+ALGOD_LATENCY = 0.02
+CALLS = 50
+
+
+def legacy_create(helper: AlgorandHelper, order: OrderRequest, market: MarketCore) -> AtomicTransactionComposer:
+    private_key = mnemonic.to_private_key(os.environ["SENDER_MNEMONIC"])
+    sender_address = account.address_from_private_key(private_key)
+    signer = AccountTransactionSigner(private_key)
+    sp = helper.algod_client.suggested_params()
+    atc = AtomicTransactionComposer()
+    helper._add_order(atc, order, market, sender_address, signer, sp, build_create_escrow_method())
+    return atc
+
+
+def legacy_cancel(helper: AlgorandHelper, escrow_app_id: int, market: MarketCore) -> AtomicTransactionComposer:
+    private_key = mnemonic.to_private_key(os.environ["SENDER_MNEMONIC"])
+    sender_address = account.address_from_private_key(private_key)
+    signer = AccountTransactionSigner(private_key)
+    AppClient(AppClientParams(app_spec=helper.ESCROW_APP_SPEC, app_id=escrow_app_id,
+                              algorand=helper.algorand, default_sender=sender_address))
+    market_app_client = AppClient(AppClientParams(app_spec=helper.MARKET_APP_SPEC, app_id=market.marketAppId,
+                                                  algorand=helper.algorand, default_sender=sender_address))
+    txn = market_app_client.create_transaction.call(AppClientMethodCallParams(
+        method="delete_escrow", extra_fee=AlgoAmount(micro_algo=5000), args=[escrow_app_id, sender_address],
+        asset_references=[helper.USDC_ASSET_ID, market.yesAssetId, market.noAssetId],
+        app_references=[escrow_app_id], signer=signer
+    ))
+    atc = AtomicTransactionComposer()
+    atc.add_transaction(TransactionWithSigner(txn.transactions[0], signer))
+    return atc
+
+
+def timed(build) -> list:
+    timings = []
+    for index in range(CALLS):
+        start = time.perf_counter()
+        build(index)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    private_key, _ = account.generate_account()
+    os.environ["SENDER_MNEMONIC"] = mnemonic.from_private_key(private_key)
+    market = MarketCore(id="bench", marketAppId=1000, yesAssetId=1001, noAssetId=1002, feeBasePercent=70_000)
+    order = OrderRequest(is_buying=True, quantity=10, price=0.45, position=1)
+
+    with StubAlgod(block_time=2.8, latency=ALGOD_LATENCY) as algod:
+        algorand = AlgorandClient.from_clients(algod=AlgodClient("a" * 64, algod.url))
+        algorand.set_suggested_params_cache_timeout(0)  # the old code fetched params on every call
+        legacy = AlgorandHelper(algorand)
+        helper = AlgorandHelper(AlgorandClient.from_clients(algod=AlgodClient("a" * 64, algod.url)))
+
+        cases = (
+            ("create, per-call setup", lambda i: legacy_create(legacy, order, market)),
+            ("create, session", lambda i: helper._build_order_groups([order], market)),
+            ("cancel, per-call setup", lambda i: legacy_cancel(legacy, 6_000_000 + i, market)),
+            ("cancel, session", lambda i: helper._build_cancel_groups([6_000_000 + i], market)),
+        )
+        print(f"{'build':<24} {'p50 ms':>8} {'p99 ms':>8} {'algod reqs':>11}")
+        for name, build in cases:
+            algod.reset_counters()
+            timings = sorted(timed(build))
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            print(f"{name:<24} {statistics.median(timings):>8.2f} {p99:>8.2f} {algod.request_count:>11}")
+
+
+if __name__ == "__main__":
+    main()
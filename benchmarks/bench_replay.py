@@ -0,0 +1,157 @@
+"""
+Capture and replay of market data: simulates live game windows (a slate of pairs scanned
+every 5 s, with orderbooks and bookmaker odds changing on a fraction of ticks), captures
+them with CaptureWriter and replays them through the scanner with ReplayEngine.
+
+Reports capture cost per snapshot, bytes per captured row against JSON lines, and replay
+throughput as a multiple of real time, extrapolated to a 180-day season.
+
+Usage: python benchmarks/bench_replay.py
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fixtures import make_market, make_odds_events
+from helpers.capture import CaptureReader, CaptureWriter
+from helpers.log_helpers import set_sample_rate
+from helpers.odds_stream import LazyOddsOrderbooks, parse_odds_event
+from helpers.replay import ReplayEngine
+from helpers.ttl_cache import TTLCache
+from models.market import MarketCore
+from models.orderbook import LevelBook, OrderBook
+from models.signal import ScanPair
+
+PAIRS = 15
+DAYS = 3
+GAME_HOURS = 3.0
+INTERVAL = 5.0
+ORDERBOOK_CHANGE = 0.3  # Fraction of ticks on which a market's orderbook changes
+ODDS_CHANGE = 0.2  # Fraction of ticks on which an event's odds change
+SEASON_DAYS = 180
+START = 1_743_500_000.0
+
+
+def random_book(rng: random.Random, mid: int) -> LevelBook:
+    book = LevelBook()
+    for position, center in ((1, mid), (0, 1_000_000 - mid)):
+        for side, sign in ((1, -1), (0, 1)):
+            levels = book.levels(position, side)
+            for step in range(1, 21):
+                levels.set(center + sign * step * 10_000, rng.randint(1, 500) * 1_000_000)
+    return book
+
+
+def step_prices(outcomes, step: float) -> None:
+    """Moves a two-way decimal price pair by `step` of implied probability, keeping the vig."""
+    home, away = (1 / outcome["price"] for outcome in outcomes)
+    moved = min(0.9, max(0.1, home / (home + away) + step))
+    outcomes[0]["price"] = round(1 / (moved * (home + away)), 2)
+    outcomes[1]["price"] = round(1 / ((1 - moved) * (home + away)), 2)
+
+
+def consensus(event) -> float:
+    """Vig-free home win probability averaged over an event's bookmakers."""
+    probabilities = []
+    for bookmaker in event["bookmakers"]:
+        home, away = (1 / outcome["price"] for outcome in bookmaker["markets"][0]["outcomes"])
+        probabilities.append(home / (home + away))
+    return sum(probabilities) / len(probabilities)
+
+
+def simulate(writer: CaptureWriter, seed: int = 7) -> int:
+    """Writes DAYS of game windows to the writer; returns the number of snapshots offered."""
+    rng = random.Random(seed)
+    events = make_odds_events(PAIRS)
+    markets = [MarketCore.from_record(make_market(f"BENCH{i:021d}", 1000 + i, f"{e['home_team']} vs {e['away_team']}")["market"])
+               for i, e in enumerate(events)]
+    pairs = [ScanPair(market_id=m.id, sport="baseball_mlb", event_id=e["id"], yes_outcome=e["home_team"])
+             for m, e in zip(markets, events)]
+    # Books quoted around the bookmakers' view, so signals are the occasional mispricing
+    mids = [round(consensus(event) * 100) * 10_000 for event in events]
+    books = [random_book(rng, mid) for mid in mids]
+    bookmakers = TTLCache(ttl_seconds=float("inf"), max_entries=4096)
+    offered = 0
+
+    for day in range(DAYS):
+        ts = START + day * 86_400
+        writer.record_pairs(pairs, ts=ts)
+        for market in markets:
+            writer.record_market(market, ts=ts)
+        for _ in range(int(GAME_HOURS * 3600 / INTERVAL)):
+            ts += INTERVAL
+            odds = {}
+            for event in events:
+                if rng.random() < ODDS_CHANGE:
+                    bookmaker = rng.choice(event["bookmakers"])
+                    step_prices(bookmaker["markets"][0]["outcomes"], rng.choice((-0.01, 0.01)))
+                    bookmaker["last_update"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+                odds[event["id"]] = event
+            # The writer serializes raw events straight away, so they can keep being mutated
+            writer.record_odds("baseball_mlb", LazyOddsOrderbooks(odds, lambda e: parse_odds_event(e, bookmakers)), ts=ts)
+            offered += len(odds)
+            for index, market in enumerate(markets):
+                if rng.random() < ORDERBOOK_CHANGE:
+                    offset = rng.choice((-1, 0, 1)) if rng.random() > 0.02 else rng.choice((-5, 5))
+                    mids[index] = (round(consensus(events[index]) * 100) + offset) * 10_000
+                    books[index] = random_book(rng, mids[index])
+                writer.record_orderbook(market.marketAppId, OrderBook(levels=books[index]), ts=ts + 0.1)
+                offered += 1
+    writer.close()
+    return offered
+
+
+def json_lines_size(directory: str) -> int:
+    """Size of the same records written as uncompressed JSON lines, for comparison."""
+    size = 0
+    for record in CaptureReader(directory).records():
+        value = record.value
+        if isinstance(value, LevelBook):
+            value = {f"{p}{s}": list(value.levels(p, s)) for p in (0, 1) for s in (0, 1)}
+        elif isinstance(value, MarketCore):
+            value = value.to_dict()
+        elif isinstance(value, list):
+            value = [pair.__dict__ for pair in value]
+        size += len(json.dumps({"ts": record.ts, "kind": record.kind, "key": record.key, "value": value})) + 1
+    return size
+
+
+def main() -> None:
+    set_sample_rate("helpers.scanner", 0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = CaptureWriter(directory)
+        start = time.perf_counter()
+        offered = simulate(writer)
+        capture_s = time.perf_counter() - start
+        on_disk = sum(os.path.getsize(path) for path in CaptureReader(directory).files())
+        print(f"{DAYS} days x {GAME_HOURS:.0f} h of {PAIRS} pairs every {INTERVAL:.0f} s")
+        print(f"snapshots offered {offered}, rows written {writer.rows_written}, skipped unchanged {writer.rows_skipped}")
+        print(f"capture incl. simulation: {capture_s / offered * 1e6:.1f} us per snapshot")
+        json_size = json_lines_size(directory)
+        print(f"on disk {on_disk / 1024:.0f} KB ({on_disk / writer.rows_written:.0f} B/row), "
+              f"JSON lines {json_size / 1024:.0f} KB ({json_size / on_disk:.0f}x larger)")
+
+        start = time.perf_counter()
+        records = sum(1 for _ in CaptureReader(directory).records())
+        read_s = time.perf_counter() - start
+        print(f"read back {records} records in {read_s * 1000:.0f} ms ({records / read_s:.0f} records/s)")
+
+        for skip_unchanged in (True, False):
+            engine = ReplayEngine(CaptureReader(directory), interval_seconds=INTERVAL, skip_unchanged=skip_unchanged)
+            stats = asyncio.run(engine.run())
+            season_minutes = stats.wall_seconds * SEASON_DAYS / DAYS / 60
+            print(f"replay ({'changed ticks' if skip_unchanged else 'every tick'}): {stats.ticks} ticks, "
+                  f"{stats.signals} signals in {stats.wall_seconds:.2f} s, {stats.speedup:.0f}x "
+                  f"real time, {SEASON_DAYS}-day season in ~{season_minutes:.1f} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Requote latency against a LocalNet-like algod stand-in: cancelling quotes and placing new
+ones one by one (`cancel_bet` then `create_bet`, each waiting for confirmation) against
+`cancel_bets` and the atomic cancel-replace `replace_bets`.
+
+Usage: python benchmarks/bench_requote.py
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from algokit_utils import AlgorandClient
+from algosdk import account, mnemonic
+from algosdk.v2client.algod import AlgodClient
+
+from stub_algod import StubAlgod
+from helpers.algorand_helper import AlgorandHelper
+from models.market import MarketCore
+from models.order import OrderRequest
+
+QUOTES = 10
+BLOCK_TIME = 0.3
+
+
+def quotes(count: int, offset: float):
+    return [
+        OrderRequest(is_buying=index % 2 == 0, quantity=10, price=round(0.30 + offset + (index // 2) * 0.01, 2), position=1)
+        for index in range(count)
+    ]
+
+
+async def cancel_then_create(helper: AlgorandHelper, market: MarketCore, escrow_ids, orders) -> list:
+    new_ids = []
+    for escrow_id, order in zip(escrow_ids, orders):
+        await helper.cancel_bet(escrow_id, market)
+        new_ids.append(await helper.create_bet(order.is_buying, order.quantity, order.price, order.position, order.slippage, market))
+    return new_ids
+
+
+async def cancel_all_then_create(helper: AlgorandHelper, market: MarketCore, escrow_ids, orders) -> list:
+    await helper.cancel_bets(escrow_ids, market)
+    return await helper.create_bets(orders, market)
+
+
+async def replace_all(helper: AlgorandHelper, market: MarketCore, escrow_ids, orders) -> list:
+    return await helper.replace_bets(list(zip(escrow_ids, orders)), market)
+
+
+def main() -> None:
+    private_key, _ = account.generate_account()
+    os.environ["SENDER_MNEMONIC"] = mnemonic.from_private_key(private_key)
+    market = MarketCore(id="bench", marketAppId=1000, yesAssetId=1001, noAssetId=1002, feeBasePercent=70_000)
+
+    with StubAlgod(block_time=BLOCK_TIME) as algod:
+        helper = AlgorandHelper(AlgorandClient.from_clients(algod=AlgodClient("a" * 64, algod.url)))
+        escrow_ids = asyncio.run(helper.create_bets(quotes(QUOTES, 0.0), market))
+
+        print(f"{'requote':<34} {'quotes':>7} {'groups':>7} {'seconds':>9} {'ms/quote':>9}")
+        for name, requote in (("cancel_bet + create_bet", cancel_then_create),
+                              ("cancel_bets, then create_bets", cancel_all_then_create),
+                              ("replace_bets (atomic)", replace_all)):
+            algod.reset_counters()
+            start = time.perf_counter()
+            escrow_ids = asyncio.run(requote(helper, market, escrow_ids, quotes(QUOTES, 0.01)))
+            elapsed = time.perf_counter() - start
+            assert len(escrow_ids) == QUOTES and None not in escrow_ids
+            print(f"{name:<34} {QUOTES:>7} {algod.groups_submitted:>7} {elapsed:>9.2f} {elapsed / QUOTES * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Sharded scanning: one tick over a slate of pairs with the single-process ArbitrageScanner
+against ShardedScanner with 1, 2, 4... worker processes (up to twice the CPU count).
+
+Sources are stubs that do the CPU-bound work of a live tick without network I/O: every
+orderbook is decoded from escrow global state and aggregated, and a share of the odds
+events changes on every tick, so workers validate them again. Reports the tick time, the
+speedup over the single process and the parallel efficiency per available core, and checks
+that every mode finds the same signals.
+
+Usage: python benchmarks/bench_sharding.py
+"""
+import asyncio
+import copy
+import os
+import random
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+for name, value in (("INTERVAL_SECONDS", "5"), ("LOG_LEVEL", "INFO"), ("CONTAINER_NAME", "bench"),
+                    ("ODDS_API_KEY", "bench"), ("SENDER_MNEMONIC", "bench")):
+    os.environ.setdefault(name, value)
+
+from fixtures import make_escrow_apps, make_odds_events
+from helpers.alpha_helper import AlphaHelper
+from helpers.log_helpers import set_sample_rate
+from helpers.odds_stream import LazyOddsOrderbooks, parse_odds_event
+from helpers.scanner import ArbitrageScanner
+from helpers.sharding import ShardedScanner
+from helpers.ttl_cache import TTLCache
+from models.market import MarketCore
+from models.signal import ScanPair
+
+PAIRS = 256
+ESCROWS = 150  # Per market
+ODDS_CHANGE = 0.3  # Fraction of events whose odds change between ticks
+TICKS = 5
+SPORT = "baseball_mlb"
+SAMPLE_RATES = "helpers.scanner=0"
+
+
+class StubMarketSource:
+    """Markets and orderbooks without I/O: each orderbook is decoded and aggregated from escrow state."""
+
+    def __init__(self, escrows: int):
+        self.escrows = escrows
+        self.alpha = AlphaHelper()
+        self._apps = {}
+
+    async def get_market(self, market_id: str) -> MarketCore:
+        return MarketCore(id=market_id, marketAppId=10_000 * (1 + int(market_id[1:])), feeBasePercent=70_000)
+
+    async def get_orderbook(self, market_app_id: int):
+        apps = self._apps.get(market_app_id)
+        if apps is None:
+            apps = self._apps[market_app_id] = make_escrow_apps(self.escrows, market_app_id, seed=market_app_id)
+        orders = [self.alpha.escrow_decoder.decode({"application": app}) for app in apps]
+        return self.alpha._aggregate_orderbook(orders)
+
+
+def stub_market_source(escrows: int) -> StubMarketSource:
+    """Source factory run in each worker."""
+    return StubMarketSource(escrows)
+
+
+class StubOdds:
+    """One odds response per tick; changed events are new objects, as in a fresh API response."""
+
+    def __init__(self, events):
+        self.events = {event["id"]: event for event in events}
+        self.tick = 0
+        self._bookmakers = TTLCache(ttl_seconds=float("inf"), max_entries=4096)
+
+    def advance(self) -> None:
+        rng = random.Random(self.tick)
+        self.tick += 1
+        for event_id in list(self.events):
+            if rng.random() < ODDS_CHANGE:
+                event = copy.deepcopy(self.events[event_id])
+                bookmaker = rng.choice(event["bookmakers"])
+                for outcome in bookmaker["markets"][0]["outcomes"]:
+                    outcome["price"] = round(max(1.01, outcome["price"] * rng.uniform(0.9, 1.1)), 2)
+                bookmaker["last_update"] = f"2025-04-01T17:{self.tick // 60:02d}:{self.tick % 60:02d}Z"
+                self.events[event_id] = event
+
+    async def get_sport_odds(self, sport, event_ids):
+        return LazyOddsOrderbooks(dict(self.events), lambda event: parse_odds_event(event, self._bookmakers))
+
+
+class SingleProcessSource:
+    """The same stubs behind one data source, for the single-process scanner."""
+
+    def __init__(self, markets: StubMarketSource, odds: StubOdds):
+        self.markets = markets
+        self.odds = odds
+        self.get_market = markets.get_market
+        self.get_orderbook = markets.get_orderbook
+        self.get_sport_odds = odds.get_sport_odds
+
+
+async def measure(scanner, odds: StubOdds):
+    """Runs a warm-up tick then TICKS ticks; returns the best tick time in ms and every signal."""
+    odds.tick = 0
+    odds.advance()
+    await scanner.tick()
+    times, signals = [], []
+    for _ in range(TICKS):
+        odds.advance()
+        start = time.perf_counter()
+        found = await scanner.tick()
+        times.append((time.perf_counter() - start) * 1000)
+        signals.extend((s.market_id, s.position, s.side, s.price, round(s.edge, 9)) for s in found)
+    return min(times), sorted(signals)
+
+
+async def main() -> None:
+    set_sample_rate("helpers.scanner", 0)
+    events = make_odds_events(PAIRS, sport=SPORT)
+    pairs = [ScanPair(market_id=f"M{index}", sport=SPORT, event_id=event["id"], yes_outcome=event["home_team"])
+             for index, event in enumerate(events)]
+    cpus = os.cpu_count() or 1
+    print(f"{PAIRS} pairs, {ESCROWS} escrows per orderbook, {ODDS_CHANGE:.0%} of odds changing per tick, {cpus} CPUs")
+
+    odds = StubOdds(events)
+    single = ArbitrageScanner(pairs, SingleProcessSource(stub_market_source(ESCROWS), odds))
+    baseline, expected = await measure(single, odds)
+    print(f"{'single process':<16} {baseline:8.1f} ms/tick  {PAIRS / baseline * 1000:8.0f} pairs/s")
+
+    workers = 1
+    while workers <= 2 * cpus:
+        odds = StubOdds(events)
+        scanner = ShardedScanner(pairs, odds, partial(stub_market_source, ESCROWS), workers=workers,
+                                 log_sample_rates=SAMPLE_RATES)
+        try:
+            elapsed, signals = await measure(scanner, odds)
+        finally:
+            await scanner.close()
+        speedup = baseline / elapsed
+        print(f"{f'{workers} workers':<16} {elapsed:8.1f} ms/tick  {PAIRS / elapsed * 1000:8.0f} pairs/s  "
+              f"{speedup:5.2f}x  efficiency {speedup / min(workers, cpus):4.0%}  "
+              f"signals {'match' if signals == expected else 'DIFFER'} ({len(signals)})")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
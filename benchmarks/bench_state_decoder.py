@@ -0,0 +1,73 @@
+"""
+Escrow global-state decoding: the original generic AlphaHelper decoding against the
+spec-compiled EscrowStateDecoder, reported per escrow.
+
+Usage: python benchmarks/bench_state_decoder.py
+"""
+import base64
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from algosdk import encoding
+
+from fixtures import make_escrow_apps
+from helpers.state_decoder import EscrowStateDecoder
+
+ESCROW_COUNT = 20_000
+REPEATS = 5
+
+
+def _decode_state_value(value: Dict[str, Any], key: str) -> Any:
+    if value["type"] == 1:  # bytes value
+        if key == "owner":
+            address_bytes = base64.b64decode(value["bytes"])
+            if len(address_bytes) == 32:
+                return encoding.encode_address(address_bytes)
+        try:
+            return base64.b64decode(value["bytes"]).decode()
+        except Exception:
+            return value["bytes"]
+    return int(value["uint"])
+
+
+def legacy_decode_global_state(app_info: Dict[str, Any]) -> Dict[str, Any]:
+    """The global-state decoding as it was before EscrowStateDecoder."""
+    global_state = {}
+    params = (app_info.get("application") or {}).get("params") or {}
+    for state_item in params.get("global-state", []):
+        key = base64.b64decode(state_item["key"]).decode()
+        global_state[key] = _decode_state_value(state_item["value"], key)
+    return global_state
+
+
+def best_of(run, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    decoder = EscrowStateDecoder.from_app_spec()
+    app_infos = [{"application": app} for app in make_escrow_apps(ESCROW_COUNT)]
+
+    for app_info in app_infos[:100]:
+        assert decoder.decode(app_info).to_dict() == legacy_decode_global_state(app_info)
+
+    generic = best_of(lambda: [legacy_decode_global_state(app_info) for app_info in app_infos])
+    compiled = best_of(lambda: [decoder.decode(app_info) for app_info in app_infos])
+
+    print(f"{'decoder':<28} {'us/escrow':>10}")
+    print(f"{'generic':<28} {generic / ESCROW_COUNT * 1e6:>10.2f}")
+    print(f"{'EscrowStateDecoder':<28} {compiled / ESCROW_COUNT * 1e6:>10.2f}")
+    print(f"speedup: {generic / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
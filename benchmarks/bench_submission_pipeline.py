@@ -0,0 +1,89 @@
+"""
+Fire-and-track submission against a LocalNet-like algod stand-in: order groups executed
+with a blocking `atc.execute` inside a coroutine (as `create_bet` used to) against
+`submit_bets`, which returns once algod has accepted the groups while one background
+task confirms them.
+
+Reports time until the call returns, time until every group is confirmed, the worst
+event-loop stall seen by a concurrent 10 ms ticker, and algod requests made.
+
+Usage: python benchmarks/bench_submission_pipeline.py
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from algokit_utils import AlgorandClient
+from algosdk import account, mnemonic
+from algosdk.v2client.algod import AlgodClient
+
+from stub_algod import StubAlgod
+from helpers.algorand_helper import AlgorandHelper
+from models.market import MarketCore
+from models.order import OrderRequest
+
+ORDER_COUNT = 40
+BLOCK_TIME = 0.3
+TICK = 0.01
+
+
+async def ticker(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        worst = max(worst, time.perf_counter() - start - TICK)
+    return worst
+
+
+async def blocking(helper: AlgorandHelper, market: MarketCore, orders):
+    groups = helper._build_order_groups(orders, market)
+    start = time.perf_counter()
+    for atc in groups:
+        atc.execute(helper.algod_client, 4)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+async def fire_and_track(helper: AlgorandHelper, market: MarketCore, orders):
+    start = time.perf_counter()
+    handles = await helper.submit_bets(orders, market)
+    returned = time.perf_counter() - start
+    await asyncio.gather(*(handle.done for handle in handles))
+    return returned, time.perf_counter() - start
+
+
+async def run(submit, helper: AlgorandHelper, market: MarketCore, orders):
+    stop = asyncio.Event()
+    ticker_task = asyncio.create_task(ticker(stop))
+    await asyncio.sleep(TICK)
+    returned, confirmed = await submit(helper, market, orders)
+    stop.set()
+    return returned, confirmed, await ticker_task
+
+
+def main() -> None:
+    private_key, _ = account.generate_account()
+    os.environ["SENDER_MNEMONIC"] = mnemonic.from_private_key(private_key)
+    market = MarketCore(id="bench", marketAppId=1000, yesAssetId=1001, noAssetId=1002, feeBasePercent=70_000)
+    orders = [
+        OrderRequest(is_buying=index % 2 == 0, quantity=10, price=round(0.30 + (index // 2) * 0.01, 2), position=1)
+        for index in range(ORDER_COUNT)
+    ]
+
+    with StubAlgod(block_time=BLOCK_TIME) as algod:
+        helper = AlgorandHelper(AlgorandClient.from_clients(algod=AlgodClient("a" * 64, algod.url)))
+
+        print(f"{'submission':<26} {'returned s':>11} {'confirmed s':>12} {'max stall ms':>13} {'algod reqs':>11}")
+        for name, submit in (("blocking atc.execute", blocking), ("submit_bets (pipeline)", fire_and_track)):
+            algod.reset_counters()
+            returned, confirmed, stall = asyncio.run(run(submit, helper, market, orders))
+            print(f"{name:<26} {returned:>11.2f} {confirmed:>12.2f} {stall * 1000:>13.1f} {algod.request_count:>11}")
+
+
+if __name__ == "__main__":
+    main()
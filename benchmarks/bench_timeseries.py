@@ -0,0 +1,98 @@
+"""
+Time-series store of top of book and fair value: ingests every tick of many pairs into a
+TimeSeriesStore (raw ticks plus 1-minute and 1-hour buckets), then times range queries:
+one market's last hour, every market's last hour, and per-market averages of midpoint vs
+fair value over the last hour, from raw ticks and from 1-minute buckets.
+
+Usage: python benchmarks/bench_timeseries.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from helpers.timeseries import TimeSeriesStore
+from models.signal import PairQuote
+
+MARKETS = 1000
+HOURS = 2
+INTERVAL = 5
+ROUNDS = 5
+
+
+def simulate(store: TimeSeriesStore, end: int, seed: int = 3) -> float:
+    """Ingests HOURS of ticks ending at `end`; returns the seconds spent in the store."""
+    elapsed = 0.0
+    rng = random.Random(seed)
+    fairs = [rng.uniform(0.2, 0.8) for _ in range(MARKETS)]
+    ticks = HOURS * 3600 // INTERVAL
+    for tick in range(ticks):
+        timestamp = datetime.fromtimestamp(end - (ticks - tick) * INTERVAL)
+        quotes = []
+        for index in range(MARKETS):
+            fairs[index] = min(0.95, max(0.05, fairs[index] + rng.gauss(0, 0.002)))
+            mid = round(fairs[index] + rng.gauss(0, 0.01), 2)
+            # One quote in twenty has an empty side
+            bid = None if rng.random() < 0.05 else round(mid - 0.01, 2)
+            quotes.append(PairQuote(market_id=f"M{index:05d}", event_id=f"E{index:05d}", fair=fairs[index],
+                                    bid=bid, ask=round(mid + 0.01, 2), timestamp=timestamp))
+        start = time.perf_counter()
+        store.ingest(quotes)
+        elapsed += time.perf_counter() - start
+    start = time.perf_counter()
+    store.flush()
+    return elapsed + time.perf_counter() - start
+
+
+def best_of(call) -> float:
+    """Best wall time of ROUNDS calls, in milliseconds."""
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        call()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.db")
+        store = TimeSeriesStore(path, tick_seconds=INTERVAL)
+        end = int(time.time()) // 3600 * 3600  # Hour aligned, so raw ticks and buckets cover the same span
+        ingest_s = simulate(store, end)
+        quotes = store.rows_written
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{MARKETS} markets x {HOURS} h every {INTERVAL} s: {quotes} quotes ingested in {ingest_s:.1f} s "
+              f"({quotes / ingest_s:.0f}/s, {ingest_s / quotes * 1e6:.1f} us per quote), {size / 1024 / 1024:.0f} MB")
+
+        markets = [f"M{index:05d}" for index in range(MARKETS)]
+        hour = (end - 3600, end)
+        cases = [
+            ("1 market, last hour, raw", lambda: store.series("M00042", *hour)),
+            ("1 market, last hour, 1 m", lambda: store.series("M00042", *hour, resolution=60)),
+            (f"{MARKETS} markets, last hour, 1 m", lambda: store.series_many(markets, *hour, resolution=60)),
+            (f"{MARKETS} markets, last {HOURS} h, 1 h", lambda: store.series_many(markets, end - HOURS * 3600, end,
+                                                                                 resolution=3600)),
+            (f"{MARKETS} markets, summary last hour, raw", lambda: store.summary(markets, *hour, resolution=0)),
+            (f"{MARKETS} markets, summary last hour, 1 m", lambda: store.summary(markets, *hour, resolution=60)),
+        ]
+        for name, call in cases:
+            result = call()
+            points = len(result) if isinstance(result, list) else sum(
+                len(value) if isinstance(value, list) else 1 for value in result.values())
+            print(f"{name:<40} {best_of(call):8.2f} ms  ({points} points)")
+
+        raw = store.summary(["M00042"], *hour, resolution=0)["M00042"]
+        bucketed = store.summary(["M00042"], *hour, resolution=60)["M00042"]
+        print(f"M00042 last hour: mid {raw.mid:.4f} fair {raw.fair:.4f} gap {raw.gap:+.5f} from raw ticks, "
+              f"gap {bucketed.gap:+.5f} from 1 m buckets")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
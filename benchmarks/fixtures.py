@@ -0,0 +1,116 @@
+"""Synthetic fixtures shared by the benchmark scripts."""
+import base64
+import random
+from typing import Any, Dict, List
+
+UINT_FIELDS = ("price", "quantity", "quantity_filled", "side", "position", "slippage",
+               "asset_listed", "market_app_id", "fee_timer_start")
+
+
+def _state_key(name: str) -> str:
+    return base64.b64encode(name.encode()).decode()
+
+
+def make_escrow_state(rng: random.Random, market_app_id: int) -> List[Dict[str, Any]]:
+    """Builds an indexer-shaped `global-state` list for one escrow."""
+    quantity = rng.randint(1, 500) * 1_000_000
+    values = {
+        "price": rng.randint(1, 99) * 10_000,
+        "quantity": quantity,
+        "quantity_filled": rng.choice((0, 0, 0, quantity // 2)),
+        "side": rng.randint(0, 1),
+        "position": rng.randint(0, 1),
+        "slippage": rng.choice((0, 0, 0, 0, 100)),
+        "asset_listed": 31566704,
+        "market_app_id": market_app_id,
+        "fee_timer_start": 1_700_000_000,
+    }
+    state = [{"key": _state_key(name), "value": {"type": 2, "uint": values[name], "bytes": ""}}
+             for name in UINT_FIELDS]
+    owner = bytes(rng.getrandbits(8) for _ in range(32))
+    state.append({"key": _state_key("owner"),
+                  "value": {"type": 1, "uint": 0, "bytes": base64.b64encode(owner).decode()}})
+    return state
+
+
+def make_escrow_apps(count: int, market_app_id: int = 1000, seed: int = 42) -> List[Dict[str, Any]]:
+    """Builds `count` indexer application records created by a market app."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": market_app_id + 1 + index,
+            "params": {"creator": "MARKET", "global-state": make_escrow_state(rng, market_app_id)},
+        }
+        for index in range(count)
+    ]
+
+
+
+TEAMS = [
+    "New York Yankees", "Boston Red Sox", "Toronto Blue Jays", "Tampa Bay Rays", "Baltimore Orioles",
+    "Cleveland Guardians", "Detroit Tigers", "Kansas City Royals", "Minnesota Twins", "Chicago White Sox",
+    "Houston Astros", "Seattle Mariners", "Texas Rangers", "Los Angeles Angels", "Oakland Athletics",
+    "Atlanta Braves", "Philadelphia Phillies", "New York Mets", "Miami Marlins", "Washington Nationals",
+    "Milwaukee Brewers", "Chicago Cubs", "St. Louis Cardinals", "Cincinnati Reds", "Pittsburgh Pirates",
+    "Los Angeles Dodgers", "San Diego Padres", "San Francisco Giants", "Arizona Diamondbacks", "Colorado Rockies",
+]
+BOOKMAKERS = ["draftkings", "fanduel", "betmgm", "caesars", "pointsbetus", "betrivers", "bovada",
+              "mybookieag", "betonlineag", "lowvig", "betus", "wynnbet", "unibet_us", "superbook"]
+
+
+def make_market(market_id: str = "01JP1N3DYCC3HA7C1JD2FQHG6P", market_app_id: int = 1000,
+                topic: str = "New York Yankees vs Boston Red Sox") -> Dict[str, Any]:
+    """Builds an Alpha `get-market` response body."""
+    return {"market": {
+        "id": market_id, "marketAppId": market_app_id, "slug": market_id.lower(), "topic": topic,
+        "yesAssetId": market_app_id + 1, "noAssetId": market_app_id + 2,
+        "yesTeamColor": "#003087", "noTeamColor": "#BD3039",
+        "yesProb": 540000, "noProb": 460000, "currentMidpoint": 540000, "currentSpread": 20000,
+        "lastTradePrice": 530000, "lastTradePrices": {"yes": 530000, "no": 470000},
+        "rules": "This market resolves YES if the first listed team wins the game. " * 20,
+        "compressedRules": "https://example.com/rules.txt", "image": "https://example.com/image.png",
+        "shareImage": {"yes": {"image": "https://example.com/yes.png", "text": "YES"},
+                       "no": {"image": "https://example.com/no.png", "text": "NO"}},
+        "categories": ["Sports", "MLB"], "featured": False, "volume": 12345.6, "marketVolume": 12345.6,
+        "fees": 1200, "totalRewards": 0, "rewardsPaidOut": 0, "lastRewardAmount": 0,
+        "feeAddress": "A" * 58, "feeBasePercent": 70000, "feeTimerThreshhold": 3600, "marketFriend": "B" * 58,
+        "oracle": "C" * 58, "rewardsSpreadDistance": 30000, "rewardsMinContracts": 100,
+        "createdAt": 1_743_000_000_000, "updatedAt": 1_743_000_500_000, "liveTs": 1_743_000_000_000,
+        "endTs": 1_743_100_000_000, "createdRound": 47_000_000, "lastRewardTs": 0, "comments": 3,
+        "dataType": "market", "PK": f"MARKET#{market_id}", "SK": f"MARKET#{market_id}",
+    }}
+
+
+def _american_pair(rng: random.Random) -> List[float]:
+    home = rng.uniform(0.3, 0.7)
+    vig = rng.uniform(1.02, 1.06)
+    return [round(1 / (home * vig), 2), round(1 / ((1 - home) * vig), 2)]
+
+
+def make_odds_events(count: int, sport: str = "baseball_mlb", bookmakers: int = 10,
+                     seed: int = 42) -> List[Dict[str, Any]]:
+    """Builds an Odds API `/odds` response body with `count` events."""
+    rng = random.Random(seed)
+    events = []
+    for index in range(count):
+        home, away = rng.sample(TEAMS, 2)
+        books = []
+        for key in BOOKMAKERS[:bookmakers]:
+            h2h = _american_pair(rng)
+            spread = _american_pair(rng)
+            books.append({
+                "key": key, "title": key.title(), "last_update": "2025-04-01T17:00:00Z",
+                "markets": [
+                    {"key": "h2h", "last_update": "2025-04-01T17:00:00Z",
+                     "outcomes": [{"name": home, "price": h2h[0]}, {"name": away, "price": h2h[1]}]},
+                    {"key": "spreads", "last_update": "2025-04-01T17:00:00Z",
+                     "outcomes": [{"name": home, "price": spread[0], "point": -1.5},
+                                  {"name": away, "price": spread[1], "point": 1.5}]},
+                ],
+            })
+        events.append({
+            "id": f"{index:032x}", "sport_key": sport, "sport_title": sport.split("_")[-1].upper(),
+            "commence_time": f"2025-04-01T{17 + index % 6:02d}:05:00Z",
+            "home_team": home, "away_team": away, "bookmakers": books,
+        })
+    return events
@@ -0,0 +1,217 @@
+"""A local stand-in for an algod node (LocalNet-like) covering what AlgorandHelper submits."""
+import base64
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import msgpack
+from algosdk import encoding
+
+ABI_RETURN_PREFIX = bytes.fromhex("151f7c75")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StubAlgod:
+    """
+    Accepts signed transaction groups and confirms them in the next round.
+
+    Rounds advance every `block_time` seconds, like a LocalNet node with a fixed block
+    period. Every application call is answered with a fresh uint64 ABI return value, so
+    `create_escrow` calls get new escrow app IDs. Accounts added with `fund` are served by
+    the account endpoint; payments, asset transfers and opt-ins they send are applied to
+    them on submission.
+
+    Args:
+        block_time: Seconds per round
+        latency: Simulated per-request latency in seconds
+        first_app_id: First escrow app ID handed out
+    """
+
+    def __init__(self, block_time: float = 0.3, latency: float = 0.002, first_app_id: int = 5_000_000):
+        self.block_time = block_time
+        self.latency = latency
+        self.next_app_id = first_app_id
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.block_txids: Dict[int, List[str]] = {}
+        self.block_txns: Dict[int, List[Dict[str, Any]]] = {}  # Round -> block payset, in txids order
+        self.accounts: Dict[str, Dict[str, Any]] = {}
+        self.groups_submitted = 0
+        self.txns_submitted = 0
+        self.request_count = 0
+        self._started_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def current_round(self) -> int:
+        return 1000 + int((time.monotonic() - self._started_at) / self.block_time)
+
+    def __enter__(self) -> "StubAlgod":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.groups_submitted = 0
+            self.txns_submitted = 0
+            self.request_count = 0
+
+    def fund(self, address: str, micro_algos: int, assets: Optional[Dict[int, int]] = None) -> None:
+        """Creates an account holding `micro_algos` and the given asset amounts."""
+        with self._lock:
+            self.accounts[address] = {"amount": micro_algos, "assets": dict(assets or {})}
+
+    def _account_info(self, address: str) -> Dict[str, Any]:
+        with self._lock:
+            account = self.accounts.get(address, {"amount": 0, "assets": {}})
+            return {
+                "address": address,
+                "amount": account["amount"],
+                "min-balance": 100_000 * (1 + len(account["assets"])),
+                "assets": [
+                    {"asset-id": asset_id, "amount": amount, "is-frozen": False}
+                    for asset_id, amount in account["assets"].items()
+                ],
+                "round": self.current_round,
+            }
+
+    def _apply_to_accounts(self, txn: Dict[str, Any]) -> None:
+        sender = self.accounts.get(encoding.encode_address(txn["snd"]))
+        if sender is None:
+            return
+        sender["amount"] -= txn.get("fee", 0)
+        if txn.get("type") == "pay":
+            sender["amount"] -= txn.get("amt", 0)
+        elif txn.get("type") == "axfer":
+            asset_id, amount = txn.get("xaid", 0), txn.get("aamt", 0)
+            if txn.get("arcv") == txn["snd"] and not amount:
+                sender["assets"].setdefault(asset_id, 0)
+            elif asset_id in sender["assets"]:
+                sender["assets"][asset_id] -= amount
+
+    def _suggested_params(self) -> Dict[str, Any]:
+        return {
+            "consensus-version": "future", "fee": 0, "min-fee": 1000, "genesis-id": "stub-v1",
+            "genesis-hash": base64.b64encode(b"\x01" * 32).decode(), "last-round": self.current_round,
+        }
+
+    def _submit(self, body: bytes) -> Dict[str, Any]:
+        confirmed_round = self.current_round + 1
+        tx_ids: List[str] = []
+        with self._lock:
+            for signed in msgpack.Unpacker(io.BytesIO(body), raw=False, strict_map_key=False):
+                txn = signed["txn"]
+                digest = encoding.checksum(b"TX" + msgpack.packb(txn, use_bin_type=True))
+                tx_id = base64.b32encode(digest).decode().rstrip("=")
+                info: Dict[str, Any] = {"confirmed-round": confirmed_round, "pool-error": "", "txn": {}}
+                block_txn: Dict[str, Any] = {"txn": txn}
+                if txn.get("type") == "appl":
+                    app_id = self.next_app_id
+                    self.next_app_id += 1
+                    log = ABI_RETURN_PREFIX + app_id.to_bytes(8, "big")
+                    info["logs"] = [base64.b64encode(log).decode()]
+                    info["inner-txns"] = [{"application-index": app_id}]
+                    block_txn["dt"] = {"lg": [log]}
+                self.pending[tx_id] = info
+                self._apply_to_accounts(txn)
+                self.block_txids.setdefault(confirmed_round, []).append(tx_id)
+                self.block_txns.setdefault(confirmed_round, []).append(block_txn)
+                tx_ids.append(tx_id)
+            self.groups_submitted += 1
+            self.txns_submitted += len(tx_ids)
+        return {"txId": tx_ids[0]}
+
+    def _pending_info(self, tx_id: str) -> Optional[Dict[str, Any]]:
+        info = self.pending.get(tx_id)
+        if info is None:
+            return None
+        if info["confirmed-round"] > self.current_round:
+            return {"confirmed-round": 0, "pool-error": "", "txn": {}}
+        return info
+
+    def _wait_for_block_after(self, round_number: int) -> Dict[str, Any]:
+        deadline = time.monotonic() + 5 * self.block_time
+        while self.current_round <= round_number and time.monotonic() < deadline:
+            time.sleep(self.block_time / 20)
+        return {"last-round": self.current_round}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _reply(self, status: int, body: Any, content_type: str = "application/json") -> None:
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _route(self, method: str) -> None:
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+                parts = self.path.split("?")[0].strip("/").split("/")[1:]  # drop the "v2" prefix
+                if method == "POST" and parts == ["transactions"]:
+                    length = int(self.headers.get("Content-Length", 0))
+                    self._reply(200, stub._submit(self.rfile.read(length)))
+                elif parts == ["transactions", "params"]:
+                    self._reply(200, stub._suggested_params())
+                elif parts == ["status"]:
+                    self._reply(200, {"last-round": stub.current_round})
+                elif parts[:2] == ["status", "wait-for-block-after"]:
+                    self._reply(200, stub._wait_for_block_after(int(parts[2])))
+                elif parts[:1] == ["accounts"] and len(parts) == 2:
+                    self._reply(200, stub._account_info(parts[1]))
+                elif parts[:1] == ["blocks"] and parts[2:] == ["txids"]:
+                    round_number = int(parts[1])
+                    if round_number > stub.current_round:
+                        self._reply(404, {"message": "ledger does not have entry"})
+                    else:
+                        self._reply(200, {"blockTxids": stub.block_txids.get(round_number, [])})
+                elif parts[:1] == ["blocks"] and len(parts) == 2:
+                    round_number = int(parts[1])
+                    if round_number > stub.current_round:
+                        self._reply(404, {"message": "ledger does not have entry"})
+                    else:
+                        block = {"block": {"rnd": round_number, "txns": stub.block_txns.get(round_number, [])}}
+                        self._reply(200, msgpack.packb(block, use_bin_type=True), "application/msgpack")
+                elif parts[:2] == ["transactions", "pending"]:
+                    info = stub._pending_info(parts[2])
+                    if info is None:
+                        self._reply(404, {"message": "txn does not exist"})
+                    else:
+                        self._reply(200, info)
+                else:
+                    self._reply(404, {"message": "not found"})
+
+            def do_GET(self) -> None:
+                self._route("GET")
+
+            def do_POST(self) -> None:
+                self._route("POST")
+
+        return Handler
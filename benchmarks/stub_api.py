@@ -0,0 +1,88 @@
+"""A local keep-alive HTTP stub for the Alpha and Odds APIs."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# A route returns (status, JSON body, extra headers) for the parsed query string
+Route = Callable[[Dict[str, List[str]]], Tuple[int, Any, Dict[str, str]]]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StubApi:
+    """
+    Serves JSON routes over HTTP/1.1 with keep-alive and a simulated latency.
+
+    Args:
+        routes: Mapping of URL path to a Route
+        latency: Simulated per-request latency in seconds
+    """
+
+    def __init__(self, routes: Dict[str, Route], latency: float = 0.005):
+        self.routes = routes
+        self.latency = latency
+        self.request_count = 0
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubApi":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.request_count = 0
+            self.connection_count = 0
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connection_count += 1
+
+            def do_GET(self) -> None:
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                route: Optional[Route] = stub.routes.get(parsed.path.rstrip("/")) or stub.routes.get(parsed.path)
+                if route is None:
+                    status, body, headers = 404, {"message": "not found"}, {}
+                else:
+                    status, body, headers = route(parse_qs(parsed.query))
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
@@ -0,0 +1,92 @@
+"""A local stub of the Algorand indexer endpoints used by AlphaHelper."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StubIndexer:
+    """
+    Serves `created-applications` and `applications/{id}` from an in-memory list, plus
+    `health` and an empty `transactions` search at a fixed round for incremental syncs.
+
+    Args:
+        applications: Application records (as built by `fixtures.make_escrow_apps`)
+        latency: Simulated per-request latency in seconds
+        include_global_state: Whether the creator lookup carries `params.global-state`
+    """
+
+    def __init__(self, applications: List[Dict[str, Any]], latency: float = 0.002,
+                 include_global_state: bool = False):
+        self.applications = applications
+        self.by_id = {app["id"]: app for app in applications}
+        self.latency = latency
+        self.include_global_state = include_global_state
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubIndexer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _created_applications(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        limit = int(query.get("limit", ["1000"])[0])
+        start = int(query.get("next", ["0"])[0])
+        page = self.applications[start:start + limit]
+        if not self.include_global_state:
+            page = [{"id": app["id"], "params": {"creator": app["params"]["creator"]}} for app in page]
+        body: Dict[str, Any] = {"applications": page, "current-round": 1}
+        if start + limit < len(self.applications):
+            body["next-token"] = str(start + limit)
+        return body
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                parts = parsed.path.strip("/").split("/")
+                if parts[-1] == "created-applications":
+                    body = stub._created_applications(parse_qs(parsed.query))
+                elif parts == ["health"]:
+                    body = {"round": 1, "db-available": True, "is-migrating": False}
+                elif parts == ["v2", "transactions"]:
+                    body = {"transactions": [], "current-round": 1}
+                elif len(parts) == 3 and parts[1] == "applications" and int(parts[2]) in stub.by_id:
+                    body = {"application": stub.by_id[int(parts[2])], "current-round": 1}
+                else:
+                    self.send_error(404, "not found")
+                    return
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
@@ -0,0 +1,407 @@
+"""
+Benchmark suite for the whole pipeline, replayed through local stub servers.
+
+Cases cover escrow decoding and aggregation and full orderbook snapshots against the stub
+indexer at 100/1k/10k escrows, Alpha market fetches, an Odds API fetch and parse of a
+full slate, fair-value de-vigging, order building against the stub algod and complete
+scanner ticks. Every case runs warm-up rounds, then timed rounds with the garbage
+collector paused, then one more round under tracemalloc; it reports median and p90
+latency, the spread (IQR / median), throughput in items per second and peak traced
+memory (stub server threads included).
+
+Fixtures are read from benchmarks/data when present and built from the seeded generators
+in fixtures.py otherwise, so runs on the same inputs are comparable. `record` writes the
+synthetic fixtures there and can also capture real ones (a market's escrows from the
+indexer, Alpha market records, an Odds API slate), which then replace or join them.
+
+Usage:
+    python benchmarks/suite.py run [-k snapshot] [--rounds 10] [--output results.json] [--compare baseline.json]
+    python benchmarks/suite.py record [--market-app-id ID] [--market-id ID ...] [--odds-sport SPORT]
+"""
+import argparse
+import asyncio
+import gc
+import gzip
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+for name, value in (("INTERVAL_SECONDS", "5"), ("LOG_LEVEL", "INFO"), ("CONTAINER_NAME", "bench"),
+                    ("ODDS_API_KEY", "bench"), ("SENDER_MNEMONIC", "bench"),
+                    # Scanner ticks run back to back; fetch odds on every tick as a live tick would
+                    ("ODDS_CACHE_TTL_SECONDS", "0"), ("ODDS_CACHE_STALE_SECONDS", "0")):
+    os.environ.setdefault(name, value)
+
+from algokit_utils import AlgorandClient
+from algosdk import account, mnemonic
+from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.indexer import IndexerClient
+
+from fixtures import BOOKMAKERS, make_escrow_apps, make_market, make_odds_events
+from stub_algod import StubAlgod
+from stub_api import StubApi
+from stub_indexer import StubIndexer
+from helpers.algorand_helper import AlgorandHelper
+from helpers.alpha_helper import AlphaHelper
+from helpers.data_formatter import DataFormatter
+from helpers.escrow_fetcher import EscrowStateFetcher
+from helpers.http_client import AsyncHttpClient
+from helpers.odds_helper import OddsAPIHelper
+from helpers.scanner import ArbitrageScanner, LiveDataSource
+from models.market import MarketCore
+from models.odds_orderbook import OddsOrderbook
+from models.order import OrderRequest
+from models.signal import ScanPair
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+ESCROW_COUNTS = (100, 1_000, 10_000)
+SLATE_EVENTS = 15
+SPORT = "baseball_mlb"
+MARKET_APP_ID = 1000
+ORDERS_PER_BUILD = 16
+SCANNER_ESCROWS = 1_000
+
+
+def load_fixture(name: str, build: Callable[[], Any]) -> Any:
+    """Loads benchmarks/data/<name>.json.gz, or builds the synthetic fixture if there is none."""
+    path = DATA_DIR / f"{name}.json.gz"
+    if path.exists():
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            return json.load(file)
+    return build()
+
+
+def save_fixture(name: str, data: Any) -> None:
+    DATA_DIR.mkdir(exist_ok=True)
+    path = DATA_DIR / f"{name}.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump(data, file)
+    print(f"wrote {path} ({path.stat().st_size / 1024:.0f} KB)")
+
+
+def escrow_fixture(count: Any) -> List[Dict[str, Any]]:
+    """Indexer application records (with global state) created by one market."""
+    return load_fixture(f"indexer_escrows_{count}", lambda: make_escrow_apps(count, MARKET_APP_ID))
+
+
+def escrow_counts() -> List[Any]:
+    """The escrow counts to run, plus "live" when a recorded market dump exists."""
+    counts: List[Any] = list(ESCROW_COUNTS)
+    if (DATA_DIR / "indexer_escrows_live.json.gz").exists():
+        counts.append("live")
+    return counts
+
+
+def slate_fixture() -> List[Dict[str, Any]]:
+    """An Odds API `/odds` response body for a full slate."""
+    return load_fixture(f"odds_slate_{SPORT}", lambda: make_odds_events(SLATE_EVENTS, SPORT, bookmakers=len(BOOKMAKERS)))
+
+
+def synthetic_markets(slate: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Alpha market records, one per event of a slate."""
+    return [
+        make_market(f"BENCH{index:021d}", MARKET_APP_ID + index, f"{event['home_team']} vs {event['away_team']}")["market"]
+        for index, event in enumerate(slate)
+    ]
+
+
+def markets_fixture() -> List[Dict[str, Any]]:
+    """Alpha market records, by default one per event of the slate fixture."""
+    return load_fixture("alpha_markets", lambda: synthetic_markets(slate_fixture()))
+
+
+def record(args: argparse.Namespace) -> None:
+    """Writes the synthetic fixtures, then captures the requested real ones."""
+    for count in ESCROW_COUNTS:
+        save_fixture(f"indexer_escrows_{count}", make_escrow_apps(count, MARKET_APP_ID))
+    slate = make_odds_events(SLATE_EVENTS, SPORT, bookmakers=len(BOOKMAKERS))
+    save_fixture(f"odds_slate_{SPORT}", slate)
+    save_fixture("alpha_markets", synthetic_markets(slate))
+
+    if args.market_app_id or args.market_id:
+        alpha = AlphaHelper()
+        if args.market_app_id:
+            app_address = alpha.algorand.app.get_by_id(args.market_app_id).app_address
+            save_fixture("indexer_escrows_live", alpha.escrow_fetcher.list_created_applications(app_address))
+            alpha.escrow_fetcher.close()
+        if args.market_id:
+            async def fetch_markets():
+                records = await asyncio.gather(*(alpha._fetch_market_record(market_id) for market_id in args.market_id))
+                await alpha.http.aclose()
+                return [record for record in records if record is not None]
+            save_fixture("alpha_markets", asyncio.run(fetch_markets()))
+    if args.odds_sport:
+        odds = OddsAPIHelper()
+
+        async def fetch_slate():
+            response = await odds.http.get(
+                f"{odds.base_url}/{args.odds_sport}/odds/",
+                params={"markets": odds.market, "regions": odds.region, "apiKey": odds.api_key}
+            )
+            response.raise_for_status()
+            await odds.http.aclose()
+            return response.json()
+        save_fixture(f"odds_slate_{SPORT}", asyncio.run(fetch_slate()))
+
+
+# A case's setup gets an ExitStack for servers and cleanup and returns the callable to time
+# and the number of items (escrows, events, orders...) one call processes
+Setup = Callable[[ExitStack], Tuple[Callable[[], Any], int]]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Setup
+
+
+def _alpha_with_indexer(stack: ExitStack, apps: List[Dict[str, Any]], http_client: Optional[AsyncHttpClient] = None) -> AlphaHelper:
+    """An AlphaHelper whose escrows come from a stub indexer; app lookups resolve to the stub's creator."""
+    stub = stack.enter_context(StubIndexer(apps, latency=0.0, include_global_state=True))
+    alpha = AlphaHelper(http_client=http_client)
+    alpha.algorand = SimpleNamespace(app=SimpleNamespace(get_by_id=lambda app_id: SimpleNamespace(app_address="MARKET")))
+    alpha.escrow_fetcher = EscrowStateFetcher(IndexerClient("", stub.url))
+    stack.callback(alpha.escrow_fetcher.close)
+    return alpha
+
+
+def _event_loop(stack: ExitStack, http_client: AsyncHttpClient) -> asyncio.AbstractEventLoop:
+    """A loop kept for the whole case, so pooled connections survive between rounds."""
+    loop = asyncio.new_event_loop()
+    stack.callback(loop.close)
+    stack.callback(lambda: loop.run_until_complete(http_client.aclose()))
+    return loop
+
+
+def decode_case(count: Any) -> Setup:
+    def setup(stack: ExitStack):
+        alpha = AlphaHelper()
+        records = [{"application": app} for app in escrow_fixture(count)]
+        return lambda: [alpha.escrow_decoder.decode(record) for record in records], len(records)
+    return setup
+
+
+def aggregate_case(count: Any) -> Setup:
+    def setup(stack: ExitStack):
+        alpha = AlphaHelper()
+        orders = [alpha.escrow_decoder.decode({"application": app}) for app in escrow_fixture(count)]
+        return lambda: alpha._aggregate_orderbook(orders), len(orders)
+    return setup
+
+
+def snapshot_case(count: Any) -> Setup:
+    def setup(stack: ExitStack):
+        apps = escrow_fixture(count)
+        alpha = _alpha_with_indexer(stack, apps)
+        return lambda: alpha.get_orderbook(MARKET_APP_ID, full_rebuild=True), len(apps)
+    return setup
+
+
+def market_fetch_setup(stack: ExitStack):
+    records = {record["id"]: record for record in markets_fixture()}
+    stub = stack.enter_context(StubApi(
+        {"/api/get-market": lambda query: (200, {"market": records.get(query["marketId"][0])}, {})}, latency=0.0
+    ))
+    http_client = AsyncHttpClient()
+    loop = _event_loop(stack, http_client)
+    alpha = AlphaHelper(http_client=http_client)
+    alpha.BASE_API_URL = f"{stub.url}/api"
+
+    async def fetch_all():
+        return await asyncio.gather(*(alpha.get_market_info(market_id) for market_id in records))
+
+    return lambda: loop.run_until_complete(fetch_all()), len(records)
+
+
+def _odds_stub(stack: ExitStack, slate: List[Dict[str, Any]]) -> StubApi:
+    headers = {"x-requests-remaining": "19500", "x-requests-used": "500", "x-requests-last": "2"}
+    return stack.enter_context(StubApi({f"/v4/sports/{SPORT}/odds": lambda query: (200, slate, headers)}, latency=0.0))
+
+
+def odds_fetch_setup(stack: ExitStack):
+    slate = slate_fixture()
+    stub = _odds_stub(stack, slate)
+    http_client = AsyncHttpClient()
+    loop = _event_loop(stack, http_client)
+    odds = OddsAPIHelper(http_client=http_client)
+    odds.base_url = f"{stub.url}/v4/sports"
+
+    async def fetch_and_parse():
+        orderbooks = await odds._fetch_sport_odds(SPORT, None)
+        return [orderbooks[event_id] for event_id in orderbooks]
+
+    return lambda: loop.run_until_complete(fetch_and_parse()), len(slate)
+
+
+def fair_value_setup(stack: ExitStack):
+    orderbooks = [OddsOrderbook(**event) for event in slate_fixture()]
+    return lambda: [DataFormatter.consensus_fair_probabilities(orderbook) for orderbook in orderbooks], len(orderbooks)
+
+
+def order_build_setup(stack: ExitStack):
+    private_key, _ = account.generate_account()
+    os.environ["SENDER_MNEMONIC"] = mnemonic.from_private_key(private_key)
+    algod = stack.enter_context(StubAlgod(block_time=2.8, latency=0.0))
+    helper = AlgorandHelper(AlgorandClient.from_clients(algod=AlgodClient("a" * 64, algod.url)))
+    market = MarketCore(id="bench", marketAppId=MARKET_APP_ID, yesAssetId=1001, noAssetId=1002, feeBasePercent=70_000)
+    orders = [OrderRequest(is_buying=index % 2 == 0, quantity=10, price=0.40 + index / 100, position=index % 2)
+              for index in range(ORDERS_PER_BUILD)]
+    return lambda: helper._build_order_groups(orders, market), len(orders)
+
+
+def scanner_tick_setup(stack: ExitStack):
+    slate = slate_fixture()
+    markets = markets_fixture()
+    records = {record["id"]: record for record in markets}
+    odds_stub = _odds_stub(stack, slate)
+    alpha_stub = stack.enter_context(StubApi(
+        {"/api/get-market": lambda query: (200, {"market": records.get(query["marketId"][0])}, {})}, latency=0.0
+    ))
+    http_client = AsyncHttpClient()
+    loop = _event_loop(stack, http_client)
+    alpha = _alpha_with_indexer(stack, escrow_fixture(SCANNER_ESCROWS), http_client=http_client)
+    alpha.BASE_API_URL = f"{alpha_stub.url}/api"
+    odds = OddsAPIHelper(http_client=http_client)
+    odds.base_url = f"{odds_stub.url}/v4/sports"
+
+    pairs = [
+        ScanPair(market_id=market["id"], sport=SPORT, event_id=event["id"], yes_outcome=event["home_team"])
+        for market, event in zip(markets, slate)
+    ]
+    scanner = ArbitrageScanner(pairs=pairs, source=LiveDataSource(alpha, odds), edge_threshold=0.02)
+    # The first tick bootstraps every incremental orderbook; rounds measure steady-state ticks
+    loop.run_until_complete(scanner.tick())
+    return lambda: loop.run_until_complete(scanner.tick()), len(pairs)
+
+
+def build_cases() -> List[Case]:
+    cases: List[Case] = []
+    for count in escrow_counts():
+        cases.append(Case(f"decode[{count}]", decode_case(count)))
+        cases.append(Case(f"aggregate[{count}]", aggregate_case(count)))
+        cases.append(Case(f"snapshot[{count}]", snapshot_case(count)))
+    cases += [
+        Case("market_fetch[slate]", market_fetch_setup),
+        Case("odds_fetch[slate]", odds_fetch_setup),
+        Case("fair_value[slate]", fair_value_setup),
+        Case(f"order_build[{ORDERS_PER_BUILD}]", order_build_setup),
+        Case("scanner_tick[slate]", scanner_tick_setup),
+    ]
+    return cases
+
+
+def measure(case: Case, rounds: int, warmup: int) -> Dict[str, Any]:
+    """Runs one case and returns its statistics."""
+    with ExitStack() as stack:
+        run, items = case.setup(stack)
+        for _ in range(warmup):
+            run()
+
+        timings = []
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(rounds):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    timings.sort()
+    median = statistics.median(timings)
+    quartiles = statistics.quantiles(timings, n=4) if len(timings) > 1 else [median] * 3
+    return {
+        "name": case.name,
+        "rounds": rounds,
+        "items": items,
+        "median_ms": median * 1000,
+        "p90_ms": timings[min(len(timings) - 1, int(len(timings) * 0.9))] * 1000,
+        "min_ms": timings[0] * 1000,
+        "spread": (quartiles[2] - quartiles[0]) / median if median else 0.0,
+        "items_per_s": items / median if median else 0.0,
+        "peak_kb": peak / 1024,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    """Prints median ratios against a baseline; returns False if any case regressed by more than `threshold`."""
+    with open(baseline_path, "r") as file:
+        baseline = {result["name"]: result for result in json.load(file)["results"]}
+    print(f"\ncompared with {baseline_path} (regression threshold {threshold:.0%})")
+    print(f"{'case':<24} {'baseline_ms':>12} {'median_ms':>10} {'ratio':>7}")
+    ok = True
+    for result in results:
+        before = baseline.get(result["name"])
+        if before is None:
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else 1.0
+        regressed = ratio > 1 + threshold
+        ok = ok and not regressed
+        print(f"{result['name']:<24} {before['median_ms']:>12.3f} {result['median_ms']:>10.3f} {ratio:>7.2f}"
+              f"{'  REGRESSED' if regressed else ''}")
+    return ok
+
+
+def run(args: argparse.Namespace) -> int:
+    cases = [case for case in build_cases() if not args.k or any(pattern in case.name for pattern in args.k)]
+    print(f"python {platform.python_version()} on {platform.machine()}, {args.rounds} rounds after {args.warmup} warm-up")
+    print(f"{'case':<24} {'median_ms':>10} {'p90_ms':>9} {'spread':>7} {'items/s':>11} {'peak_kb':>9}")
+    results = []
+    for case in cases:
+        result = measure(case, args.rounds, args.warmup)
+        results.append(result)
+        print(f"{case.name:<24} {result['median_ms']:>10.3f} {result['p90_ms']:>9.3f} {result['spread']:>7.1%} "
+              f"{result['items_per_s']:>11.0f} {result['peak_kb']:>9.0f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "rounds": args.rounds, "results": results}, file, indent=2)
+        print(f"\nwrote {args.output}")
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmark cases")
+    run_parser.add_argument("-k", action="append", help="only run cases whose name contains this (repeatable)")
+    run_parser.add_argument("--rounds", type=int, default=10, help="timed rounds per case")
+    run_parser.add_argument("--warmup", type=int, default=2, help="untimed rounds per case")
+    run_parser.add_argument("--output", help="write the results as JSON")
+    run_parser.add_argument("--compare", help="results JSON to compare against")
+    run_parser.add_argument("--threshold", type=float, default=0.10, help="median slowdown counted as a regression")
+
+    record_parser = commands.add_parser("record", help="write fixtures to benchmarks/data")
+    record_parser.add_argument("--market-app-id", type=int, help="capture this market's escrows from the indexer")
+    record_parser.add_argument("--market-id", nargs="+", help="capture these Alpha market records")
+    record_parser.add_argument("--odds-sport", help="capture this sport's slate from the Odds API (uses quota)")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args)
+    else:
+        sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
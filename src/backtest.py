@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Optional
+
+from helpers.capture import CaptureReader
+from helpers.log_helpers import get_logger, set_sample_rate
+from helpers.replay import ReplayEngine
+from helpers.scanner import load_scan_pairs
+from helpers.timeseries import TimeSeriesStore
+from models.signal import EdgeSignal
+
+logger = get_logger(__name__, print_to_console=True)
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """Parses an ISO 8601 date or time (UTC unless it has an offset) to epoch seconds."""
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay captured market data through the scanner.")
+    parser.add_argument("--capture-dir", default="capture", help="Directory written with CAPTURE_DIR")
+    parser.add_argument("--pairs", help="Scan pairs JSON file; defaults to the pairs captured with the data")
+    parser.add_argument("--start", help="Replay from this UTC date/time (ISO 8601)")
+    parser.add_argument("--end", help="Replay up to this UTC date/time (ISO 8601)")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds of capture time per tick")
+    parser.add_argument("--edge-threshold", type=float, default=0.02)
+    parser.add_argument("--devig-method", default="multiplicative")
+    parser.add_argument("--speed", type=float, help="Capture seconds per wall second (default: as fast as possible)")
+    parser.add_argument("--all-ticks", action="store_true", help="Also run ticks in which nothing was captured")
+    parser.add_argument("--signals", help="Write every signal to this JSON lines file")
+    parser.add_argument("--history-db", help="Backfill this time series database with every tick's quotes")
+    parser.add_argument("--verbose", action="store_true", help="Keep the scanner's per-tick and per-signal logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Thousands of ticks per second would flood the log; warnings and errors are kept
+        set_sample_rate("helpers.scanner", 0)
+
+    signals_file = open(args.signals, "w") if args.signals else None
+    history = TimeSeriesStore(args.history_db, tick_seconds=args.interval) if args.history_db else None
+
+    def write_signal(signal: EdgeSignal):
+        if signals_file is not None:
+            signals_file.write(json.dumps({**signal.__dict__, "timestamp": signal.timestamp.isoformat()}) + "\n")
+
+    engine = ReplayEngine(
+        CaptureReader(args.capture_dir, start=parse_time(args.start), end=parse_time(args.end)),
+        pairs=load_scan_pairs(args.pairs) if args.pairs else None,
+        interval_seconds=args.interval,
+        speed=args.speed,
+        skip_unchanged=not args.all_ticks,
+        on_signal=write_signal,
+        on_quotes=history.ingest if history is not None else None,
+        edge_threshold=args.edge_threshold,
+        devig_method=args.devig_method
+    )
+    try:
+        stats = await engine.run()
+    finally:
+        if signals_file is not None:
+            signals_file.close()
+        if history is not None:
+            history.close()
+    logger.info(
+        f"Backtest done: {stats.records} records, {stats.ticks} ticks, {stats.signals} signals, "
+        f"{stats.wall_seconds:.1f}s wall time ({stats.speedup:.0f}x real time)"
+    )
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,9 +8,31 @@ load_dotenv()
 class Settings(BaseSettings):
     INTERVAL_SECONDS: int
     LOG_LEVEL: str
+    LOG_SAMPLE_RATES: str = ""
+    METRICS_ENABLED: bool = False
+    METRICS_PORT: int = 9108
+    METRICS_SUMMARY_SECONDS: float = 60.0
     CONTAINER_NAME: str
     ODDS_API_KEY: str
     SENDER_MNEMONIC: str
+    ODDS_CACHE_TTL_SECONDS: float = 5.0
+    ODDS_CACHE_STALE_SECONDS: float = 10.0
+    ODDS_CACHE_MAX_ENTRIES: int = 128
+    ODDS_MARKETS: str = "h2h,spreads"
+    ODDS_BOOKMAKERS: str = ""
+    SCAN_PAIRS_FILE: str = "scan_pairs.json"
+    EDGE_THRESHOLD: float = 0.02
+    DEVIG_METHOD: str = "multiplicative"
+    SOURCE_TIMEOUT_SECONDS: float = 5.0
+    MARKET_VOLATILE_TTL_SECONDS: float = 30.0
+    SCAN_WORKERS: int = 0
+    SCAN_SPORTS: str = "baseball_mlb"
+    MATCH_INDEX_FILE: str = "match_index.json"
+    MATCH_WINDOW_HOURS: float = 36.0
+    MATCH_REFRESH_SECONDS: int = 600
+    CAPTURE_DIR: str = ""
+    HISTORY_DB: str = ""
+    ORDER_REGISTRY_PATH: str = ""
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,163 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from algosdk import transaction
+
+from helpers.log_helpers import get_logger
+
+logger = get_logger(__name__)
+
+class AccountState:
+    """
+    Local mirror of one account's ALGO balance, minimum balance and ASA holdings.
+
+    `refresh` reads everything with a single `account_info` call; between refreshes the
+    mirror is kept current by applying our own confirmed transaction groups (fees,
+    payments, asset transfers and opt-ins). Effects the mirror cannot derive locally,
+    such as the inner transactions of application calls returning escrowed funds, mark
+    it dirty so the next `ensure_fresh` reads the account again. Until then balances are
+    a lower bound, which is the safe side when sizing orders.
+    """
+
+    OPT_IN_MIN_BALANCE = 100_000  # Minimum balance increase per ASA opt-in, in microALGO
+
+    def __init__(self, algod_client: Any, address: str, max_age_seconds: float = 60.0):
+        """
+        Initialize the mirror; nothing is read until the first refresh.
+
+        Args:
+            algod_client: An algosdk AlgodClient
+            address: Account to mirror
+            max_age_seconds: Age after which `ensure_fresh` reads the account again
+        """
+        self.algod_client = algod_client
+        self.address = address
+        self.max_age_seconds = max_age_seconds
+
+        self.algo_balance = 0
+        self.min_balance = 0
+        self.assets: Dict[int, int] = {}  # Opted-in asset ID -> amount in base units
+        self.round = 0  # Round of the last account read
+        self.applied_round = 0  # Latest round of a group applied locally
+        self.refreshed_at: Optional[float] = None
+        self.dirty = True
+
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def spendable_algo(self) -> int:
+        """ALGO above the minimum balance, in microALGO."""
+        return max(0, self.algo_balance - self.min_balance)
+
+    def is_opted_in(self, asset_id: int) -> bool:
+        """Whether the account holds (is opted into) an asset."""
+        return asset_id in self.assets
+
+    def balance(self, asset_id: int) -> int:
+        """Amount held of an asset in base units, 0 if not opted in."""
+        return self.assets.get(asset_id, 0)
+
+    def missing_opt_ins(self, asset_ids: Iterable[int]) -> List[int]:
+        """Returns the distinct assets in `asset_ids` the account is not opted into, in order."""
+        return [asset_id for asset_id in dict.fromkeys(asset_ids) if asset_id not in self.assets]
+
+    async def ensure_fresh(self) -> None:
+        """Refreshes the mirror if it was never read, is dirty or is older than `max_age_seconds`."""
+        if not self._is_fresh():
+            if self._refresh_lock is None:
+                self._refresh_lock = asyncio.Lock()
+            async with self._refresh_lock:
+                # Concurrent callers share one read
+                if not self._is_fresh():
+                    await self.refresh()
+
+    async def refresh(self) -> None:
+        """Reads the account from algod in one call and replaces the mirror."""
+        info = await asyncio.to_thread(self.algod_client.account_info, self.address)
+        self.load(info)
+
+    def load(self, info: Dict[str, Any]) -> None:
+        """
+        Replaces the mirror with an `account_info` response.
+
+        Args:
+            info: The algod account information
+        """
+        info_round = info.get("round", 0)
+        # Groups applied locally in later rounds are not in this response yet
+        missed_local_updates = info_round < self.applied_round
+
+        self.algo_balance = info.get("amount", 0)
+        self.min_balance = info.get("min-balance", 0)
+        self.assets = {asset["asset-id"]: asset.get("amount", 0) for asset in info.get("assets", [])}
+        self.round = info_round
+        self.refreshed_at = time.monotonic()
+        self.dirty = missed_local_updates
+        logger.debug(
+            f"Account state at round {self.round}: {self.algo_balance} microALGO "
+            f"(min {self.min_balance}), {len(self.assets)} assets"
+        )
+
+    def apply_group(
+        self,
+        txns: Iterable[transaction.Transaction],
+        confirmed_round: int,
+        app_calls_credit: bool = True
+    ) -> None:
+        """
+        Applies the effects of a confirmed transaction group sent by or to the account.
+
+        Groups from rounds the last account read already covers are skipped, so a refresh
+        that raced with a confirmation does not count it twice.
+
+        Args:
+            txns: The group's transactions
+            confirmed_round: Round the group confirmed in
+            app_calls_credit: Whether the group's application calls may send funds back to
+                the account; if so the mirror is marked dirty
+        """
+        if confirmed_round <= self.round and self.refreshed_at is not None:
+            return
+        for txn in txns:
+            self._apply_txn(txn, app_calls_credit)
+        self.applied_round = max(self.applied_round, confirmed_round)
+
+    def _apply_txn(self, txn: transaction.Transaction, app_calls_credit: bool) -> None:
+        """Applies the balance changes of one transaction."""
+        sent = txn.sender == self.address
+        if sent:
+            self.algo_balance -= txn.fee
+
+        if isinstance(txn, transaction.PaymentTxn):
+            if sent:
+                self.algo_balance -= txn.amt
+            if txn.receiver == self.address:
+                self.algo_balance += txn.amt
+            if txn.close_remainder_to:
+                self.dirty = True
+        elif isinstance(txn, transaction.AssetTransferTxn):
+            asset_id = txn.index
+            if sent and txn.receiver == self.address and txn.amount == 0 and asset_id not in self.assets:
+                self.assets[asset_id] = 0
+                self.min_balance += self.OPT_IN_MIN_BALANCE
+            else:
+                if sent and asset_id in self.assets:
+                    self.assets[asset_id] -= txn.amount
+                if txn.receiver == self.address and asset_id in self.assets:
+                    self.assets[asset_id] += txn.amount
+            if sent and txn.close_assets_to:
+                # The remainder leaves and the holding is closed out
+                self.assets.pop(asset_id, None)
+                self.min_balance -= self.OPT_IN_MIN_BALANCE
+        elif sent and (app_calls_credit or not isinstance(txn, transaction.ApplicationCallTxn)):
+            # Inner transactions and other transaction types may move funds we cannot see
+            self.dirty = True
+
+    def _is_fresh(self) -> bool:
+        """Whether the mirror can be used without reading the account again."""
+        return (
+            not self.dirty
+            and self.refreshed_at is not None
+            and time.monotonic() - self.refreshed_at < self.max_age_seconds
+        )
@@ -1,34 +1,41 @@
+import asyncio
+import base64
 import time
-from typing import Dict, Tuple, Optional, Union
+from typing import Dict, List, Tuple, Optional, Union
 from pathlib import Path
 import json
 import math
-import os
 
 from algosdk import account, mnemonic, transaction
 from algosdk.v2client import algod
 from algosdk.abi import Method
-from algosdk.abi.method import Argument, Returns
 from algosdk.error import AlgodHTTPError
 from algosdk.transaction import PaymentTxn, AssetTransferTxn
 from algosdk.atomic_transaction_composer import (
     AccountTransactionSigner,
     AtomicTransactionComposer,
+    AtomicTransactionResponse,
     TransactionWithSigner,
 )
 
 from algokit_utils import (
     AppClient,
     AlgorandClient,
-    AppClientParams,
     AppClientMethodCallParams,
     AlgoAmount,
     ApplicationSpecification
 )
 
+from helpers.account_state import AccountState
+from helpers.algorand_session import AlgorandSession
 from helpers.alpha_helper import AlphaHelper
+from helpers.incremental_orderbook import METHOD_SELECTORS
 from helpers.log_helpers import get_logger
+from helpers.metrics import timed
+from helpers.order_registry import OrderRegistry
+from helpers.submission_pipeline import SubmissionPipeline
 from models.market import Market
+from models.order import OpenOrder, OrderRequest, SubmissionHandle
 
 logger = get_logger(__name__)
 
@@ -37,13 +44,106 @@ class AlgorandHelper:
     
     USDC_ASSET_ID = 31566704
     MICRO_UNIT = 1_000_000  # 1 USDC = 1_000_000 microUSDC
+    ESCROW_ALGO_FUNDING = 967_600  # Minimum balance and fees funded into each new escrow
+    MAX_GROUP_SIZE = AtomicTransactionComposer.MAX_GROUP_SIZE
+    TXNS_PER_ORDER = 3  # ALGO funding, asset funding and the create_escrow call
     
-    def __init__(self):
-        """Initialize the AlgorandHelper with mainnet connection."""
-        self.algorand = AlgorandClient.mainnet()
+    def __init__(self, algorand: Optional[AlgorandClient] = None, order_registry: Optional[OrderRegistry] = None):
+        """
+        Initialize the AlgorandHelper with mainnet connection.
+        
+        Args:
+            algorand: Algorand client to use (defaults to mainnet)
+            order_registry: Registry our confirmed orders and cancels are recorded in
+                (defaults to an in-memory registry)
+        """
+        self.algorand = algorand or AlgorandClient.mainnet()
         self.algod_client = self.algorand.client.algod
+        self.order_registry = order_registry if order_registry is not None else OrderRegistry()
+        self.pipeline = SubmissionPipeline(self.algod_client)
+        self.pipeline.confirm_listeners.append(self._on_group_confirmed)
+        self._session: Optional[AlgorandSession] = None
+        self._account_state: Optional[AccountState] = None
         self._load_app_specs()
     
+    @property
+    def session(self) -> AlgorandSession:
+        """
+        The signing session for SENDER_MNEMONIC, created on first use.
+        
+        Raises:
+            ValueError: If SENDER_MNEMONIC is not set
+        """
+        if self._session is None:
+            self._session = AlgorandSession.from_env(
+                self.algorand,
+                self.MARKET_APP_SPEC,
+                current_round=lambda: self.pipeline.last_round
+            )
+        return self._session
+    
+    @property
+    def account_state(self) -> AccountState:
+        """
+        The local mirror of the trading account's balances and opt-ins, created on first use.
+        
+        Raises:
+            ValueError: If SENDER_MNEMONIC is not set
+        """
+        if self._account_state is None:
+            self._account_state = AccountState(self.algod_client, self.session.address)
+        return self._account_state
+    
+    def _on_group_confirmed(
+        self,
+        handle: SubmissionHandle,
+        atc: AtomicTransactionComposer,
+        response: AtomicTransactionResponse
+    ) -> None:
+        """Applies a confirmed group to the order registry and the account mirror."""
+        txns = [txn.txn for txn in atc.txn_list]
+        self._record_orders(txns, atc, response)
+        if self._account_state is None:
+            return
+        # Creating an escrow sends nothing back; any other app call (e.g. delete_escrow) may
+        app_calls = sum(isinstance(txn, transaction.ApplicationCallTxn) for txn in txns)
+        escrow_creates = sum(method.name == "create_escrow" for method in atc.method_dict.values())
+        self._account_state.apply_group(txns, handle.confirmed_round, app_calls_credit=app_calls > escrow_creates)
+    
+    def _record_orders(
+        self,
+        txns: List[transaction.Transaction],
+        atc: AtomicTransactionComposer,
+        response: AtomicTransactionResponse
+    ) -> None:
+        """Registers the escrows a confirmed group created and drops the ones it deleted."""
+        escrow_ids = {
+            index: result.return_value
+            for index, result in zip(atc.method_dict, response.abi_results) if result is not None
+        }
+        for index, txn in enumerate(txns):
+            if not isinstance(txn, transaction.ApplicationCallTxn) or not txn.app_args:
+                continue
+            method = METHOD_SELECTORS.get(base64.b64encode(txn.app_args[0]).decode())
+            if method == "create_escrow" and index in escrow_ids:
+                # create_escrow(price, quantity, slippage, position), funded by the transfer before it
+                price, quantity, slippage, position = (int.from_bytes(arg, "big") for arg in txn.app_args[1:5])
+                funding = txns[index - 1]
+                self.order_registry.add(OpenOrder(
+                    escrow_app_id=escrow_ids[index],
+                    market_app_id=txn.index,
+                    position=position,
+                    side=1 if funding.index == self.USDC_ASSET_ID else 0,
+                    price=price,
+                    quantity=quantity,
+                    slippage=slippage,
+                    created_round=response.confirmed_round,
+                    checked_round=response.confirmed_round
+                ))
+            elif method == "delete_escrow" and len(txn.app_args) > 1:
+                self.order_registry.remove(int.from_bytes(txn.app_args[1], "big"))
+        self.order_registry.save_if_dirty()
+    
     def _load_app_specs(self) -> None:
         """Load application specifications from JSON files."""
         base_path = Path(__file__).parent.parent / 'app_specs'
@@ -104,15 +204,9 @@ class AlgorandHelper:
         Returns:
             bool: True if opted in, False otherwise
         """
-        sender_mnemonic = os.getenv("SENDER_MNEMONIC")
-        if not sender_mnemonic:
-            raise ValueError("SENDER_MNEMONIC not found in environment")
-            
-        private_key = mnemonic.to_private_key(sender_mnemonic)
-        address = account.address_from_private_key(private_key)
-        
-        info = self.algod_client.account_info(address)
-        return any(asset.get("asset-id") == asset_id for asset in info.get("assets", []))
+        state = self.account_state
+        await state.ensure_fresh()
+        return state.is_opted_in(asset_id)
 
     async def opt_in_to_asset(self, asset_id: int) -> None:
         """
@@ -124,32 +218,115 @@ class AlgorandHelper:
         Raises:
             Exception: If environment variables are missing or transaction fails
         """
-        sender_mnemonic = os.getenv("SENDER_MNEMONIC")
-        if not sender_mnemonic:
-            raise ValueError("SENDER_MNEMONIC not found in environment")
-            
-        private_key = mnemonic.to_private_key(sender_mnemonic)
-        address = account.address_from_private_key(private_key)
+        session = self.session
         
         try:
-            params = self.algod_client.suggested_params()
+            params = session.suggested_params()
             txn = AssetTransferTxn(
-                sender=address,
+                sender=session.address,
                 sp=params,
-                receiver=address,
+                receiver=session.address,
                 amt=0,
                 index=asset_id
             )
-            signed_txn = txn.sign(private_key)
-            txid = self.algod_client.send_transaction(signed_txn)
-            logger.info(f"[ACTION] Sent opt-in transaction for asset {asset_id}, txID: {txid}")
+            atc = AtomicTransactionComposer()
+            atc.add_transaction(TransactionWithSigner(txn, session.signer))
+            handle = await self.pipeline.submit(atc, label=f"opt-in to asset {asset_id}", wait_rounds=4)
+            logger.info(f"[ACTION] Sent opt-in transaction for asset {asset_id}, txID: {handle.tx_id}")
             
-            transaction.wait_for_confirmation(self.algod_client, txid, 4)
+            await handle.done
             logger.info(f"[INFO] Successfully opted into asset {asset_id}")
         except Exception as e:
             logger.error(f"[ERROR] Error opting into asset {asset_id}: {e}")
             raise
 
+    async def opt_in_to_assets(self, asset_ids: List[int]) -> List[int]:
+        """
+        Opt into every asset in `asset_ids` the wallet does not hold yet, MAX_GROUP_SIZE per group.
+        
+        Args:
+            asset_ids: Asset IDs to opt into; held assets and duplicates are skipped
+            
+        Returns:
+            List of asset IDs opted into; assets of failed groups are left out
+            
+        Raises:
+            ValueError: If the wallet cannot cover the fees and minimum balance increase
+        """
+        session = self.session
+        state = self.account_state
+        await state.ensure_fresh()
+        missing = state.missing_opt_ins(asset_ids)
+        if not missing:
+            return []
+        
+        sp = session.suggested_params()
+        required = len(missing) * (AccountState.OPT_IN_MIN_BALANCE + max(sp.min_fee, sp.fee))
+        if state.spendable_algo < required:
+            raise ValueError(
+                f"Opting into {len(missing)} assets needs {self.from_micro_units(required)} ALGO, "
+                f"{self.from_micro_units(state.spendable_algo)} ALGO available"
+            )
+        
+        groups: List[AtomicTransactionComposer] = []
+        for start in range(0, len(missing), self.MAX_GROUP_SIZE):
+            atc = AtomicTransactionComposer()
+            for asset_id in missing[start:start + self.MAX_GROUP_SIZE]:
+                atc.add_transaction(TransactionWithSigner(
+                    AssetTransferTxn(
+                        sender=session.address,
+                        sp=sp,
+                        receiver=session.address,
+                        amt=0,
+                        index=asset_id
+                    ),
+                    session.signer
+                ))
+            groups.append(atc)
+        
+        logger.info(f"[ACTION] Opting into {len(missing)} assets in {len(groups)} groups...")
+        responses = await self._execute_groups(groups)
+        return [
+            asset_id
+            for index, res in enumerate(responses) if res is not None
+            for asset_id in missing[index * self.MAX_GROUP_SIZE:(index + 1) * self.MAX_GROUP_SIZE]
+        ]
+
+    async def opt_in_to_markets(self, markets: List[Market]) -> List[int]:
+        """
+        Opt into the YES and NO tokens of several markets in as few groups as possible.
+        
+        Args:
+            markets: Market objects containing asset IDs
+            
+        Returns:
+            List of asset IDs opted into
+            
+        Raises:
+            ValueError: If the wallet cannot cover the fees and minimum balance increase
+        """
+        return await self.opt_in_to_assets(
+            [asset_id for market in markets for asset_id in (market.yesAssetId, market.noAssetId)]
+        )
+
+    async def get_market_balances(self, market: Market) -> Dict[str, float]:
+        """
+        USDC, YES and NO balances for sizing orders on a market, from the account mirror.
+        
+        Args:
+            market: Market object containing asset IDs
+            
+        Returns:
+            Dict with "USDC", "YES" and "NO" amounts in standard units
+        """
+        state = self.account_state
+        await state.ensure_fresh()
+        return {
+            "USDC": self.from_micro_units(state.balance(self.USDC_ASSET_ID)),
+            "YES": self.from_micro_units(state.balance(market.yesAssetId)),
+            "NO": self.from_micro_units(state.balance(market.noAssetId))
+        }
+
     @staticmethod
     def to_micro_units(amount: Union[int, float]) -> int:
         """
@@ -202,6 +379,7 @@ class AlgorandHelper:
         """
         return percentage / 100  # 100 micro-units = 1%
 
+    @timed("algorand_create_bet_seconds")
     async def create_bet(
         self,
         is_buying: bool,
@@ -228,47 +406,192 @@ class AlgorandHelper:
         Raises:
             Exception: If environment variables are missing or transaction fails
         """
-        # Convert human-readable numbers to micro-units
-        micro_quantity = self.to_micro_units(quantity)
-        micro_price = self.to_micro_units(price)
-        micro_slippage = self.to_micro_percentage(slippage)
+        order = OrderRequest(is_buying=is_buying, quantity=quantity, price=price, position=position, slippage=slippage)
         
-        sender_mnemonic = os.getenv("SENDER_MNEMONIC")
-        if not all([sender_mnemonic, market.marketAppId, self.USDC_ASSET_ID, market.yesAssetId, market.noAssetId]):
+        session = self.session
+        if not all([market.marketAppId, self.USDC_ASSET_ID, market.yesAssetId, market.noAssetId]):
             raise ValueError("Missing required environment variables")
-            
-        private_key = mnemonic.to_private_key(sender_mnemonic)
-        sender_address = account.address_from_private_key(private_key)
-        signer = AccountTransactionSigner(private_key)
+        sender_address, signer = session.address, session.signer
         
         logger.info(f"[INFO] {'Buying' if is_buying else 'Selling'} {'YES' if position else 'NO'} tokens: qty={quantity}, price={price} USDC")
         
-        sp = self.algod_client.suggested_params()
-        fund_asset_id = self.USDC_ASSET_ID if is_buying else (market.yesAssetId if position == 1 else market.noAssetId)
-        
-        # Build ABI Method
-        create_escrow_method = Method(
-            name="create_escrow",
-            args=[
-                Argument(name="price", arg_type="uint64"),
-                Argument(name="quantity", arg_type="uint64"),
-                Argument(name="slippage", arg_type="uint64"),
-                Argument(name="position", arg_type="uint8"),
-            ],
-            returns=Returns(arg_type="uint64")
-        )
+        sp = session.suggested_params()
         
         # Build transaction group
         atc = AtomicTransactionComposer()
         
+        try:
+            self._add_order(
+                atc, order, market, sender_address, signer, sp, session.create_escrow_method,
+                note_suffix=f" {time.time_ns()}:0".encode()
+            )
+            
+            logger.info("[INFO] Submitting group...")
+            res = await self._execute_group(atc, label=f"order for market {market.marketAppId}")
+            logger.info(f"[INFO] Success: {res.tx_ids}, confirmed in {res.confirmed_round}")
+            return res.abi_results[0].return_value
+            
+        except (AlgodHTTPError, RuntimeError) as e:
+            logger.error(f"[ERROR] ATC error: {e}")
+            raise
+
+    async def create_bets(self, orders: List[OrderRequest], market: Market) -> List[Optional[int]]:
+        """
+        Create several bets on one market with as few transaction groups as possible.
+        
+        Each order takes three transactions (ALGO funding, asset funding and the
+        `create_escrow` call), so up to MAX_GROUP_SIZE // TXNS_PER_ORDER orders share an
+        atomic group. Groups are signed with one set of suggested params and submitted
+        concurrently; every group is atomic on its own, but one failing group does not
+        affect the others.
+        
+        Args:
+            orders: Orders to place, in standard units as taken by `create_bet`
+            market: Market object containing asset IDs and app IDs
+            
+        Returns:
+            List of escrow app IDs in the order of `orders`; None for orders whose group failed
+            
+        Raises:
+            ValueError: If environment variables are missing
+        """
+        if not orders:
+            return []
+        
+        groups = self._build_order_groups(orders, market)
+        logger.info(f"[INFO] Submitting {len(orders)} orders for market {market.marketAppId} in {len(groups)} groups...")
+        return self._escrow_ids(groups, await self._execute_groups(groups))
+
+    async def submit_bets(self, orders: List[OrderRequest], market: Market) -> List[SubmissionHandle]:
+        """
+        Send the groups `create_bets` would send and return without waiting for confirmation.
+        
+        Each handle's `done` future resolves to the group's AtomicTransactionResponse, whose
+        ABI results are the new escrow app IDs; `self.pipeline` tracks every group in flight.
+        
+        Args:
+            orders: Orders to place, in standard units as taken by `create_bet`
+            market: Market object containing asset IDs and app IDs
+            
+        Returns:
+            One SubmissionHandle per group, covering `orders` in order
+            
+        Raises:
+            ValueError: If environment variables are missing
+            AlgodHTTPError: If algod rejects a group
+        """
+        if not orders:
+            return []
+        groups = self._build_order_groups(orders, market)
+        return list(await asyncio.gather(
+            *(self.pipeline.submit(atc, label=f"orders for market {market.marketAppId}") for atc in groups)
+        ))
+
+    def _build_order_groups(self, orders: List[OrderRequest], market: Market) -> List[AtomicTransactionComposer]:
+        """Packs orders into transaction groups of up to MAX_GROUP_SIZE // TXNS_PER_ORDER orders."""
+        session = self.session
+        if not all([market.marketAppId, self.USDC_ASSET_ID, market.yesAssetId, market.noAssetId]):
+            raise ValueError("Missing required environment variables")
+        sender_address, signer = session.address, session.signer
+        
+        sp = session.suggested_params()
+        create_escrow_method = session.create_escrow_method
+        
+        # Identical orders would otherwise produce identical transactions (and transaction IDs)
+        batch_id = time.time_ns()
+        orders_per_group = self.MAX_GROUP_SIZE // self.TXNS_PER_ORDER
+        groups: List[AtomicTransactionComposer] = []
+        for start in range(0, len(orders), orders_per_group):
+            atc = AtomicTransactionComposer()
+            for index in range(start, min(start + orders_per_group, len(orders))):
+                self._add_order(
+                    atc, orders[index], market, sender_address, signer, sp, create_escrow_method,
+                    note_suffix=f" {batch_id}:{index}".encode()
+                )
+            groups.append(atc)
+        return groups
+
+    async def _execute_group(self, atc: AtomicTransactionComposer, label: str = "") -> AtomicTransactionResponse:
+        """
+        Sends a transaction group through the pipeline and waits up to 4 rounds for it,
+        without blocking the event loop.
+        
+        Raises:
+            AlgodHTTPError: If algod rejects the group
+            RuntimeError: If the group does not confirm
+        """
+        handle = await self.pipeline.submit(atc, label=label, wait_rounds=4)
+        return await handle.done
+
+    async def _execute_groups(self, groups: List[AtomicTransactionComposer]) -> List[Optional[AtomicTransactionResponse]]:
+        """
+        Executes transaction groups concurrently, waiting up to 4 rounds for each.
+        
+        Args:
+            groups: Built transaction groups
+            
+        Returns:
+            The response for each group, or None for groups that failed
+        """
+        results = await asyncio.gather(*(self._execute_group(atc) for atc in groups), return_exceptions=True)
+        
+        responses: List[Optional[AtomicTransactionResponse]] = []
+        for res in results:
+            if isinstance(res, BaseException):
+                logger.error(f"[ERROR] ATC error: {res}")
+                responses.append(None)
+            else:
+                logger.info(f"[INFO] Success: {len(res.tx_ids)} txns confirmed in {res.confirmed_round}")
+                responses.append(res)
+        return responses
+
+    @staticmethod
+    def _escrow_ids(
+        groups: List[AtomicTransactionComposer],
+        responses: List[Optional[AtomicTransactionResponse]]
+    ) -> List[Optional[int]]:
+        """Flattens the `create_escrow` return values of executed groups, None for failed groups."""
+        escrow_ids: List[Optional[int]] = []
+        for atc, res in zip(groups, responses):
+            if res is None:
+                escrow_ids.extend([None] * len(atc.method_dict))
+            else:
+                escrow_ids.extend(result.return_value for result in res.abi_results)
+        return escrow_ids
+
+    def _add_order(
+        self,
+        atc: AtomicTransactionComposer,
+        order: OrderRequest,
+        market: Market,
+        sender_address: str,
+        signer: AccountTransactionSigner,
+        sp: transaction.SuggestedParams,
+        create_escrow_method: Method,
+        note_suffix: bytes = b""
+    ) -> None:
+        """
+        Adds the three transactions placing one order to a transaction group.
+        
+        The market app finds the funding transfers relative to its own group index, so
+        several orders can follow each other in one group.
+        """
+        # Convert human-readable numbers to micro-units
+        micro_quantity = self.to_micro_units(order.quantity)
+        micro_price = self.to_micro_units(order.price)
+        micro_slippage = self.to_micro_percentage(order.slippage)
+        
+        fund_asset_id = self.USDC_ASSET_ID if order.is_buying else (market.yesAssetId if order.position == 1 else market.noAssetId)
+        market_app_address = transaction.logic.get_application_address(market.marketAppId)
+        
         # Add ALGO funding transaction
         atc.add_transaction(TransactionWithSigner(
             PaymentTxn(
                 sender_address,
                 sp,
-                transaction.logic.get_application_address(market.marketAppId),
-                967_600,
-                note=b"Escrow ALGO Funding"
+                market_app_address,
+                self.ESCROW_ALGO_FUNDING,
+                note=b"Escrow ALGO Funding" + note_suffix
             ),
             signer
         ))
@@ -280,33 +603,26 @@ class AlgorandHelper:
             AssetTransferTxn(
                 sender_address,
                 sp,
-                transaction.logic.get_application_address(market.marketAppId),
+                market_app_address,
                 asset_amt,
                 fund_asset_id,
-                note=b"Escrow Asset Funding"
+                note=b"Escrow Asset Funding" + note_suffix
             ),
             signer
         ))
         
-        try:
-            atc.add_method_call(
-                app_id=market.marketAppId,
-                method=create_escrow_method,
-                sender=sender_address,
-                sp=sp,
-                signer=signer,
-                method_args=[micro_price, micro_quantity, micro_slippage, position],
-                foreign_assets=[self.USDC_ASSET_ID, market.yesAssetId, market.noAssetId]
-            )
-            
-            logger.info("[INFO] Submitting group...")
-            res = atc.execute(self.algod_client, 4)
-            logger.info(f"[INFO] Success: {res.tx_ids}, confirmed in {res.confirmed_round}")
-            return res.abi_results[0].return_value
-            
-        except AlgodHTTPError as e:
-            logger.error(f"[ERROR] ATC error: {e}")
-            raise
+        atc.add_method_call(
+            app_id=market.marketAppId,
+            method=create_escrow_method,
+            sender=sender_address,
+            sp=sp,
+            signer=signer,
+            method_args=[micro_price, micro_quantity, micro_slippage, order.position],
+            foreign_assets=[self.USDC_ASSET_ID, market.yesAssetId, market.noAssetId],
+            # The side is only implied by the funding asset, so a buy and a sell at the same
+            # price would otherwise be identical app calls
+            note=b"Escrow Create" + note_suffix if note_suffix else None
+        )
 
     async def cancel_bet(self, escrow_app_id: int, market: Market) -> None:
         """
@@ -320,37 +636,233 @@ class AlgorandHelper:
             ValueError: If environment variables are missing
             AlgodHTTPError: If transaction fails
         """
-        sender_mnemonic = os.getenv("SENDER_MNEMONIC")
-        if not sender_mnemonic:
-            raise ValueError("Missing sender mnemonic in environment")
-            
-        private_key = mnemonic.to_private_key(sender_mnemonic)
-        sender_address = account.address_from_private_key(private_key)
-        signer = AccountTransactionSigner(private_key)
-        
-        # Initialize app clients
-        escrow_app_client = AppClient(
-            AppClientParams(
-                app_spec=self.ESCROW_APP_SPEC,
-                app_id=escrow_app_id,
-                algorand=self.algorand,
-                default_sender=sender_address
-            )
-        )
-        
-        market_app_client = AppClient(
-            AppClientParams(
-                app_spec=self.MARKET_APP_SPEC,
-                app_id=market.marketAppId,
-                algorand=self.algorand,
-                default_sender=sender_address
-            )
-        )
+        session = self.session
+        sender_address, signer = session.address, session.signer
         
         # Build transaction group
         atc = AtomicTransactionComposer()
+        self._add_cancel(
+            atc, escrow_app_id, market, session.market_app_client(market.marketAppId), sender_address, signer,
+            session.suggested_params()
+        )
+        
+        try:
+            logger.info(f"[ACTION] Submitting cancel order for {escrow_app_id}...")
+            res = await self._execute_group(atc, label=f"cancel of escrow {escrow_app_id}")
+            logger.info(f"[INFO] Success: {res.tx_ids}, confirmed in {res.confirmed_round}")
+        except (AlgodHTTPError, RuntimeError) as e:
+            logger.error(f"[ERROR] ATC error: {e}")
+            raise
+
+    async def cancel_bets(self, escrow_app_ids: List[int], market: Market) -> List[bool]:
+        """
+        Cancel several bets on one market, packing up to MAX_GROUP_SIZE `delete_escrow`
+        calls into each atomic group and submitting the groups concurrently.
+        
+        Args:
+            escrow_app_ids: The IDs of the escrow applications to cancel
+            market: Market object containing asset IDs and app IDs
+            
+        Returns:
+            Whether each escrow was cancelled, in the order of `escrow_app_ids`
+            
+        Raises:
+            ValueError: If environment variables are missing
+        """
+        if not escrow_app_ids:
+            return []
+        
+        groups = self._build_cancel_groups(escrow_app_ids, market)
+        logger.info(f"[ACTION] Submitting cancel orders for {len(escrow_app_ids)} escrows in {len(groups)} groups...")
+        cancelled: List[bool] = []
+        for atc, res in zip(groups, await self._execute_groups(groups)):
+            cancelled.extend([res is not None] * atc.get_tx_count())
+        return cancelled
+
+    async def cancel_market_orders(
+        self,
+        market: Market,
+        position: Optional[int] = None,
+        side: Optional[int] = None
+    ) -> List[int]:
+        """
+        Cancel our open orders on a market, as recorded in the order registry.
+        
+        Args:
+            market: Market object containing asset IDs and app IDs
+            position: Only cancel orders on this position (1 YES, 0 NO)
+            side: Only cancel orders on this side (1 buy, 0 sell)
+            
+        Returns:
+            List of escrow app IDs cancelled
+            
+        Raises:
+            ValueError: If environment variables are missing
+        """
+        escrow_app_ids = [
+            order.escrow_app_id
+            for order in self.order_registry.for_market(market.marketAppId)
+            if (position is None or order.position == position) and (side is None or order.side == side)
+        ]
+        cancelled = await self.cancel_bets(escrow_app_ids, market)
+        return [escrow_app_id for escrow_app_id, ok in zip(escrow_app_ids, cancelled) if ok]
+
+    async def submit_cancels(self, escrow_app_ids: List[int], market: Market) -> List[SubmissionHandle]:
+        """
+        Send the groups `cancel_bets` would send and return without waiting for confirmation.
+        
+        Args:
+            escrow_app_ids: The IDs of the escrow applications to cancel
+            market: Market object containing asset IDs and app IDs
+            
+        Returns:
+            One SubmissionHandle per group of up to MAX_GROUP_SIZE escrows, in order
+            
+        Raises:
+            ValueError: If environment variables are missing
+            AlgodHTTPError: If algod rejects a group
+        """
+        if not escrow_app_ids:
+            return []
+        groups = self._build_cancel_groups(escrow_app_ids, market)
+        return list(await asyncio.gather(
+            *(self.pipeline.submit(atc, label=f"cancels for market {market.marketAppId}") for atc in groups)
+        ))
+
+    def _build_cancel_groups(self, escrow_app_ids: List[int], market: Market) -> List[AtomicTransactionComposer]:
+        """Packs `delete_escrow` calls into transaction groups of up to MAX_GROUP_SIZE."""
+        session = self.session
+        sender_address, signer = session.address, session.signer
+        market_app_client = session.market_app_client(market.marketAppId)
+        sp = session.suggested_params()
+        
+        groups: List[AtomicTransactionComposer] = []
+        for start in range(0, len(escrow_app_ids), self.MAX_GROUP_SIZE):
+            atc = AtomicTransactionComposer()
+            for escrow_app_id in escrow_app_ids[start:start + self.MAX_GROUP_SIZE]:
+                self._add_cancel(atc, escrow_app_id, market, market_app_client, sender_address, signer, sp)
+            groups.append(atc)
+        return groups
+
+    async def replace_bet(self, escrow_app_id: int, order: OrderRequest, market: Market) -> int:
+        """
+        Atomically cancel an existing bet and place a new one in its place (amend).
+        
+        The `delete_escrow` call and the three transactions creating the new escrow go in
+        one group, so the old quote is never pulled without the new one landing, and the
+        funds released by the deletion can fund the new order.
+        
+        Args:
+            escrow_app_id: The ID of the escrow application to replace
+            order: The new order, in standard units as taken by `create_bet`
+            market: Market object containing asset IDs and app IDs
+            
+        Returns:
+            int: The new escrow app ID
+            
+        Raises:
+            ValueError: If environment variables are missing
+            RuntimeError: If the group fails; the old escrow is then left in place
+        """
+        escrow_ids = await self.replace_bets([(escrow_app_id, order)], market)
+        if escrow_ids[0] is None:
+            raise RuntimeError(f"Failed to replace escrow {escrow_app_id}")
+        return escrow_ids[0]
+
+    async def replace_bets(self, replacements: List[Tuple[int, OrderRequest]], market: Market) -> List[Optional[int]]:
+        """
+        Atomically cancel and replace several bets on one market.
+        
+        Each replacement takes four transactions (`delete_escrow` followed by the three
+        placing the new order), so up to MAX_GROUP_SIZE // 4 replacements share a group.
+        Groups are submitted concurrently; a failing group leaves its old escrows in place.
+        
+        Args:
+            replacements: (escrow app ID to cancel, new order) pairs
+            market: Market object containing asset IDs and app IDs
+            
+        Returns:
+            New escrow app IDs in the order of `replacements`; None where the group failed
+            
+        Raises:
+            ValueError: If environment variables are missing
+        """
+        if not replacements:
+            return []
         
-        # Add register escrow delete transaction
+        groups = self._build_replace_groups(replacements, market)
+        logger.info(f"[ACTION] Submitting {len(replacements)} cancel-replace orders for market {market.marketAppId} in {len(groups)} groups...")
+        return self._escrow_ids(groups, await self._execute_groups(groups))
+
+    async def submit_replacements(self, replacements: List[Tuple[int, OrderRequest]], market: Market) -> List[SubmissionHandle]:
+        """
+        Send the groups `replace_bets` would send and return without waiting for confirmation.
+        
+        Args:
+            replacements: (escrow app ID to cancel, new order) pairs
+            market: Market object containing asset IDs and app IDs
+            
+        Returns:
+            One SubmissionHandle per group, covering `replacements` in order
+            
+        Raises:
+            ValueError: If environment variables are missing
+            AlgodHTTPError: If algod rejects a group
+        """
+        if not replacements:
+            return []
+        groups = self._build_replace_groups(replacements, market)
+        return list(await asyncio.gather(
+            *(self.pipeline.submit(atc, label=f"cancel-replace for market {market.marketAppId}") for atc in groups)
+        ))
+
+    def _build_replace_groups(
+        self,
+        replacements: List[Tuple[int, OrderRequest]],
+        market: Market
+    ) -> List[AtomicTransactionComposer]:
+        """Packs cancel-replace pairs into transaction groups of up to MAX_GROUP_SIZE // 4 pairs."""
+        session = self.session
+        if not all([market.marketAppId, self.USDC_ASSET_ID, market.yesAssetId, market.noAssetId]):
+            raise ValueError("Missing required environment variables")
+        sender_address, signer = session.address, session.signer
+        market_app_client = session.market_app_client(market.marketAppId)
+        
+        sp = session.suggested_params()
+        create_escrow_method = session.create_escrow_method
+        
+        batch_id = time.time_ns()
+        per_group = self.MAX_GROUP_SIZE // (self.TXNS_PER_ORDER + 1)
+        groups: List[AtomicTransactionComposer] = []
+        for start in range(0, len(replacements), per_group):
+            atc = AtomicTransactionComposer()
+            for index in range(start, min(start + per_group, len(replacements))):
+                escrow_app_id, order = replacements[index]
+                # Delete first so the released funds are available to the new escrow
+                self._add_cancel(atc, escrow_app_id, market, market_app_client, sender_address, signer, sp)
+                self._add_order(
+                    atc, order, market, sender_address, signer, sp, create_escrow_method,
+                    note_suffix=f" {batch_id}:{index}".encode()
+                )
+            groups.append(atc)
+        return groups
+
+    def _add_cancel(
+        self,
+        atc: AtomicTransactionComposer,
+        escrow_app_id: int,
+        market: Market,
+        market_app_client: AppClient,
+        sender_address: str,
+        signer: AccountTransactionSigner,
+        sp: transaction.SuggestedParams
+    ) -> None:
+        """
+        Adds the market `delete_escrow` call cancelling one escrow to a transaction group.
+        
+        The call gets the validity window of `sp`, like the other transactions it may be
+        grouped with, rather than algokit's short default window.
+        """
         register_escrow_delete_txn = market_app_client.create_transaction.call(
             AppClientMethodCallParams(
                 method="delete_escrow",
@@ -358,15 +870,9 @@ class AlgorandHelper:
                 args=[escrow_app_id, sender_address],
                 asset_references=[self.USDC_ASSET_ID, market.yesAssetId, market.noAssetId],
                 app_references=[escrow_app_id],
-                signer=signer
+                signer=signer,
+                first_valid_round=sp.first,
+                last_valid_round=sp.last
             )
         )
         atc.add_transaction(TransactionWithSigner(register_escrow_delete_txn.transactions[0], signer))
-        
-        try:
-            logger.info(f"[ACTION] Submitting cancel order for {escrow_app_id}...")
-            res = atc.execute(self.algod_client, 4)
-            logger.info(f"[INFO] Success: {res.tx_ids}, confirmed in {res.confirmed_round}")
-        except AlgodHTTPError as e:
-            logger.error(f"[ERROR] ATC error: {e}")
-            raise
\ No newline at end of file
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from algosdk import account, mnemonic
+from algosdk.abi import Method
+from algosdk.abi.method import Argument, Returns
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+from algosdk.transaction import SuggestedParams
+from algokit_utils import AlgorandClient, AppClient, AppClientParams, ApplicationSpecification
+
+from helpers.log_helpers import get_logger
+
+logger = get_logger(__name__)
+
+def build_create_escrow_method() -> Method:
+    """Builds the market app's `create_escrow` ABI method."""
+    return Method(
+        name="create_escrow",
+        args=[
+            Argument(name="price", arg_type="uint64"),
+            Argument(name="quantity", arg_type="uint64"),
+            Argument(name="slippage", arg_type="uint64"),
+            Argument(name="position", arg_type="uint8"),
+        ],
+        returns=Returns(arg_type="uint64")
+    )
+
+class AlgorandSession:
+    """
+    Per-process signing state shared by every transaction AlgorandHelper builds.
+
+    Holds the account derived once from the mnemonic, its signer, the prebuilt
+    `create_escrow` method and one AppClient per market. Suggested params are fetched
+    once and reused until `params_refresh_rounds` rounds have passed; the current round
+    comes from `current_round` when it knows it (e.g. the submission pipeline's last seen
+    round) and is otherwise estimated from the time since the fetch. On an event loop the
+    refresh runs in a worker thread while the previous params keep being served (they stay
+    valid for far longer than the refresh interval). Fetched params are also pushed into
+    the AlgorandClient cache, so AppClient-built transactions reuse them.
+    """
+
+    def __init__(
+        self,
+        algorand: AlgorandClient,
+        sender_mnemonic: str,
+        market_app_spec: ApplicationSpecification,
+        params_refresh_rounds: int = 10,
+        round_time_seconds: float = 2.8,
+        current_round: Optional[Callable[[], Optional[int]]] = None
+    ):
+        """
+        Initialize the session.
+
+        Args:
+            algorand: Algorand client used for algod calls and AppClients
+            sender_mnemonic: Mnemonic of the trading account
+            market_app_spec: Application specification of the market app
+            params_refresh_rounds: Rounds after which suggested params are fetched again
+            round_time_seconds: Expected seconds per round, used to estimate the current round
+            current_round: Optional callable returning the latest known round, or None
+        """
+        self.algorand = algorand
+        self.algod_client = algorand.client.algod
+        self.market_app_spec = market_app_spec
+        self.params_refresh_rounds = params_refresh_rounds
+        self.round_time_seconds = round_time_seconds
+        self.current_round = current_round
+
+        self.private_key = mnemonic.to_private_key(sender_mnemonic)
+        self.address = account.address_from_private_key(self.private_key)
+        self.signer = AccountTransactionSigner(self.private_key)
+        self.create_escrow_method = build_create_escrow_method()
+
+        self._app_clients: Dict[int, AppClient] = {}
+        self._params: Optional[SuggestedParams] = None
+        self._params_round = 0
+        self._params_fetched_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, algorand: AlgorandClient, market_app_spec: ApplicationSpecification, **kwargs) -> "AlgorandSession":
+        """
+        Creates a session for the account in SENDER_MNEMONIC.
+
+        Raises:
+            ValueError: If SENDER_MNEMONIC is not set
+        """
+        sender_mnemonic = os.getenv("SENDER_MNEMONIC")
+        if not sender_mnemonic:
+            raise ValueError("SENDER_MNEMONIC not found in environment")
+        return cls(algorand, sender_mnemonic, market_app_spec, **kwargs)
+
+    def suggested_params(self) -> SuggestedParams:
+        """
+        Returns suggested params, refreshing them when the cached ones are `params_refresh_rounds` old.
+
+        Only the first call waits for algod. Later refreshes run in the background when called
+        from an event loop, and the cached params are returned meanwhile.
+
+        The returned object is shared; callers must not modify it.
+        """
+        if self._params is None:
+            return self.refresh_suggested_params()
+        if self._estimated_round() >= self._params_round + self.params_refresh_rounds:
+            self._refresh_in_background()
+        return self._params
+
+    def refresh_suggested_params(self) -> SuggestedParams:
+        """Fetches suggested params from algod and caches them."""
+        params = self.algod_client.suggested_params()
+        self._params_round = params.first
+        self._params_fetched_at = time.monotonic()
+        self._params = params
+        self.algorand.set_suggested_params_cache(
+            params,
+            until=time.time() + self.params_refresh_rounds * self.round_time_seconds
+        )
+        logger.debug(f"Refreshed suggested params at round {params.first}")
+        return params
+
+    def _refresh_in_background(self) -> None:
+        """Starts a refresh in a worker thread, unless one is running; outside an event loop it runs inline."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.refresh_suggested_params()
+            return
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._refresh_task = loop.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        try:
+            await asyncio.to_thread(self.refresh_suggested_params)
+        except Exception as e:
+            logger.error(f"Failed to refresh suggested params: {str(e)}")
+
+    def _estimated_round(self) -> int:
+        """Returns the latest known round, or an estimate from the time since params were fetched."""
+        known_round = self.current_round() if self.current_round is not None else None
+        estimated = self._params_round + int((time.monotonic() - self._params_fetched_at) / self.round_time_seconds)
+        return max(known_round or 0, estimated)
+
+    def market_app_client(self, market_app_id: int) -> AppClient:
+        """Returns the AppClient for a market app, creating it on first use."""
+        app_client = self._app_clients.get(market_app_id)
+        if app_client is None:
+            app_client = AppClient(
+                AppClientParams(
+                    app_spec=self.market_app_spec,
+                    app_id=market_app_id,
+                    algorand=self.algorand,
+                    default_sender=self.address
+                )
+            )
+            self._app_clients[market_app_id] = app_client
+        return app_client
@@ -1,16 +1,26 @@
+from array import array
 from decimal import Decimal
 import math
-import requests
-import base64
-from typing import Dict, Any, Optional, List
+import httpx
+import logging
+import time
+from typing import Collection, Dict, Any, Optional, List
 import os
 from dotenv import load_dotenv
+import numpy as np
 from algokit_utils import AlgorandClient
-from algosdk import encoding
 
+from helpers.escrow_fetcher import EscrowStateFetcher
+from helpers.http_client import AsyncHttpClient, get_http_client
+from helpers.incremental_orderbook import IncrementalOrderBook
 from helpers.log_helpers import get_logger
-from models.orderbook import OrderbookEntry, OrderBook
-from models.market import Market, ShareImage, ShareImageItem
+from helpers.market_cache import MarketCache
+from helpers.metrics import COUNT_BUCKETS, get_metrics, timed
+from helpers.order_registry import OrderRegistry
+from helpers.state_decoder import EscrowStateDecoder
+from models.escrow import EscrowState
+from models.orderbook import MAX_PRICE, LevelBook, OrderBook
+from models.market import Market, MarketCore, ShareImage, ShareImageItem
 
 logger = get_logger(__name__)
 
@@ -20,265 +30,357 @@ class AlphaHelper:
     BASE_API_URL = "https://g08245wvl7.execute-api.us-east-1.amazonaws.com/api"
     MICRO_UNIT = 1_000_000  # 1 USDC = 1_000_000 microUSDC
     
-    def __init__(self):
-        """Initialize the AlphaHelper with environment variables."""
+    def __init__(
+        self,
+        http_client: Optional[AsyncHttpClient] = None,
+        market_volatile_ttl_seconds: float = 30.0,
+        order_registry: Optional[OrderRegistry] = None
+    ):
+        """
+        Initialize the AlphaHelper with environment variables.
+        
+        Args:
+            http_client: Async HTTP client to use (defaults to the shared client)
+            market_volatile_ttl_seconds: How long cached volatile market fields stay fresh
+            order_registry: Registry of our own escrows, kept current from orderbook syncs
+        """
         self.algorand = AlgorandClient.mainnet()
+        self.http = http_client or get_http_client()
+        self.escrow_fetcher = EscrowStateFetcher(self.algorand.client.indexer)
+        self.escrow_decoder = EscrowStateDecoder.from_app_spec()
+        self._incremental_books: Dict[int, IncrementalOrderBook] = {}
+        self.order_registry = order_registry
+        self.market_cache = MarketCache(
+            self._fetch_market_record,
+            volatile_ttl_seconds=market_volatile_ttl_seconds
+        )
     
+    @timed("alpha_get_market_info_seconds")
     async def get_market_info(self, market_id: str) -> Market:
         """
         Fetches the information for a given Alpha Arcade market.
         
+        This validates the full record, rules and images included. The trading path should
+        use `get_market_core` instead.
+        
         Args:
             market_id: The unique identifier for the market
             
         Returns:
             Market object containing market information including volume, fees, and rules
+        """
+        data = await self._fetch_market_record(market_id)
+        if data is None:
+            return Market()  # Return empty Market object on error
+        
+        market = self._parse_market(data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Fetched market info for {market_id}: {market}")
+        return market
+    
+    async def get_market_core(self, market_id: str, refresh_volatile: bool = True) -> Optional[MarketCore]:
+        """
+        Returns the trading fields of a market from the two-tier market cache.
+        
+        Immutable fields (app and asset IDs, fee rate, end time) are fetched once per market;
+        volatile fields (probabilities, midpoint, spread, last trade) are refreshed once they
+        are older than `market_volatile_ttl_seconds`.
+        
+        Args:
+            market_id: The unique identifier for the market
+            refresh_volatile: Whether stale volatile fields should be refreshed
+            
+        Returns:
+            MarketCore object, or None if the market could not be fetched
+        """
+        return await self.market_cache.get(market_id, refresh_volatile=refresh_volatile)
+    
+    @timed("alpha_market_request_seconds")
+    async def _fetch_market_record(self, market_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetches the raw market record from the Alpha API.
+        
+        Args:
+            market_id: The unique identifier for the market
             
-        Raises:
-            requests.RequestException: If the API request fails
+        Returns:
+            The market record, or None if the request fails
         """
         url = f"{self.BASE_API_URL}/get-market"
         params = {"marketId": market_id}
         
         try:
-            response = requests.get(url, params=params)
+            response = await self.http.get(url, params=params)
             response.raise_for_status()
-            response_data = response.json()
             
             # Extract market data from the nested response
-            data = response_data.get("market", {})
-            
-            # Create ShareImage objects if they exist in the response
-            share_image = None
-            if "shareImage" in data:
-                share_image_data = data["shareImage"]
-                share_image = ShareImage(
-                    yes=ShareImageItem(**share_image_data.get("yes", {})) if "yes" in share_image_data else None,
-                    no=ShareImageItem(**share_image_data.get("no", {})) if "no" in share_image_data else None
-                )
-            
-            # Create Market object
-            market = Market(
-                id=data.get("id"),
-                marketAppId=data.get("marketAppId"),
-                slug=data.get("slug"),
-                topic=data.get("topic"),
-                yesAssetId=data.get("yesAssetId"),
-                noAssetId=data.get("noAssetId"),
-                yesTeamColor=data.get("yesTeamColor"),
-                noTeamColor=data.get("noTeamColor"),
-                yesProb=data.get("yesProb"),
-                noProb=data.get("noProb"),
-                currentMidpoint=data.get("currentMidpoint"),
-                currentSpread=data.get("currentSpread"),
-                lastTradePrice=data.get("lastTradePrice"),
-                lastTradePrices=data.get("lastTradePrices"),
-                rules=data.get("rules"),
-                compressedRules=data.get("compressedRules"),
-                image=data.get("image"),
-                shareImage=share_image,
-                categories=data.get("categories"),
-                featured=data.get("featured"),
-                volume=data.get("volume"),
-                marketVolume=data.get("marketVolume"),
-                fees=data.get("fees"),
-                totalRewards=data.get("totalRewards"),
-                rewardsPaidOut=data.get("rewardsPaidOut"),
-                lastRewardAmount=data.get("lastRewardAmount"),
-                feeAddress=data.get("feeAddress"),
-                feeBasePercent=data.get("feeBasePercent"),
-                feeTimerThreshhold=data.get("feeTimerThreshhold"),
-                marketFriend=data.get("marketFriend"),
-                oracle=data.get("oracle"),
-                rewardsSpreadDistance=data.get("rewardsSpreadDistance"),
-                rewardsMinContracts=data.get("rewardsMinContracts"),
-                createdAt=data.get("createdAt"),
-                updatedAt=data.get("updatedAt"),
-                liveTs=data.get("liveTs"),
-                endTs=data.get("endTs"),
-                createdRound=data.get("createdRound"),
-                lastRewardTs=data.get("lastRewardTs"),
-                comments=data.get("comments"),
-                dataType=data.get("dataType"),
-                PK=data.get("PK"),
-                SK=data.get("SK")
-            )
-            
-            # Log the market object
-            logger.info(f"Fetched market info for {market_id}: {market}")
+            return response.json().get("market") or None
             
-            # Return the Market object
-            return market
-            
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to fetch market info for {market_id}: {str(e)}")
-            return Market()  # Return empty Market object on error
+            return None
     
-    def get_orderbook(self, market_app_id: int) -> OrderBook:
+    def _parse_market(self, data: Dict[str, Any]) -> Market:
         """
-        Fetches and aggregates the orderbook for a given market from the Algorand blockchain.
+        Maps a raw market record from the Alpha API to a Market object.
         
         Args:
-            market_app_id: The application ID of the market
+            data: The market record
             
         Returns:
-            OrderBook object containing aggregated bids and asks for both YES and NO positions
-            
-        Raises:
-            Exception: If there's an error fetching or processing the orderbook
+            Market object
         """
-        try:
-            app_info = self.algorand.app.get_by_id(market_app_id)
-            indexer_client = self.algorand.client.indexer
-            orders = indexer_client.lookup_account_application_by_creator(app_info.app_address)
-            
-            order_details = []
-            for order in orders["applications"]:
-                app_id = order["id"]
-                app_info = indexer_client.applications(app_id)
-                global_state = self._decode_global_state(app_info)
-                order_details.append(global_state)
-            
-            logger.info(f"Fetched {len(order_details)} orders for market {market_app_id}: {order_details}")
-            aggregated_orderbook = self._aggregate_orderbook(order_details)
-            logger.info(f"Aggregated orderbook for market {market_app_id}: {aggregated_orderbook}")
-            return aggregated_orderbook
-            
-        except Exception as e:
-            logger.error(f"Failed to get aggregated orderbook for market {market_app_id}: {str(e)}")
-            return OrderBook(yes={"bids": [], "asks": []}, no={"bids": [], "asks": []})
+        # Create ShareImage objects if they exist in the response
+        share_image = None
+        if "shareImage" in data:
+            share_image_data = data["shareImage"]
+            share_image = ShareImage(
+                yes=ShareImageItem(**share_image_data.get("yes", {})) if "yes" in share_image_data else None,
+                no=ShareImageItem(**share_image_data.get("no", {})) if "no" in share_image_data else None
+            )
+        
+        # Create Market object
+        return Market(
+            id=data.get("id"),
+            marketAppId=data.get("marketAppId"),
+            slug=data.get("slug"),
+            topic=data.get("topic"),
+            yesAssetId=data.get("yesAssetId"),
+            noAssetId=data.get("noAssetId"),
+            yesTeamColor=data.get("yesTeamColor"),
+            noTeamColor=data.get("noTeamColor"),
+            yesProb=data.get("yesProb"),
+            noProb=data.get("noProb"),
+            currentMidpoint=data.get("currentMidpoint"),
+            currentSpread=data.get("currentSpread"),
+            lastTradePrice=data.get("lastTradePrice"),
+            lastTradePrices=data.get("lastTradePrices"),
+            rules=data.get("rules"),
+            compressedRules=data.get("compressedRules"),
+            image=data.get("image"),
+            shareImage=share_image,
+            categories=data.get("categories"),
+            featured=data.get("featured"),
+            volume=data.get("volume"),
+            marketVolume=data.get("marketVolume"),
+            fees=data.get("fees"),
+            totalRewards=data.get("totalRewards"),
+            rewardsPaidOut=data.get("rewardsPaidOut"),
+            lastRewardAmount=data.get("lastRewardAmount"),
+            feeAddress=data.get("feeAddress"),
+            feeBasePercent=data.get("feeBasePercent"),
+            feeTimerThreshhold=data.get("feeTimerThreshhold"),
+            marketFriend=data.get("marketFriend"),
+            oracle=data.get("oracle"),
+            rewardsSpreadDistance=data.get("rewardsSpreadDistance"),
+            rewardsMinContracts=data.get("rewardsMinContracts"),
+            createdAt=data.get("createdAt"),
+            updatedAt=data.get("updatedAt"),
+            liveTs=data.get("liveTs"),
+            endTs=data.get("endTs"),
+            createdRound=data.get("createdRound"),
+            lastRewardTs=data.get("lastRewardTs"),
+            comments=data.get("comments"),
+            dataType=data.get("dataType"),
+            PK=data.get("PK"),
+            SK=data.get("SK")
+        )
     
-    def _decode_global_state(self, app_info: Dict) -> Dict:
+    async def get_live_markets(self) -> List[Market]:
         """
-        Decodes the global state of an application.
+        Fetches every live Alpha Arcade market.
         
-        Args:
-            app_info: Application information from the indexer
-            
         Returns:
-            Dict containing the decoded global state
+            List of Market objects; empty if the request fails
         """
-        global_state = {}
+        url = f"{self.BASE_API_URL}/get-live-markets"
         
-        if not (app_info.get("application") and 
-                app_info["application"].get("params") and 
-                "global-state" in app_info["application"]["params"]):
-            return global_state
+        try:
+            response = await self.http.get(url)
+            response.raise_for_status()
+            response_data = response.json()
             
-        raw_global_state = app_info["application"]["params"]["global-state"]
-        
-        for state_item in raw_global_state:
-            try:
-                key = base64.b64decode(state_item["key"]).decode()
-                value = self._decode_state_value(state_item["value"], key)
-                global_state[key] = value
-            except Exception as e:
-                logger.warning(f"Failed to decode state item: {str(e)}")
-                continue
-                
-        return global_state
+            records = response_data.get("markets", []) if isinstance(response_data, dict) else response_data
+            markets = []
+            for data in records:
+                try:
+                    markets.append(self._parse_market(data))
+                except Exception as e:
+                    logger.warning(f"Skipping market {data.get('id')}: {str(e)}")
+            
+            logger.info(f"Fetched {len(markets)} live markets")
+            return markets
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch live markets: {str(e)}")
+            return []
     
-    def _decode_state_value(self, value: Dict, key: str) -> Any:
+    def prune_markets(self, live_ids: Optional[Collection[str]] = None) -> int:
         """
-        Decodes a single state value based on its type.
+        Drops ended markets, and optionally every market no longer live, from the market cache.
         
         Args:
-            value: The state value to decode
-            key: The key of the state value
-            
+            live_ids: Optional IDs of the live markets, e.g. from get_live_markets
+        
         Returns:
-            The decoded value
+            Number of markets dropped
         """
-        if value["type"] == 1:  # bytes value
-            if key == "owner":
-                try:
-                    address_bytes = base64.b64decode(value["bytes"])
-                    if len(address_bytes) == 32:
-                        return encoding.encode_address(address_bytes)
-                except Exception as e:
-                    logger.warning(f"Failed to decode owner address: {str(e)}")
-            try:
-                return base64.b64decode(value["bytes"]).decode()
-            except Exception:
-                return value["bytes"]
-        else:  # uint value
-            return int(value["uint"])
+        return self.market_cache.prune(live_ids=live_ids)
     
-    def _aggregate_orderbook(self, orders: List[Dict[str, Any]]) -> OrderBook:
+    @timed("alpha_get_orderbook_seconds")
+    def get_orderbook(self, market_app_id: int, full_rebuild: bool = False) -> Optional[OrderBook]:
         """
-        Aggregates orders into an OrderBook structure.
+        Fetches and aggregates the orderbook for a given market from the Algorand blockchain.
+        
+        By default the market's long-lived IncrementalOrderBook is synced, which only reads
+        market activity since the previous call. With `full_rebuild` every escrow is re-listed
+        and re-decoded.
         
         Args:
-            orders: List of order details
+            market_app_id: The application ID of the market
+            full_rebuild: Whether to rebuild the orderbook from scratch
             
         Returns:
-            OrderBook object containing aggregated bids and asks
+            OrderBook object containing aggregated bids and asks for both YES and NO positions,
+            or None if the orderbook could not be fetched (an empty book would read as a market
+            with no orders)
         """
-        yes_buy_orders = self._filter_orders(orders, side=1, position=1)
-        yes_sell_orders = self._filter_orders(orders, side=0, position=1)
-        no_buy_orders = self._filter_orders(orders, side=1, position=0)
-        no_sell_orders = self._filter_orders(orders, side=0, position=0)
-        
-        return OrderBook(
-            yes={
-                "bids": self._aggregate_orders(yes_buy_orders),
-                "asks": self._aggregate_orders(yes_sell_orders)
-            },
-            no={
-                "bids": self._aggregate_orders(no_buy_orders),
-                "asks": self._aggregate_orders(no_sell_orders)
-            }
-        )
+        metrics = get_metrics()
+        indexer_calls = self.escrow_fetcher.calls_in_thread()
+        try:
+            if full_rebuild:
+                app_info = self.algorand.app.get_by_id(market_app_id)
+                escrow_apps = self.escrow_fetcher.fetch_applications(app_info.app_address)
+                decode_start = time.perf_counter()
+                order_details = [self.escrow_decoder.decode(escrow_app) for escrow_app in escrow_apps]
+                metrics.observe("alpha_orderbook_decode_seconds", time.perf_counter() - decode_start)
+                
+                # Lazy %-style arguments: the order list is only formatted if DEBUG is enabled
+                logger.debug("Fetched %d orders for market %d: %s", len(order_details), market_app_id, order_details)
+                aggregated_orderbook = self._aggregate_orderbook(order_details)
+            else:
+                aggregated_orderbook = self._get_incremental_book(market_app_id).sync()
+                # Fills and deletions of our escrows seen by the sync are persisted right away,
+                # as our own confirmed orders are
+                if self.order_registry is not None:
+                    self.order_registry.save_if_dirty()
+            
+            logger.info(
+                "Aggregated orderbook for market %d", market_app_id,
+                extra={"data": {
+                    "market_app_id": market_app_id,
+                    "yes_bid": aggregated_orderbook.best_bid(1), "yes_ask": aggregated_orderbook.best_ask(1),
+                    "no_bid": aggregated_orderbook.best_bid(0), "no_ask": aggregated_orderbook.best_ask(0)
+                }}
+            )
+            metrics.observe(
+                "alpha_orderbook_indexer_calls", self.escrow_fetcher.calls_in_thread() - indexer_calls,
+                buckets=COUNT_BUCKETS
+            )
+            return aggregated_orderbook
+            
+        except Exception as e:
+            # Drop the incremental book so the next call starts from a clean snapshot
+            self._incremental_books.pop(market_app_id, None)
+            logger.error(f"Failed to get aggregated orderbook for market {market_app_id}: {str(e)}")
+            metrics.inc("alpha_get_orderbook_seconds_errors_total")
+            return None
     
-    def _filter_orders(self, orders: List[Dict[str, Any]], side: int, position: int) -> List[Dict[str, Any]]:
+    def _get_incremental_book(self, market_app_id: int) -> IncrementalOrderBook:
         """
-        Filters orders based on side and position.
+        Returns the long-lived incremental orderbook for a market, creating it on first use.
         
         Args:
-            orders: List of order details
-            side: 1 for buy, 0 for sell
-            position: 1 for YES, 0 for NO
+            market_app_id: The application ID of the market
             
         Returns:
-            Filtered list of orders
+            IncrementalOrderBook for the market
         """
-        return [
-            order for order in orders
-            if (order.get('side') == side and 
-                order.get('position') == position and 
-                order.get('quantity', 0) > order.get('quantity_filled', 0) and 
-                order.get('slippage', 0) == 0)
-        ]
+        book = self._incremental_books.get(market_app_id)
+        if book is None:
+            app_info = self.algorand.app.get_by_id(market_app_id)
+            book = IncrementalOrderBook(
+                market_app_id=market_app_id,
+                market_app_address=app_info.app_address,
+                fetcher=self.escrow_fetcher,
+                decode_escrow=self.escrow_decoder.decode,
+                on_escrow_change=self._on_escrow_change
+            )
+            self._incremental_books[market_app_id] = book
+        return book
     
-    def _aggregate_orders(self, orders: List[Dict[str, Any]]) -> List[OrderbookEntry]:
+    def _on_escrow_change(self, escrow_app_id: int, state: Optional[EscrowState]) -> None:
+        """Passes escrow changes seen by the incremental orderbooks on to the order registry."""
+        if self.order_registry is not None:
+            self.order_registry.apply_escrow_state(escrow_app_id, state)
+    
+    def reconcile_orders(self) -> None:
+        """Re-reads the escrows in the order registry not seen on chain since they were loaded."""
+        if self.order_registry is not None:
+            self.order_registry.reconcile(self.escrow_fetcher, self.escrow_decoder.decode)
+    
+    @timed("alpha_aggregate_orderbook_seconds")
+    def _aggregate_orderbook(self, orders: List[EscrowState]) -> OrderBook:
         """
-        Aggregates orders at the same price level and converts micro-units to standard units.
+        Aggregates orders into an OrderBook structure.
+        
+        A single pass copies the fields of every order into compact int64 columns; filtering
+        and bucketing by (position, side, price) then run vectorized in NumPy, and the summed
+        remaining quantities stay in micro-units until the OrderBook view formats them.
         
         Args:
-            orders: List of order details
+            orders: List of decoded escrow states
             
         Returns:
-            List of aggregated OrderbookEntry objects
+            OrderBook object backed by sorted price levels for both YES and NO positions
         """
-        price_map: Dict[int, int] = {}
-    
-        for order in orders:
-            quantity = order.get("quantity", 0)
-            quantity_filled = order.get("quantity_filled", 0)
-            remaining_qty = quantity - quantity_filled
-            price = order.get("price", 0)
-    
-            if remaining_qty > 0 and price > 0:
-                price_map[price] = price_map.get(price, 0) + remaining_qty
-    
-        return [
-            OrderbookEntry(
-                price=round(price / self.MICRO_UNIT, 6),  # Convert to units, round for precision
-                quantity=round(quantity / self.MICRO_UNIT, 6),
-                total=round((price * quantity) / (self.MICRO_UNIT ** 2), 6)
+        # One pass over the orders: (side, position, price, remaining, slippage) per row
+        columns = array("q", [
+            value
+            for order in orders
+            for value in (order.side, order.position, order.price, order.quantity - order.quantity_filled, order.slippage)
+        ])
+        
+        levels = LevelBook()
+        if not orders:
+            return OrderBook(levels=levels)
+        
+        table = np.frombuffer(columns, dtype=np.int64).reshape(-1, 5)
+        side, position, price, quantity, slippage = table.T
+        
+        resting = (
+            ((side == 0) | (side == 1)) &
+            ((position == 0) | (position == 1)) &
+            (quantity > 0) &
+            (price > 0) & (price <= MAX_PRICE) &
+            (slippage == 0)
+        )
+        if not resting.any():
+            return OrderBook(levels=levels)
+        
+        # Sort by bucket (position, side), then price, so one pass groups every level; lexsort
+        # keeps the full int64 price range, unlike a packed single key
+        buckets = position[resting] * 2 + side[resting]
+        prices = price[resting]
+        order_idx = np.lexsort((prices, buckets))
+        sorted_buckets = buckets[order_idx]
+        sorted_prices = prices[order_idx]
+        starts = np.flatnonzero(np.concatenate((
+            [True],
+            (sorted_buckets[1:] != sorted_buckets[:-1]) | (sorted_prices[1:] != sorted_prices[:-1])
+        )))
+        level_quantities = np.add.reduceat(quantity[resting][order_idx], starts)
+        level_buckets = sorted_buckets[starts]
+        level_prices = sorted_prices[starts]
+        
+        for bucket in np.unique(level_buckets).tolist():
+            in_bucket = level_buckets == bucket
+            levels.levels(bucket // 2, bucket % 2).load(
+                level_prices[in_bucket].tolist(),
+                level_quantities[in_bucket].tolist()
             )
-            for price, quantity in price_map.items()
-        ]
+        
+        return OrderBook(levels=levels)
     
     @staticmethod
     def calculate_fee(quantity: int, price: int, fee_base: int) -> int:
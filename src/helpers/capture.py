@@ -0,0 +1,463 @@
+import glob
+import heapq
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from helpers.log_helpers import get_logger
+from helpers.odds_stream import raw_odds_event
+from models.market import MarketCore
+from models.odds_orderbook import OddsOrderbook
+from models.orderbook import LevelBook, OrderBook
+from models.signal import ScanPair
+
+logger = get_logger(__name__)
+
+FRAME_MAGIC = b"ACF1"
+FRAME_PREFIX = struct.Struct("<4sII")  # Magic, header length, compressed body length
+FILE_PATTERN = "capture_*.cap"
+LEVEL_SIDES = ((1, 1), (1, 0), (0, 1), (0, 0))  # (position, side): YES bids, YES asks, NO bids, NO asks
+MARKET_FIELDS = MarketCore.IMMUTABLE_FIELDS + MarketCore.VOLATILE_FIELDS
+
+# Columns of every record kind, with their encoding:
+#   delta - signed 64-bit integers, each stored as the difference from the previous one
+#   int   - signed 64-bit integers
+#   dict  - strings, stored once each plus a 32-bit index per row
+#   lines - JSON texts, newline separated
+# Orderbook rows are ragged: `levels` holds four level counts per row (in LEVEL_SIDES order)
+# and `prices`/`quantities` hold the levels themselves, ascending by price within a side.
+SCHEMAS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "orderbook": (("ts", "delta"), ("market_app_id", "int"), ("levels", "int"), ("prices", "delta"),
+                  ("quantities", "int")),
+    "odds": (("ts", "delta"), ("sport", "dict"), ("event_id", "dict"), ("event", "lines")),  # "null": removed
+    "market": (("ts", "delta"), ("market_id", "dict"), ("market", "lines")),
+    "pairs": (("ts", "delta"), ("pairs", "lines")),
+}
+
+class CaptureRecord(NamedTuple):
+    """
+    One captured snapshot.
+
+    `key` and `value` depend on the kind: for "orderbook" the market app ID and a LevelBook;
+    for "odds" (sport, event ID) and the raw event, or None once the event is no longer quoted;
+    for "market" the market ID and a MarketCore; for "pairs" None and the list of ScanPairs.
+    """
+    ts: float  # Capture time, epoch seconds
+    kind: str
+    key: Any
+    value: Any
+
+def _int_bytes(values: Sequence[int], delta: bool) -> bytes:
+    if delta and values:
+        values = [values[0]] + [current - previous for previous, current in zip(values, values[1:])]
+    data = array("q", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+def _int_values(raw: bytes, delta: bool) -> List[int]:
+    data = array("q")
+    data.frombytes(raw)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return list(accumulate(data)) if delta else data.tolist()
+
+def _encode_column(values: List[Any], encoding: str) -> bytes:
+    if encoding in ("delta", "int"):
+        return _int_bytes(values, encoding == "delta")
+    if encoding == "dict":
+        strings: Dict[str, int] = {}
+        index = array("I", (strings.setdefault(value, len(strings)) for value in values))
+        if sys.byteorder == "big":
+            index.byteswap()
+        names = json.dumps(list(strings)).encode()
+        return struct.pack("<I", len(names)) + names + index.tobytes()
+    return "\n".join(values).encode()
+
+def _decode_column(raw: bytes, encoding: str) -> List[Any]:
+    if encoding in ("delta", "int"):
+        return _int_values(raw, encoding == "delta")
+    if encoding == "dict":
+        (names_size,) = struct.unpack_from("<I", raw)
+        names = json.loads(raw[4:4 + names_size])
+        index = array("I")
+        index.frombytes(raw[4 + names_size:])
+        if sys.byteorder == "big":
+            index.byteswap()
+        return [names[position] for position in index]
+    return raw.decode().split("\n") if raw else []
+
+class CaptureWriter:
+    """
+    Appends market data snapshots to a compressed, columnar, append-only log.
+
+    Rows are buffered per kind in column lists and written as one frame per flush: a small
+    JSON header (time range, row counts, column sizes) followed by every column, zlib
+    compressed together. Frames are encoded, compressed and written in order by a background
+    thread, so recording never blocks the event loop on zlib or file I/O. Files roll over per
+    UTC day (`capture_YYYYMMDD.cap`). A snapshot identical to the previous one of the same
+    market or event is skipped, so the log only grows when something changed; replay keeps
+    the last value anyway. A crash loses at most the rows buffered or queued since the last
+    frame was written.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        block_rows: int = 4096,
+        flush_seconds: float = 10.0,
+        compression_level: int = 6
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            directory: Directory the capture files are written to
+            block_rows: Buffered rows after which a frame is written
+            flush_seconds: Age of the oldest buffered row after which a frame is written
+            compression_level: zlib compression level
+        """
+        self.directory = directory
+        self.block_rows = block_rows
+        self.flush_seconds = flush_seconds
+        self.compression_level = compression_level
+        os.makedirs(directory, exist_ok=True)
+
+        self.rows_written = 0
+        self.rows_skipped = 0
+        self.bytes_written = 0
+
+        self._columns = self._empty_columns()
+        self._rows = {kind: 0 for kind in SCHEMAS}
+        self._pending = 0
+        self._first_ts: Optional[float] = None
+        self._last_ts = 0.0
+        self._last: Dict[Tuple[str, Any], Any] = {}  # Last row written per (kind, key), to skip unchanged ones
+        self._app_ids: Dict[str, int] = {}  # Market ID -> market app ID, to prune orderbook rows with the market
+        self._file: Optional[BinaryIO] = None  # Only used by the writer thread
+        self._file_day: Optional[str] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture-writer")
+
+    def record_orderbook(self, market_app_id: int, orderbook: OrderBook, ts: Optional[float] = None) -> None:
+        """Captures an aggregated orderbook of a market."""
+        ts = time.time() if ts is None else ts
+        counts, prices, quantities = [], [], []
+        for position, side in LEVEL_SIDES:
+            levels = list(orderbook.levels.levels(position, side))
+            if side == 1:
+                levels.reverse()  # Bids iterate from the highest price
+            counts.append(len(levels))
+            for price, quantity in levels:
+                prices.append(price)
+                quantities.append(quantity)
+        fingerprint = (tuple(counts), tuple(prices), tuple(quantities))
+        if not self._unchanged("orderbook", market_app_id, fingerprint):
+            columns = self._columns["orderbook"]
+            columns["market_app_id"].append(market_app_id)
+            columns["levels"].extend(counts)
+            columns["prices"].extend(prices)
+            columns["quantities"].extend(quantities)
+            self._add_row("orderbook", ts)
+        self._flush_if_due(ts)
+
+    def record_odds(
+        self,
+        sport: str,
+        odds: Mapping[str, OddsOrderbook],
+        event_ids: Iterable[str] = (),
+        ts: Optional[float] = None
+    ) -> None:
+        """
+        Captures every event of an odds response whose odds changed since it was last captured.
+
+        Args:
+            sport: The sport key
+            odds: The odds response
+            event_ids: Event IDs the response was requested for; those captured before but
+                missing from it are captured as removed, so a replay stops serving them too
+            ts: Capture time, epoch seconds; defaults to now
+        """
+        ts = time.time() if ts is None else ts
+        present = set(odds)  # Keys, including events that fail validation (captured raw)
+        for event_id in odds:
+            self._add_odds(sport, event_id, json.dumps(raw_odds_event(odds, event_id), separators=(",", ":")), ts)
+        for event_id in event_ids:
+            if event_id not in present and self._last.get(("odds", event_id), "null") != "null":
+                self._add_odds(sport, event_id, "null", ts)
+        self._flush_if_due(ts)
+
+    def record_market(self, market: MarketCore, ts: Optional[float] = None) -> None:
+        """Captures a market's trading fields."""
+        ts = time.time() if ts is None else ts
+        text = json.dumps({name: getattr(market, name) for name in MARKET_FIELDS}, separators=(",", ":"))
+        self._app_ids[market.id] = market.marketAppId
+        if not self._unchanged("market", market.id, text):
+            columns = self._columns["market"]
+            columns["market_id"].append(market.id)
+            columns["market"].append(text)
+            self._add_row("market", ts)
+        self._flush_if_due(ts)
+
+    def record_pairs(self, pairs: Iterable[ScanPair], ts: Optional[float] = None) -> None:
+        """
+        Captures the pairs being scanned, so a replay scans the same ones.
+
+        When they changed, what is remembered about markets and events no longer scanned is
+        dropped; one scanned again later is captured in full on its next snapshot.
+        """
+        ts = time.time() if ts is None else ts
+        pairs = list(pairs)
+        text = json.dumps([pair.__dict__ for pair in pairs], separators=(",", ":"))
+        if not self._unchanged("pairs", None, text):
+            self._columns["pairs"]["pairs"].append(text)
+            self._add_row("pairs", ts)
+            self._prune(pairs)
+        self._flush_if_due(ts)
+
+    def flush(self) -> None:
+        """Hands every buffered row to the writer thread, to be written as one frame."""
+        if not self._pending:
+            return
+        self._executor.submit(self._write_frame, self._columns, self._rows, self._pending, self._first_ts,
+                              self._last_ts)
+        self._columns = self._empty_columns()
+        self._rows = {kind: 0 for kind in SCHEMAS}
+        self._pending = 0
+        self._first_ts = None
+
+    def close(self) -> None:
+        """Writes the buffered rows, waits for every frame to be written and closes the current file."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_day = None
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, Dict[str, List[Any]]]:
+        return {kind: {name: [] for name, _ in schema} for kind, schema in SCHEMAS.items()}
+
+    def _write_frame(
+        self,
+        columns: Dict[str, Dict[str, List[Any]]],
+        rows: Dict[str, int],
+        pending: int,
+        first_ts: float,
+        last_ts: float
+    ) -> None:
+        """Encodes, compresses and appends one frame; runs in the writer thread."""
+        try:
+            blocks, body = [], []
+            for kind, schema in SCHEMAS.items():
+                if not rows[kind]:
+                    continue
+                sizes = []
+                for name, encoding in schema:
+                    column = _encode_column(columns[kind][name], encoding)
+                    sizes.append(len(column))
+                    body.append(column)
+                blocks.append({"kind": kind, "rows": rows[kind], "sizes": sizes})
+
+            header = json.dumps({
+                "start": first_ts,
+                "end": last_ts,
+                "blocks": blocks
+            }).encode()
+            compressed = zlib.compress(b"".join(body), self.compression_level)
+            file = self._open(first_ts)
+            file.write(FRAME_PREFIX.pack(FRAME_MAGIC, len(header), len(compressed)) + header + compressed)
+            file.flush()
+        except Exception as e:
+            logger.error(f"Failed to write a capture frame of {pending} rows: {str(e)}")
+            return
+
+        self.rows_written += pending
+        self.bytes_written += FRAME_PREFIX.size + len(header) + len(compressed)
+
+    def _prune(self, pairs: List[ScanPair]) -> None:
+        """Forgets the last rows of markets, orderbooks and events not among `pairs`."""
+        market_ids = {pair.market_id for pair in pairs}
+        self._app_ids = {market_id: app_id for market_id, app_id in self._app_ids.items() if market_id in market_ids}
+        keep = {
+            "market": market_ids,
+            "odds": {pair.event_id for pair in pairs},
+            "orderbook": set(self._app_ids.values()),
+        }
+        self._last = {key: value for key, value in self._last.items() if key[0] == "pairs" or key[1] in keep[key[0]]}
+
+    def _unchanged(self, kind: str, key: Any, fingerprint: Any) -> bool:
+        """Whether a row equals the last one captured for its key; remembers it otherwise."""
+        if self._last.get((kind, key)) == fingerprint:
+            self.rows_skipped += 1
+            return True
+        self._last[(kind, key)] = fingerprint
+        return False
+
+    def _add_odds(self, sport: str, event_id: str, text: str, ts: float) -> None:
+        """Buffers an odds event row (JSON text, "null" once removed) unless it is unchanged."""
+        if self._unchanged("odds", event_id, text):
+            return
+        columns = self._columns["odds"]
+        columns["sport"].append(sport)
+        columns["event_id"].append(event_id)
+        columns["event"].append(text)
+        self._add_row("odds", ts)
+
+    def _add_row(self, kind: str, ts: float) -> None:
+        """Stamps the row just appended to a kind's columns."""
+        self._columns[kind]["ts"].append(round(ts * 1_000_000))
+        self._rows[kind] += 1
+        self._pending += 1
+        if self._first_ts is None:
+            self._first_ts = ts
+        self._last_ts = max(self._last_ts, ts)
+
+    def _flush_if_due(self, now: float) -> None:
+        """Writes a frame once enough rows are buffered or the oldest one is old enough."""
+        if self._pending and (self._pending >= self.block_rows or now - self._first_ts >= self.flush_seconds):
+            self.flush()
+
+    def _open(self, ts: float) -> BinaryIO:
+        """Returns the file for the UTC day of `ts`, rolling over to a new one if needed."""
+        day = datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%d")
+        if self._file is None or day != self._file_day:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(os.path.join(self.directory, f"capture_{day}.cap"), "ab")
+            self._file_day = day
+        return self._file
+
+class CaptureReader:
+    """Reads capture files back in time order, optionally restricted to a time range."""
+
+    def __init__(self, directory: str, start: Optional[float] = None, end: Optional[float] = None):
+        """
+        Args:
+            directory: Directory holding the capture files
+            start: Optional epoch seconds; earlier records are skipped
+            end: Optional epoch seconds; later records are skipped
+        """
+        self.directory = directory
+        self.start = start
+        self.end = end
+
+    def files(self) -> List[str]:
+        """Capture files in time order."""
+        return sorted(glob.glob(os.path.join(self.directory, FILE_PATTERN)))
+
+    def frames(self) -> Iterator[Tuple[Dict[str, Any], bytes]]:
+        """
+        Yields (header, compressed body) for every frame overlapping the time range; frames
+        outside it are skipped without being decompressed.
+        """
+        for path in self.files():
+            with open(path, "rb") as file:
+                while True:
+                    prefix = file.read(FRAME_PREFIX.size)
+                    if not prefix:
+                        break
+                    if len(prefix) < FRAME_PREFIX.size:
+                        logger.warning(f"Truncated frame at the end of {path}")
+                        break
+                    magic, header_size, body_size = FRAME_PREFIX.unpack(prefix)
+                    if magic != FRAME_MAGIC:
+                        logger.error(f"Corrupt frame in {path} at byte {file.tell() - FRAME_PREFIX.size}")
+                        break
+                    header = json.loads(file.read(header_size))
+                    if self.end is not None and header["start"] > self.end:
+                        return
+                    if self.start is not None and header["end"] < self.start:
+                        file.seek(body_size, os.SEEK_CUR)
+                        continue
+                    body = file.read(body_size)
+                    if len(body) < body_size:
+                        logger.warning(f"Truncated frame at the end of {path}")
+                        break
+                    yield header, body
+
+    def records(self) -> Iterator[CaptureRecord]:
+        """Yields every record in the time range, in capture time order."""
+        for header, body in self.frames():
+            body = zlib.decompress(body)
+            offset = 0
+            blocks = []
+            for block in header["blocks"]:
+                columns = {}
+                for (name, encoding), size in zip(SCHEMAS[block["kind"]], block["sizes"]):
+                    columns[name] = _decode_column(body[offset:offset + size], encoding)
+                    offset += size
+                blocks.append(self._block_records(block["kind"], columns))
+            # Blocks of one frame cover the same time span; interleave them by time
+            for record in heapq.merge(*blocks, key=lambda record: record.ts):
+                if self.start is not None and record.ts < self.start:
+                    continue
+                if self.end is not None and record.ts > self.end:
+                    return
+                yield record
+
+    @staticmethod
+    def _block_records(kind: str, columns: Dict[str, List[Any]]) -> Iterator[CaptureRecord]:
+        """Turns one kind's decoded columns back into records."""
+        timestamps = [ts / 1_000_000 for ts in columns["ts"]]
+        if kind == "orderbook":
+            counts, prices, quantities = columns["levels"], columns["prices"], columns["quantities"]
+            offset = 0
+            for row, (ts, market_app_id) in enumerate(zip(timestamps, columns["market_app_id"])):
+                book = LevelBook()
+                for side_index, (position, side) in enumerate(LEVEL_SIDES):
+                    count = counts[row * len(LEVEL_SIDES) + side_index]
+                    book.levels(position, side).load(prices[offset:offset + count], quantities[offset:offset + count])
+                    offset += count
+                yield CaptureRecord(ts, kind, market_app_id, book)
+        elif kind == "odds":
+            for ts, sport, event_id, text in zip(timestamps, columns["sport"], columns["event_id"], columns["event"]):
+                yield CaptureRecord(ts, kind, (sport, event_id), json.loads(text))
+        elif kind == "market":
+            for ts, market_id, text in zip(timestamps, columns["market_id"], columns["market"]):
+                yield CaptureRecord(ts, kind, market_id, MarketCore.from_record(json.loads(text)))
+        elif kind == "pairs":
+            for ts, text in zip(timestamps, columns["pairs"]):
+                yield CaptureRecord(ts, kind, None, [ScanPair(**pair) for pair in json.loads(text)])
+
+class CapturingDataSource:
+    """
+    Scanner data source that passes another source's results through and captures them.
+
+    Wraps e.g. a LiveDataSource; every market, odds response and orderbook the scanner
+    receives is appended to the writer.
+    """
+
+    def __init__(self, source: Any, writer: CaptureWriter):
+        """
+        Args:
+            source: Data source exposing get_market, get_sport_odds and get_orderbook coroutines
+            writer: Writer the results are captured to
+        """
+        self.source = source
+        self.writer = writer
+
+    async def get_market(self, market_id: str) -> Optional[MarketCore]:
+        market = await self.source.get_market(market_id)
+        if market is not None:
+            self.writer.record_market(market)
+        return market
+
+    async def get_sport_odds(self, sport: str, event_ids: List[str]) -> Mapping[str, OddsOrderbook]:
+        odds = await self.source.get_sport_odds(sport, event_ids)
+        self.writer.record_odds(sport, odds, event_ids)
+        return odds
+
+    async def get_orderbook(self, market_app_id: int) -> Optional[OrderBook]:
+        orderbook = await self.source.get_orderbook(market_app_id)
+        if orderbook is not None:
+            self.writer.record_orderbook(market_app_id, orderbook)
+        return orderbook
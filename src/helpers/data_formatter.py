@@ -1,5 +1,10 @@
 from math import log10, floor
-from typing import Union
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from models.odds_orderbook import OddsOrderbook
 
 class DataFormatter:
     """Helper class for formatting and converting between different odds formats."""
@@ -110,4 +115,198 @@ class DataFormatter:
         if american_odds > 0:
             return round(american_odds / 100 + 1, 3)
         else:
-            return round(100 / abs(american_odds) + 1, 3) 
\ No newline at end of file
+            return round(100 / abs(american_odds) + 1, 3) 
+    # Batch (NumPy) conversions. Unlike the scalar helpers above these return unrounded
+    # probabilities as fractions in [0, 1], not percentages, and mark invalid odds with NaN
+    # instead of raising, so one bad quote does not fail a whole batch.
+
+    DEVIG_METHODS = ("multiplicative", "additive", "power", "shin")
+
+    @staticmethod
+    def decimal_to_probability_batch(decimal_odds: ArrayLike) -> np.ndarray:
+        """
+        Converts an array of decimal odds to implied probabilities.
+
+        Args:
+            decimal_odds: Decimal odds values (valid ones are > 1)
+
+        Returns:
+            Array of implied probabilities as fractions, same shape as the input, with NaN
+            where the decimal odds are less than or equal to 1
+        """
+        odds = np.asarray(decimal_odds, dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            return np.where(odds > 1, 1.0 / odds, np.nan)
+
+    @staticmethod
+    def american_to_probability_batch(american_odds: ArrayLike) -> np.ndarray:
+        """
+        Converts an array of American (moneyline) odds to implied probabilities.
+
+        Args:
+            american_odds: American odds values (positive or negative)
+
+        Returns:
+            Array of implied probabilities as fractions, same shape as the input
+        """
+        odds = np.asarray(american_odds, dtype=np.float64)
+        magnitude = np.abs(odds)
+        return np.where(odds > 0, 100.0, magnitude) / (magnitude + 100.0)
+
+    @staticmethod
+    def decimal_to_american_batch(decimal_odds: ArrayLike) -> np.ndarray:
+        """
+        Converts an array of decimal odds to American odds.
+
+        Args:
+            decimal_odds: Decimal odds values (valid ones are > 1)
+
+        Returns:
+            Array of American odds rounded to whole numbers, same shape as the input, with NaN
+            where the decimal odds are less than or equal to 1 (so the array is float)
+        """
+        odds = np.asarray(decimal_odds, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            american = np.where(odds >= 2, (odds - 1) * 100, -100 / (odds - 1))
+        return np.where(odds > 1, np.round(american), np.nan)
+
+    @staticmethod
+    def devig(implied: ArrayLike, method: str = "multiplicative", iterations: int = 60) -> np.ndarray:
+        """
+        Removes the bookmaker margin from implied probabilities.
+
+        Each row is one bookmaker's market and each column one outcome, so a 2-D array
+        de-vigs many markets at once. The power and Shin methods are solved per row by a
+        vectorized bisection.
+
+        Methods:
+            multiplicative: p / sum(p)
+            additive: p - (sum(p) - 1) / n
+            power: p ** k with k chosen so each row sums to 1
+            shin: Shin (1993) insider-trading model, solving for the insider share z
+
+        Args:
+            implied: Implied probabilities as fractions, shape (outcomes,) or (markets, outcomes)
+            method: One of DEVIG_METHODS
+            iterations: Bisection iterations for the power and Shin methods
+
+        Returns:
+            Array of fair probabilities with the same shape as the input
+
+        Raises:
+            ValueError: If the method is unknown
+        """
+        probs = np.atleast_2d(np.asarray(implied, dtype=np.float64))
+        booksum = probs.sum(axis=1, keepdims=True)
+
+        if method == "multiplicative":
+            fair = probs / booksum
+        elif method == "additive":
+            fair = probs - (booksum - 1.0) / probs.shape[1]
+        elif method == "power":
+            # sum(p ** k) decreases in k, from n at k = 0; bracket k between 0 and a large exponent
+            low = np.zeros_like(booksum)
+            high = np.full_like(booksum, 50.0)
+            for _ in range(iterations):
+                mid = (low + high) / 2
+                over = (probs ** mid).sum(axis=1, keepdims=True) > 1.0
+                low = np.where(over, mid, low)
+                high = np.where(over, high, mid)
+            fair = probs ** ((low + high) / 2)
+        elif method == "shin":
+            low = np.zeros_like(booksum)
+            high = np.full_like(booksum, 0.999)
+            for _ in range(iterations):
+                z = (low + high) / 2
+                fair = (np.sqrt(z ** 2 + 4 * (1 - z) * probs ** 2 / booksum) - z) / (2 * (1 - z))
+                over = fair.sum(axis=1, keepdims=True) > 1.0
+                low = np.where(over, z, low)
+                high = np.where(over, high, z)
+            z = (low + high) / 2
+            fair = (np.sqrt(z ** 2 + 4 * (1 - z) * probs ** 2 / booksum) - z) / (2 * (1 - z))
+        else:
+            raise ValueError(f"Unknown de-vig method: {method}")
+
+        return fair.reshape(np.shape(implied))
+
+    @staticmethod
+    def market_price_matrix(odds_orderbook: OddsOrderbook, market_key: str = "h2h") -> Tuple[List[str], np.ndarray]:
+        """
+        Collects one market's decimal prices from every bookmaker of an event.
+
+        Outcomes are keyed by the event's home and away teams (unless no bookmaker names
+        them, as in totals), followed by any other outcome every bookmaker quotes (e.g. a
+        draw). A bookmaker that does not quote an outcome leaves a NaN in that cell rather
+        than being dropped, and outcome names outside those columns are ignored.
+
+        Args:
+            odds_orderbook: The event's odds
+            market_key: The market to collect (e.g. "h2h")
+
+        Returns:
+            Tuple of (outcome names, array of decimal prices shaped (bookmakers, outcomes))
+        """
+        rows: List[Dict[str, float]] = []
+        for bookmaker in odds_orderbook.bookmakers:
+            for market in bookmaker.markets:
+                if market.key == market_key:
+                    rows.append({outcome.name: outcome.price for outcome in market.outcomes})
+                    break
+
+        teams = [odds_orderbook.home_team, odds_orderbook.away_team]
+        outcomes = teams if any(team in row for row in rows for team in teams) else []
+        if rows:
+            outcomes += [name for name in rows[0] if name not in outcomes and all(name in row for row in rows)]
+        matrix = np.array(
+            [[row.get(name, np.nan) for name in outcomes] for row in rows],
+            dtype=np.float64
+        ).reshape(len(rows), len(outcomes))
+        return outcomes, matrix
+
+    @staticmethod
+    def consensus_fair_probabilities(
+        odds_orderbook: OddsOrderbook,
+        market_key: str = "h2h",
+        method: str = "multiplicative"
+    ) -> Dict[str, float]:
+        """
+        De-vigs every bookmaker's market for an event and averages the fair probabilities.
+
+        Args:
+            odds_orderbook: The event's odds
+            market_key: The market to use (e.g. "h2h")
+            method: One of DEVIG_METHODS
+
+        Returns:
+            Dict of outcome name to consensus fair probability (fraction); empty if no bookmaker quotes the market
+        """
+        outcomes, prices = DataFormatter.market_price_matrix(odds_orderbook, market_key)
+        implied = DataFormatter.decimal_to_probability_batch(prices)
+        # A bookmaker missing an outcome, or quoting invalid odds (<= 1) for one, is left out
+        implied = implied[~np.isnan(implied).any(axis=1)]
+        if implied.size == 0:
+            return {}
+        fair = DataFormatter.devig(implied, method=method)
+        consensus = fair.mean(axis=0)
+        consensus = consensus / consensus.sum()
+        return dict(zip(outcomes, consensus.tolist()))
+
+    @staticmethod
+    def consensus_fair_prices(
+        odds_orderbook: OddsOrderbook,
+        market_key: str = "h2h",
+        method: str = "multiplicative"
+    ) -> Dict[str, float]:
+        """
+        Returns consensus fair decimal prices (1 / fair probability) for an event.
+
+        Args:
+            odds_orderbook: The event's odds
+            market_key: The market to use (e.g. "h2h")
+            method: One of DEVIG_METHODS
+
+        Returns:
+            Dict of outcome name to fair decimal price
+        """
+        probabilities = DataFormatter.consensus_fair_probabilities(odds_orderbook, market_key, method)
+        return {name: 1.0 / probability for name, probability in probabilities.items() if probability > 0}
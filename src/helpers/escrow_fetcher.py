@@ -0,0 +1,185 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional
+
+from helpers.log_helpers import get_logger
+from helpers.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+class EscrowFetchError(Exception):
+    """Raised when some escrows of a market could not be fetched, so its book would be partial."""
+
+    def __init__(self, app_ids: List[int]):
+        super().__init__(f"Failed to fetch {len(app_ids)} escrow apps: {sorted(app_ids)[:10]}")
+        self.app_ids = app_ids
+
+class EscrowStateFetcher:
+    """Fetches the global state of every escrow created by a market app, in parallel."""
+
+    DEFAULT_MAX_WORKERS = 16
+    DEFAULT_PAGE_LIMIT = 1000
+
+    def __init__(
+        self,
+        indexer_client: Any,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        page_limit: int = DEFAULT_PAGE_LIMIT,
+        max_retries: int = 2,
+        retry_backoff: float = 0.2
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            indexer_client: An algosdk IndexerClient (or anything exposing the same methods)
+            max_workers: Maximum number of concurrent `applications` lookups
+            page_limit: Page size requested from `lookup_account_application_by_creator`
+            max_retries: Retries of a failed `applications` lookup
+            retry_backoff: Seconds before the first retry, doubled for every later one
+        """
+        self.indexer_client = indexer_client
+        self.max_workers = max_workers
+        self.page_limit = page_limit
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="escrow-fetch")
+        self._calls = threading.local()
+
+    def calls_in_thread(self) -> int:
+        """Indexer requests made (or submitted to the worker pool) from the calling thread so far."""
+        return getattr(self._calls, "count", 0)
+
+    def record_calls(self, count: int = 1) -> None:
+        """Counts indexer requests made from the calling thread, including ones made by callers."""
+        self._calls.count = getattr(self._calls, "count", 0) + count
+        get_metrics().inc("indexer_requests_total", count)
+
+    def list_created_applications(self, creator_address: str) -> List[Dict[str, Any]]:
+        """
+        Lists every application created by an address, following indexer pagination.
+
+        Args:
+            creator_address: The address of the creating (market) application
+
+        Returns:
+            List of application records as returned by the indexer
+        """
+        applications: List[Dict[str, Any]] = []
+        next_token: Optional[str] = None
+
+        while True:
+            page = self.indexer_client.lookup_account_application_by_creator(
+                creator_address,
+                limit=self.page_limit,
+                next_page=next_token
+            )
+            self.record_calls()
+            page_apps = page.get("applications", [])
+            applications.extend(page_apps)
+
+            next_token = page.get("next-token")
+            if not next_token or not page_apps:
+                break
+
+        return applications
+
+    def _lookup(self, app_id: int, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """
+        Looks up one application, retrying failed requests.
+
+        Returns:
+            The application info, or None if the indexer does not know the application
+
+        Raises:
+            Exception: The last error, once every retry failed
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.indexer_client.applications(app_id, **kwargs)
+            except Exception as e:
+                # Deleted between the creator listing and the lookup: not an error
+                if "no application found" in str(e):
+                    return None
+                if attempt == self.max_retries:
+                    raise
+                get_metrics().inc("indexer_retries_total")
+                time.sleep(self.retry_backoff * 2 ** attempt)
+
+    def fetch_applications(self, creator_address: str) -> List[Dict[str, Any]]:
+        """
+        Fetches application info for every escrow created by an address.
+
+        Records from the creator lookup that already carry `params.global-state` are
+        reused as-is; only the remaining ones are looked up individually, with at most
+        `max_workers` requests in flight. Failed lookups are retried; escrows deleted since
+        the listing are left out.
+
+        Args:
+            creator_address: The address of the creating (market) application
+
+        Returns:
+            List of application info dicts shaped like `indexer_client.applications` responses
+
+        Raises:
+            EscrowFetchError: If any escrow still could not be fetched, rather than return a
+                partial book
+        """
+        created = self.list_created_applications(creator_address)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(created)
+
+        missing = []
+        for index, app in enumerate(created):
+            if "global-state" in app.get("params", {}):
+                results[index] = {"application": app}
+            else:
+                missing.append(index)
+
+        if missing:
+            self.record_calls(len(missing))
+            futures = {self._executor.submit(self._lookup, created[index]["id"]): index for index in missing}
+            failed = []
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to fetch escrow app {created[index].get('id')}: {str(e)}")
+                    failed.append(created[index].get("id"))
+            if failed:
+                raise EscrowFetchError(failed)
+
+        return [app_info for app_info in results if app_info is not None]
+
+    def fetch_application_ids(self, app_ids: Iterable[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Fetches application info for specific escrows, including deleted ones.
+
+        Failed lookups are retried before they are reported.
+
+        Args:
+            app_ids: The escrow application IDs to look up
+
+        Returns:
+            Dict of app ID to application info; the value is None when the lookup failed
+        """
+        app_ids = set(app_ids)
+        self.record_calls(len(app_ids))
+        futures = {
+            self._executor.submit(self._lookup, app_id, include_all=True): app_id
+            for app_id in app_ids
+        }
+        results: Dict[int, Optional[Dict[str, Any]]] = {}
+        for future in as_completed(futures):
+            app_id = futures[future]
+            try:
+                results[app_id] = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to fetch escrow app {app_id}: {str(e)}")
+                results[app_id] = None
+        return results
+
+    def close(self) -> None:
+        """Shuts down the worker threads."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from helpers.log_helpers import get_logger
+from helpers.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_PER_HOST_LIMIT = 10
+
+class AsyncHttpClient:
+    """
+    Shared async HTTP client with keep-alive connection pooling and per-host concurrency limits.
+
+    HTTP/2 is negotiated when the optional `h2` package is installed.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        http2: Optional[bool] = None
+    ):
+        """
+        Initialize the client. The underlying httpx.AsyncClient is created on first use.
+
+        Args:
+            timeout: Read/write/pool timeout in seconds
+            connect_timeout: Connect timeout in seconds
+            max_connections: Maximum number of open connections across all hosts
+            max_keepalive_connections: Maximum number of idle connections kept alive
+            per_host_limit: Maximum number of in-flight requests per host
+            http2: Whether to enable HTTP/2 (defaults to True when `h2` is installed)
+        """
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.per_host_limit = per_host_limit
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._metrics = get_metrics()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled httpx client, created lazily."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Returns the concurrency limiter for the host of a URL."""
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Sends a request, waiting for a free slot on the target host first.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL
+            **kwargs: Passed through to httpx.AsyncClient.request (params, headers, json, ...)
+
+        Returns:
+            httpx.Response
+
+        Raises:
+            httpx.HTTPError: If the request fails or times out
+        """
+        async with self._host_semaphore(url):
+            if not self._metrics.enabled:
+                return await self.client.request(method, url, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await self.client.request(method, url, **kwargs)
+            finally:
+                self._record_request(url, start)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Sends a GET request. See `request`."""
+        return await self.request("GET", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        Sends a request and yields the response before its body is read.
+
+        The host slot is held until the context exits.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL
+            **kwargs: Passed through to httpx.AsyncClient.stream
+
+        Returns:
+            Async context manager yielding an httpx.Response
+        """
+        async with self._host_semaphore(url):
+            start = time.perf_counter()
+            try:
+                async with self.client.stream(method, url, **kwargs) as response:
+                    yield response
+            finally:
+                if self._metrics.enabled:
+                    self._record_request(url, start)
+
+    def _record_request(self, url: str, start: float) -> None:
+        """Counts a request and records its duration (including the body, for streams) per host."""
+        host = urlsplit(url).netloc
+        self._metrics.inc("http_requests_total", host=host)
+        self._metrics.observe("http_request_seconds", time.perf_counter() - start, host=host)
+
+    async def aclose(self) -> None:
+        """Closes pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+_shared_client: Optional[AsyncHttpClient] = None
+
+def get_http_client() -> AsyncHttpClient:
+    """
+    Returns the process-wide AsyncHttpClient shared by the API helpers.
+
+    Returns:
+        AsyncHttpClient: The shared client
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncHttpClient()
+        logger.debug(f"Created shared HTTP client (http2={_shared_client.http2})")
+    return _shared_client
@@ -0,0 +1,260 @@
+import base64
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from algosdk.abi import Contract
+
+from helpers.escrow_fetcher import EscrowStateFetcher
+from helpers.log_helpers import get_logger
+from helpers.metrics import get_metrics
+from models.escrow import EscrowState
+from models.orderbook import MAX_PRICE, LevelBook, OrderBook
+
+logger = get_logger(__name__)
+
+TRACKED_METHODS = ("create_escrow", "delete_escrow", "process_potential_match")
+
+LevelKey = Tuple[int, int]  # (position, side)
+OrderLevel = Tuple[LevelKey, int, int]  # (level key, price, remaining quantity)
+
+
+def _load_method_selectors() -> Dict[str, str]:
+    """Maps the base64 ABI selector of each tracked market method to its name."""
+    spec_path = Path(__file__).parent.parent / 'app_specs' / 'market_app_spec.json'
+    with open(spec_path, 'r') as file:
+        contract = Contract.from_json(json.dumps(json.load(file)["contract"]))
+    return {
+        base64.b64encode(method.get_selector()).decode(): method.name
+        for method in contract.methods
+        if method.name in TRACKED_METHODS
+    }
+
+
+METHOD_SELECTORS = _load_method_selectors()
+
+
+class IncrementalOrderBook:
+    """
+    Long-lived orderbook for a single market, kept current from indexer transaction deltas.
+
+    The first `sync` lists every escrow the market app created. Every later `sync` only
+    reads market app calls confirmed since the last processed round and re-fetches the
+    escrows those calls touched, so refresh cost follows market activity, not book depth.
+    `on_escrow_change`, if given, is called with every escrow the book adds, updates or
+    removes (with None for removals). Syncs are serialized, so a call left running in a
+    worker thread after a timeout cannot interleave with the next one.
+    """
+
+    def __init__(
+        self,
+        market_app_id: int,
+        market_app_address: str,
+        fetcher: EscrowStateFetcher,
+        decode_escrow: Callable[[Dict], EscrowState],
+        page_limit: int = 1000,
+        on_escrow_change: Optional[Callable[[int, Optional[EscrowState]], None]] = None
+    ):
+        """
+        Initialize the book.
+
+        Args:
+            market_app_id: The application ID of the market
+            market_app_address: The address of the market application (creator of the escrows)
+            fetcher: Fetcher used for escrow state lookups
+            decode_escrow: Function decoding an indexer application record into an EscrowState
+            page_limit: Page size for transaction searches
+            on_escrow_change: Optional callback for escrow changes
+        """
+        self.market_app_id = market_app_id
+        self.market_app_address = market_app_address
+        self.fetcher = fetcher
+        self.indexer_client = fetcher.indexer_client
+        self.decode_escrow = decode_escrow
+        self.page_limit = page_limit
+        self.on_escrow_change = on_escrow_change
+
+        self.last_round: Optional[int] = None
+        self.escrows: Dict[int, EscrowState] = {}
+        self.levels = LevelBook()
+        self._order_levels: Dict[int, OrderLevel] = {}
+        self._pending: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def sync(self) -> OrderBook:
+        """
+        Brings the book up to date with the chain and returns it.
+
+        Returns:
+            OrderBook object containing aggregated bids and asks for both YES and NO positions
+        """
+        with self._lock:
+            if self.last_round is None:
+                self._bootstrap()
+            else:
+                self._apply_deltas()
+            return self.to_orderbook()
+
+    def _bootstrap(self) -> None:
+        """Loads every escrow of the market from scratch."""
+        start_round = self.indexer_client.health()["round"]
+        self.fetcher.record_calls()
+        escrow_apps = self.fetcher.fetch_applications(self.market_app_address)
+
+        self.escrows.clear()
+        self._order_levels.clear()
+        self._pending.clear()
+        for price_levels in self.levels.sides.values():
+            price_levels.clear()
+
+        decode_start = time.perf_counter()
+        states = [self.decode_escrow(escrow_app) for escrow_app in escrow_apps]
+        get_metrics().observe("alpha_orderbook_decode_seconds", time.perf_counter() - decode_start)
+        for escrow_app, state in zip(escrow_apps, states):
+            self._apply_escrow(escrow_app["application"]["id"], state)
+
+        self.last_round = start_round
+        logger.info(f"Bootstrapped orderbook for market {self.market_app_id} with {len(self.escrows)} escrows at round {start_round}")
+
+    def _apply_deltas(self) -> None:
+        """Applies market app calls confirmed since the last processed round."""
+        created, deleted, touched, current_round = self._scan_transactions()
+
+        for app_id in deleted:
+            self._remove_escrow(app_id)
+
+        refresh = (created | touched | self._pending) - deleted
+        if refresh:
+            decode_seconds = 0.0
+            for app_id, app_info in self.fetcher.fetch_application_ids(refresh).items():
+                if app_info is None:
+                    self._pending.add(app_id)
+                    continue
+                self._pending.discard(app_id)
+                application = app_info.get("application", {})
+                if application.get("deleted"):
+                    self._remove_escrow(app_id)
+                else:
+                    decode_start = time.perf_counter()
+                    state = self.decode_escrow(app_info)
+                    decode_seconds += time.perf_counter() - decode_start
+                    self._apply_escrow(app_id, state)
+            # Timed like a full rebuild's decode, so both paths share one histogram
+            get_metrics().observe("alpha_orderbook_decode_seconds", decode_seconds)
+
+        self.last_round = max(self.last_round, current_round)
+        logger.debug(
+            f"Applied deltas for market {self.market_app_id} up to round {self.last_round}: "
+            f"{len(created)} created, {len(deleted)} deleted, {len(touched)} matched"
+        )
+
+    def _scan_transactions(self) -> Tuple[Set[int], Set[int], Set[int], int]:
+        """
+        Reads market app calls since the last processed round.
+
+        Returns:
+            Tuple of (created escrow IDs, deleted escrow IDs, matched escrow IDs, indexer current round)
+        """
+        created: Set[int] = set()
+        deleted: Set[int] = set()
+        touched: Set[int] = set()
+        current_round = self.last_round
+        next_token: Optional[str] = None
+
+        while True:
+            page = self.indexer_client.search_transactions(
+                application_id=self.market_app_id,
+                min_round=self.last_round + 1,
+                limit=self.page_limit,
+                next_page=next_token
+            )
+            self.fetcher.record_calls()
+            current_round = max(current_round, page.get("current-round", current_round))
+            transactions = page.get("transactions", [])
+            for txn in transactions:
+                self._classify_transaction(txn, created, deleted, touched)
+
+            next_token = page.get("next-token")
+            if not next_token or not transactions:
+                break
+
+        return created, deleted, touched, current_round
+
+    def _classify_transaction(self, txn: Dict[str, Any], created: Set[int], deleted: Set[int], touched: Set[int]) -> None:
+        """Records which escrows a single market app call created, deleted or matched."""
+        app_txn = txn.get("application-transaction", {})
+        if app_txn.get("application-id") != self.market_app_id:
+            return
+        args = app_txn.get("application-args", [])
+        if not args:
+            return
+
+        method = METHOD_SELECTORS.get(args[0])
+        if method == "create_escrow":
+            created.update(self._created_app_ids(txn))
+        elif method == "delete_escrow" and len(args) > 1:
+            deleted.add(int.from_bytes(base64.b64decode(args[1]), "big"))
+        elif method == "process_potential_match":
+            foreign_apps = app_txn.get("foreign-apps", [])
+            for arg in args[1:3]:
+                # Application arguments are indexes into the foreign apps array (0 is the called app)
+                index = int.from_bytes(base64.b64decode(arg), "big")
+                if 0 < index <= len(foreign_apps):
+                    touched.add(foreign_apps[index - 1])
+
+    def _created_app_ids(self, txn: Dict[str, Any]) -> Iterable[int]:
+        """Yields the application IDs created by a transaction or its inner transactions."""
+        if txn.get("created-application-index"):
+            yield txn["created-application-index"]
+        for inner_txn in txn.get("inner-txns", []):
+            yield from self._created_app_ids(inner_txn)
+
+    @staticmethod
+    def _order_level(order: EscrowState) -> Optional[OrderLevel]:
+        """Returns the price level an open limit order rests on, or None if it does not rest."""
+        remaining_qty = order.quantity - order.quantity_filled
+        price = order.price
+        if remaining_qty <= 0 or not 0 < price <= MAX_PRICE or order.slippage != 0:
+            return None
+        if order.side not in (0, 1) or order.position not in (0, 1):
+            return None
+        return (order.position, order.side), price, remaining_qty
+
+    def _apply_escrow(self, app_id: int, order: EscrowState) -> None:
+        """Adds or updates an escrow, moving its quantity between price levels in place."""
+        self._withdraw(app_id)
+        self.escrows[app_id] = order
+        if self.on_escrow_change is not None:
+            self.on_escrow_change(app_id, order)
+        order_level = self._order_level(order)
+        if order_level is None:
+            return
+        key, price, remaining_qty = order_level
+        self.levels.sides[key].add(price, remaining_qty)
+        self._order_levels[app_id] = order_level
+
+    def _remove_escrow(self, app_id: int) -> None:
+        """Removes an escrow and its quantity from the book."""
+        self._withdraw(app_id)
+        self.escrows.pop(app_id, None)
+        if self.on_escrow_change is not None:
+            self.on_escrow_change(app_id, None)
+
+    def _withdraw(self, app_id: int) -> None:
+        """Takes an escrow's current contribution out of its price level."""
+        order_level = self._order_levels.pop(app_id, None)
+        if order_level is None:
+            return
+        key, price, remaining_qty = order_level
+        self.levels.sides[key].add(price, -remaining_qty)
+
+    def to_orderbook(self) -> OrderBook:
+        """
+        Builds an OrderBook snapshot of the current price levels.
+
+        Returns:
+            OrderBook object backed by a copy of the book's sorted price levels
+        """
+        return OrderBook(levels=self.levels.copy())
@@ -1,74 +1,217 @@
+import atexit
+import copy
+import json
 import logging
 import os
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional, Set
 
 # Constants for logging
 LOG_FOLDER = "logs"
-LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+CONSOLE_FORMAT = "%(levelname)s - %(message)s"
 MAX_BYTES = 10 * 1024 * 1024  # 10MB
 BACKUP_COUNT = 5
 
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    Every line has `ts`, `level`, `logger` and `msg`; a dict passed as `extra={"data": {...}}`
+    is added under `data`, and exceptions under `exc`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        data = getattr(record, "data", None)
+        if data is not None:
+            entry["data"] = data
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class LogSampler:
+    """
+    Keeps one in every N DEBUG/INFO records for loggers with a sample rate.
+
+    Rates are looked up by logger name and then by its parent packages, so a rate for
+    "helpers" covers every helper module. Sampling is by count, not random, so a steady
+    message stream keeps an even spacing.
+    """
+
+    def __init__(self):
+        self.rates: Dict[str, float] = {}
+        self._intervals: Dict[str, int] = {}  # Logger name -> keep one in N, resolved lazily
+        self._counters: Dict[str, int] = {}
+
+    def set_rate(self, name: str, rate: float) -> None:
+        """Sets the fraction (0 to 1) of DEBUG/INFO records kept for a logger and its children."""
+        self.rates[name] = max(0.0, min(1.0, rate))
+        self._intervals.clear()
+
+    def keep(self, name: str) -> bool:
+        """Whether the next DEBUG/INFO record of a logger should be kept."""
+        if not self.rates:
+            return True
+        interval = self._intervals.get(name)
+        if interval is None:
+            interval = self._interval(name)
+            self._intervals[name] = interval
+        if interval == 1:
+            return True
+        if interval == 0:
+            return False
+        count = self._counters.get(name, 0)
+        self._counters[name] = count + 1
+        return count % interval == 0
+
+    def _interval(self, name: str) -> int:
+        """Resolves the keep-one-in-N interval for a logger name (0 drops everything)."""
+        while True:
+            if name in self.rates:
+                rate = self.rates[name]
+                return 0 if rate <= 0 else max(1, round(1 / rate))
+            if "." not in name:
+                return 1
+            name = name.rsplit(".", 1)[0]
+
+_sampler = LogSampler()
+
+class _SampleFilter(logging.Filter):
+    """
+    Drops the DEBUG and INFO records the sampler does not keep.
+
+    Attached to the shared queue handler, so it only sees records of the loggers `get_logger`
+    set up; loggers of other libraries are left as they are.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.INFO or _sampler.keep(record.name)
+
+class _SnapshotQueueHandler(QueueHandler):
+    """
+    QueueHandler that formats `msg % args` in the logging thread, as the stock handler does.
+
+    Arguments such as order or quote lists may change once the call returns, so they are
+    rendered before the record is queued. Unlike the stock handler, the exception text is
+    kept apart (in `exc_text`) for the JSON `exc` field instead of appended to the message.
+    The prepared record is picklable, so this handler also forwards worker records.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class _ConsoleFilter(logging.Filter):
+    """Passes records of the loggers created with `print_to_console`."""
+
+    def __init__(self, names: Set[str]):
+        super().__init__()
+        self.names = names
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.name in self.names
+
+class _LogPipeline:
+    """The shared queue, the background writer thread and its handlers, created once per process."""
+
+    def __init__(self):
+        os.makedirs(LOG_FOLDER, exist_ok=True)
+        self.queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.console_loggers: Set[str] = set()
+
+        self.queue_handler = _SnapshotQueueHandler(self.queue)
+        self.queue_handler.addFilter(_SampleFilter())
+
+        log_file = os.path.join(LOG_FOLDER, f"app_{datetime.now().strftime('%Y%m%d')}.jsonl")
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=MAX_BYTES,
+            backupCount=BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(JsonLinesFormatter())
+
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        console_handler.addFilter(_ConsoleFilter(self.console_loggers))
+
+        self.listener = QueueListener(self.queue, file_handler, console_handler, respect_handler_level=True)
+        self.listener.start()
+        self._running = True
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Writes out every queued record and stops the writer thread."""
+        if self._running:
+            self._running = False
+            self.listener.stop()
+
+_pipeline: Optional[_LogPipeline] = None
+_pipeline_lock = threading.Lock()
+
+def _get_pipeline() -> _LogPipeline:
+    """Returns the process-wide logging pipeline, starting it on first use."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = _LogPipeline()
+    return _pipeline
+
 def get_logger(name: str, log_level: Optional[int] = None, print_to_console: bool = False) -> logging.Logger:
     """
-    Get a logger instance with both file and console handlers.
-    
+    Get a logger that writes through the shared background logging pipeline.
+
+    Records go onto an in-memory queue and a single writer thread formats them and writes
+    them to the JSON lines log file (and the console, if requested), so logging never
+    blocks on file I/O.
+
     Args:
         name: The name of the logger (usually __name__)
-        log_level: Optional log level override (defaults to INFO)
-        print_to_console: Whether to print logs to console (defaults to True)
-        
+        log_level: Optional log level override (defaults to INFO for new loggers)
+        print_to_console: Whether to also print INFO and above to the console
+
     Returns:
         logging.Logger: Configured logger instance
     """
-    # Create logs directory if it doesn't exist
-    os.makedirs(LOG_FOLDER, exist_ok=True)
-    
-    # Get or create logger
+    pipeline = _get_pipeline()
     logger = logging.getLogger(name)
-    
-    # Set log level
-    if log_level is None:
-        log_level = logging.INFO
-    logger.setLevel(log_level)
-    
-    # Don't add handlers if they already exist
-    if logger.handlers:
-        return logger
-    
-    # Create formatters
-    file_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-    console_formatter = logging.Formatter("%(levelname)s - %(message)s")
-    
-    # Create and configure file handler
-    log_file = os.path.join(LOG_FOLDER, f"app_{datetime.now().strftime('%Y%m%d')}.log")
-    file_handler = RotatingFileHandler(
-        log_file,
-        maxBytes=MAX_BYTES,
-        backupCount=BACKUP_COUNT,
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(file_formatter)
-    
-    # Add file handler to logger
-    logger.addHandler(file_handler)
-    
-    # Add console handler only if print_to_console is True
+
+    if log_level is not None:
+        logger.setLevel(log_level)
+    elif logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+
     if print_to_console:
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
-    
+        pipeline.console_loggers.add(name)
+
+    # Don't add the handler twice
+    if pipeline.queue_handler not in logger.handlers:
+        logger.addHandler(pipeline.queue_handler)
+
     return logger
 
 def set_log_level(level: int):
     """
     Set the log level for all loggers.
-    
+
     Args:
         level: The logging level to set (e.g., logging.DEBUG, logging.INFO)
     """
@@ -76,29 +219,122 @@ def set_log_level(level: int):
     for logger_name in logging.root.manager.loggerDict:
         logging.getLogger(logger_name).setLevel(level)
 
+def set_sample_rate(name: str, rate: float) -> None:
+    """
+    Keep only a fraction of the DEBUG and INFO records from a logger and its children.
+
+    Args:
+        name: Logger or package name (e.g. "helpers.alpha_helper")
+        rate: Fraction of records to keep, from 0 (none) to 1 (all)
+    """
+    _sampler.set_rate(name, rate)
+
+def configure_logging(level: Optional[str] = None, sample_rates: str = "") -> None:
+    """
+    Apply logging settings.
+
+    Args:
+        level: Level name for all loggers (e.g. "DEBUG"); None leaves levels unchanged
+        sample_rates: Comma-separated `logger=rate` pairs, e.g. "helpers.alpha_helper=0.1"
+    """
+    if level:
+        set_log_level(logging.getLevelName(level.upper()))
+    for item in sample_rates.split(","):
+        if "=" in item:
+            name, rate = item.split("=", 1)
+            set_sample_rate(name.strip(), float(rate))
+
+def forward_logs(target: Any) -> None:
+    """
+    Sends this process's log records to `target` instead of writing them, for worker processes
+    whose parent writes them with a LogReceiver (so only one process writes the log file).
+
+    Args:
+        target: A multiprocessing queue shared with the parent
+    """
+    pipeline = _get_pipeline()
+    pipeline.stop()
+    for handler in pipeline.listener.handlers:
+        handler.close()
+    pipeline.listener = QueueListener(pipeline.queue, _SnapshotQueueHandler(target))
+    pipeline.listener.start()
+    pipeline._running = True
+
+class LogReceiver:
+    """Writes the records a worker process sends with `forward_logs` through this process's pipeline."""
+
+    def __init__(self, source: Any):
+        """
+        Args:
+            source: The multiprocessing queue given to the worker
+        """
+        self.source = source
+        self._thread = threading.Thread(target=self._receive, name="log-receiver", daemon=True)
+        self._thread.start()
+
+    def _receive(self) -> None:
+        # Records were sampled in the worker already, so they skip the queue handler's filter
+        target = _get_pipeline().queue
+        while True:
+            try:
+                record = self.source.get()
+            except (EOFError, OSError):
+                return
+            if record is None:
+                return
+            target.put(record)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Writes the records received so far and stops.
+
+        A worker killed while sending can leave a partial record that never completes, so this
+        gives up after `timeout` seconds; the (daemon) thread is then abandoned.
+
+        Args:
+            timeout: Seconds to wait for the records in flight
+        """
+        self.source.put(None)
+        self._thread.join(timeout)
+
+def log_queue_size() -> int:
+    """Number of records waiting for the background writer."""
+    return _pipeline.queue.qsize() if _pipeline is not None else 0
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer (also run at exit)."""
+    if _pipeline is not None:
+        _pipeline.stop()
+
+_data_logger: Optional[logging.Logger] = None
+
 def log_data(message: str, level: int = logging.INFO, print_to_console: bool = False) -> None:
     """
     Log a message with the specified level.
-    
+
     Args:
         message: The message to log
         level: The logging level (defaults to INFO)
-        print_to_console: Whether to print logs to console (defaults to True)
+        print_to_console: Whether to print logs to console (defaults to False)
     """
-    logger = get_logger(__name__, print_to_console=print_to_console)
-    logger.log(level, message)
+    global _data_logger
+    if _data_logger is None:
+        _data_logger = get_logger(__name__)
+    if print_to_console:
+        _get_pipeline().console_loggers.add(__name__)
+    _data_logger.log(level, message)
 
 # Example usage:
 if __name__ == "__main__":
     # Get a logger for this module
     logger = get_logger(__name__)
-    
+
     # Log messages at different levels
     logger.debug("This is a debug message")
     logger.info("This is an info message")
     logger.warning("This is a warning message")
     logger.error("This is an error message")
     logger.critical("This is a critical message")
-    
+
     # Set all loggers to DEBUG level
-    set_log_level(logging.DEBUG) 
\ No newline at end of file
+    set_log_level(logging.DEBUG)
@@ -0,0 +1,112 @@
+import time
+from typing import Any, Awaitable, Callable, Collection, Dict, Optional
+
+from helpers.log_helpers import get_logger
+from helpers.ttl_cache import TTLCache
+from models.market import MarketCore
+
+logger = get_logger(__name__)
+
+class MarketCache:
+    """
+    Two-tier cache of MarketCore records.
+
+    The immutable tier holds one MarketCore per market for as long as the market is live and
+    is served without any request. The volatile tier is a TTLCache over the same objects: once
+    `volatile_ttl_seconds` have passed, the next `get` re-fetches the market record and updates
+    only the volatile fields in place (served stale for another TTL while that happens).
+    """
+
+    def __init__(
+        self,
+        fetch_record: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+        volatile_ttl_seconds: float = 30.0,
+        max_entries: int = 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            fetch_record: Coroutine function returning the raw market record for a market ID, or None
+            volatile_ttl_seconds: How long volatile fields are considered fresh
+            max_entries: Maximum number of markets in the volatile tier
+        """
+        self.fetch_record = fetch_record
+        self.cores: Dict[str, MarketCore] = {}
+        self.volatile = TTLCache(
+            ttl_seconds=volatile_ttl_seconds,
+            stale_seconds=volatile_ttl_seconds,
+            max_entries=max_entries
+        )
+
+    def core(self, market_id: str) -> Optional[MarketCore]:
+        """Returns the cached MarketCore without refreshing anything, or None if it was never loaded."""
+        return self.cores.get(market_id)
+
+    async def get(self, market_id: str, refresh_volatile: bool = True) -> Optional[MarketCore]:
+        """
+        Returns a market's MarketCore, fetching it on first use.
+
+        Args:
+            market_id: The unique identifier for the market
+            refresh_volatile: Whether stale volatile fields should be refreshed; when False
+                only the immutable tier is consulted once the market is loaded
+
+        Returns:
+            MarketCore (with stale volatile fields if a refresh failed), or None if the market
+            could not be fetched
+        """
+        core = self.cores.get(market_id)
+        if core is not None and not refresh_volatile:
+            return core
+        fresh = await self.volatile.get_or_fetch(market_id, lambda: self._load(market_id))
+        if fresh is None:
+            # The fetch failed and nothing was cached as fresh; fall back to the immutable tier
+            return self.cores.get(market_id)
+        return fresh
+
+    async def _load(self, market_id: str) -> Optional[MarketCore]:
+        """
+        Fetches a market record into the immutable tier, or updates its volatile fields.
+
+        Returns:
+            The refreshed MarketCore, or None if the fetch failed (so the volatile tier is not
+            marked fresh)
+        """
+        data = await self.fetch_record(market_id)
+        if not data:
+            return None
+        core = self.cores.get(market_id)
+        if core is None:
+            core = MarketCore.from_record(data)
+            self.cores[market_id] = core
+        else:
+            core.update_volatile(data)
+        return core
+
+    def invalidate(self, market_id: str) -> None:
+        """Drops a market from both tiers."""
+        self.cores.pop(market_id, None)
+        self.volatile.invalidate(market_id)
+
+    def prune(self, now_ms: Optional[int] = None, live_ids: Optional[Collection[str]] = None) -> int:
+        """
+        Drops markets whose end time has passed, and optionally every market no longer live.
+
+        Args:
+            now_ms: Reference time, epoch milliseconds; defaults to now
+            live_ids: Optional IDs of the live markets; other markets are dropped too
+
+        Returns:
+            Number of markets dropped
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        ended = [
+            market_id for market_id, core in self.cores.items()
+            if core.is_ended(now_ms) or (live_ids is not None and market_id not in live_ids)
+        ]
+        for market_id in ended:
+            self.invalidate(market_id)
+        if ended:
+            logger.debug(f"Pruned {len(ended)} ended or no longer live markets from the market cache")
+        return len(ended)
@@ -0,0 +1,338 @@
+import asyncio
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from datetime import timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from helpers.log_helpers import get_logger
+from helpers.teams import TEAM_COLORS, TEAM_NICKNAMES
+from models.market import Market
+from models.match import MarketMatch
+from models.odds_orderbook import OddsOrderbook
+from models.signal import ScanPair
+
+logger = get_logger(__name__)
+
+INDEX_VERSION = 3
+COLOR_TOLERANCE = 60.0  # Largest RGB distance at which a market color is taken as a team's color
+
+def normalize_name(name: str) -> str:
+    """
+    Normalizes a team name or market topic for matching.
+
+    Lowercases, spells out "&", turns punctuation into spaces and collapses whitespace,
+    e.g. "St. Louis Cardinals" -> "st louis cardinals".
+    """
+    name = name.lower().replace("&", " and ")
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name).split())
+
+def team_aliases(team: str) -> List[str]:
+    """
+    Returns the normalized names a team may appear under in a market topic.
+
+    These are the full name and the team's curated nicknames, e.g. "boston red sox" and
+    "red sox". Generic word suffixes ("sox", "city", "united") are never aliases.
+    """
+    aliases = [normalize_name(team)]
+    aliases.extend(normalize_name(nickname) for nickname in TEAM_NICKNAMES.get(team, ()))
+    return aliases
+
+def color_distance(color: Optional[str], team: str) -> Optional[float]:
+    """
+    Returns the RGB distance between a "#RRGGBB" color and the closest curated color of a team.
+
+    Returns:
+        The distance, or None if the color is missing or malformed or the team has no colors
+    """
+    if not color or not TEAM_COLORS.get(team):
+        return None
+    try:
+        rgb = bytes.fromhex(color.lstrip("#"))
+    except ValueError:
+        return None
+    if len(rgb) != 3:
+        return None
+    return min(
+        sum((a - b) ** 2 for a, b in zip(rgb, bytes.fromhex(team_color.lstrip("#")))) ** 0.5
+        for team_color in TEAM_COLORS[team]
+    )
+
+class EventIndex:
+    """Odds API events indexed by normalized team alias."""
+
+    def __init__(self, events_by_sport: Dict[str, Iterable[OddsOrderbook]]):
+        """
+        Args:
+            events_by_sport: Odds API events (bookmakers not needed) keyed by sport
+        """
+        self.events: Dict[str, Tuple[str, OddsOrderbook]] = {}
+        self.team_events: Dict[str, Set[str]] = defaultdict(set)  # Team name -> event IDs
+        self._aliases: Dict[str, Set[str]] = defaultdict(set)  # Normalized alias -> team names
+        self._max_words = 1
+        for sport, events in events_by_sport.items():
+            for event in events:
+                self.events[event.id] = (sport, event)
+                for team in (event.home_team, event.away_team):
+                    self.team_events[team].add(event.id)
+                    for alias in team_aliases(team):
+                        self._aliases[alias].add(team)
+                        self._max_words = max(self._max_words, len(alias.split()))
+
+    def mentions(self, text: str) -> List[Set[str]]:
+        """
+        Finds the team names mentioned in a topic or other market text.
+
+        Words are scanned left to right and the longest alias starting at each word wins, so
+        "new york yankees" is one mention, not also "yankees".
+
+        Args:
+            text: A market topic or other market text
+
+        Returns:
+            The team names each alias found can refer to, in text order
+        """
+        words = normalize_name(text).split()
+        found: List[Set[str]] = []
+        start = 0
+        while start < len(words):
+            for length in range(min(self._max_words, len(words) - start), 0, -1):
+                teams = self._aliases.get(" ".join(words[start:start + length]))
+                if teams:
+                    found.append(teams)
+                    start += length
+                    break
+            else:
+                start += 1
+        return found
+
+class MarketMatcher:
+    """
+    Maps live Alpha markets to Odds API events and keeps the result in a JSON file.
+
+    A market matches an event when the market topic names both teams, each unambiguously and
+    no other team, and the event starts within `match_window_hours` of the market's end time.
+    The YES team is read from the market's YES/NO share text or team colors, never from topic
+    order; a market whose YES team cannot be told is left unmatched. Matches are persisted and
+    only new markets are matched on each refresh; markets that did not match are retried after
+    `retry_seconds`.
+    """
+
+    def __init__(
+        self,
+        alpha: Any,
+        odds: Any,
+        sports: Iterable[str],
+        index_path: str,
+        match_window_hours: float = 36.0,
+        retry_seconds: float = 1800.0
+    ):
+        """
+        Initialize the matcher and load any persisted index.
+
+        Args:
+            alpha: AlphaHelper used to list live markets
+            odds: OddsAPIHelper used to list events
+            sports: Odds API sport keys to match against
+            index_path: Path of the persisted JSON index
+            match_window_hours: Maximum distance between event start and market end
+            retry_seconds: Delay before an unmatched market is tried again
+        """
+        self.alpha = alpha
+        self.odds = odds
+        self.sports = list(sports)
+        self.index_path = index_path
+        self.match_window_hours = match_window_hours
+        self.retry_seconds = retry_seconds
+
+        self.matches: Dict[str, MarketMatch] = {}
+        self.unmatched: Dict[str, float] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Loads the persisted index, if there is one."""
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r') as file:
+                data = json.load(file)
+            if data.get("version") != INDEX_VERSION:
+                logger.info(f"Match index {self.index_path} was built by an older matcher, matching again")
+                return
+            self.matches = {m["market_id"]: MarketMatch(**m) for m in data.get("matches", [])}
+            self.unmatched = {k: float(v) for k, v in data.get("unmatched", {}).items()}
+            logger.info(f"Loaded {len(self.matches)} market matches from {self.index_path}")
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.error(f"Failed to load match index {self.index_path}: {str(e)}")
+
+    def save(self) -> None:
+        """Writes the index atomically."""
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump({
+                "version": INDEX_VERSION,
+                "matches": [match.to_dict() for match in self.matches.values()],
+                "unmatched": self.unmatched
+            }, file, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def pairs(self) -> List[ScanPair]:
+        """Returns a ScanPair for every matched market."""
+        return [match.to_scan_pair() for match in self.matches.values()]
+
+    async def refresh(self) -> List[ScanPair]:
+        """
+        Brings the index up to date with the live markets.
+
+        Returns:
+            ScanPair for every matched market
+        """
+        markets = await self.alpha.get_live_markets()
+        if not markets:
+            return self.pairs()
+
+        now = time.time()
+        live_ids = {market.id for market in markets}
+        self.alpha.prune_markets(live_ids)
+        changed = False
+        for market_id in [m for m in self.matches if m not in live_ids]:
+            del self.matches[market_id]
+            changed = True
+        for market_id in [m for m in self.unmatched if m not in live_ids]:
+            del self.unmatched[market_id]
+            changed = True
+
+        pending = [
+            market for market in markets
+            if market.id and market.topic and market.id not in self.matches
+            and now - self.unmatched.get(market.id, 0.0) >= self.retry_seconds
+        ]
+        if pending:
+            events = await asyncio.gather(*(self.odds.get_events(sport) for sport in self.sports))
+            index = EventIndex(dict(zip(self.sports, events)))
+            for market in pending:
+                match = self.match_market(market, index, now)
+                if match is None:
+                    self.unmatched[market.id] = now
+                else:
+                    self.matches[market.id] = match
+                    self.unmatched.pop(market.id, None)
+            changed = True
+            logger.info(f"Matched {len(self.matches)} of {len(markets)} live markets ({len(pending)} checked)")
+
+        if changed:
+            self.save()
+        return self.pairs()
+
+    @staticmethod
+    def _event_mentions(mentions: List[Set[str]], event: OddsOrderbook) -> Optional[Set[str]]:
+        """
+        Resolves a text's team mentions against one event.
+
+        Returns:
+            The event's teams named, or None if a mention does not refer to exactly one of them
+        """
+        event_teams = {event.home_team, event.away_team}
+        teams: Set[str] = set()
+        for names in mentions:
+            named = names & event_teams
+            if len(named) != 1:
+                return None
+            teams |= named
+        return teams
+
+    def resolve_yes_outcome(self, market: Market, event: OddsOrderbook, index: EventIndex) -> Optional[str]:
+        """
+        Tells which of an event's teams resolves the market YES, from the market's own fields.
+
+        The YES or NO share text naming exactly one team decides it, and so do team colors:
+        `yesTeamColor` and `noTeamColor` must each be close to one team's curated colors, and
+        only one assignment of teams to YES and NO may fit. When the sources disagree, or none
+        applies, the side is unknown.
+
+        Args:
+            market: The Alpha market
+            event: The event the market matched
+            index: Events index, for team aliases
+
+        Returns:
+            The Odds API outcome name of the YES team, or None if it cannot be told
+        """
+        teams = (event.home_team, event.away_team)
+        answers: Set[str] = set()
+
+        share = market.shareImage
+        for text, is_yes in ((share and share.yes and share.yes.text, True), (share and share.no and share.no.text, False)):
+            named = self._event_mentions(index.mentions(text), event) if text else None
+            if named is not None and len(named) == 1:
+                team = named.pop()
+                answers.add(team if is_yes else teams[1 - teams.index(team)])
+
+        fits = []
+        for yes_team, no_team in (teams, teams[::-1]):
+            distances = [color_distance(market.yesTeamColor, yes_team), color_distance(market.noTeamColor, no_team)]
+            known = [distance for distance in distances if distance is not None]
+            if known and all(distance <= COLOR_TOLERANCE for distance in known):
+                fits.append(yes_team)
+        if len(fits) == 1:
+            answers.add(fits[0])
+
+        if len(answers) > 1:
+            logger.warning(f"Market {market.id} share text and team colors disagree on the YES team")
+        return answers.pop() if len(answers) == 1 else None
+
+    def match_market(self, market: Market, index: EventIndex, now: Optional[float] = None) -> Optional[MarketMatch]:
+        """
+        Finds the event a market resolves on.
+
+        Args:
+            market: The Alpha market
+            index: Events to match against
+            now: Unix time recorded on the match
+
+        Returns:
+            MarketMatch, or None if no event's teams are both uniquely named within the time window
+            or the YES team cannot be told
+        """
+        reference_ms = market.endTs or market.liveTs
+        mentions = index.mentions(market.topic)
+        best: Optional[Tuple[float, str]] = None
+
+        candidates = {event_id for names in mentions for team in names for event_id in index.team_events[team]}
+        for event_id in candidates:
+            teams = self._event_mentions(mentions, index.events[event_id][1])
+            if teams is None or len(teams) < 2:
+                continue
+            sport, event = index.events[event_id]
+            if reference_ms:
+                distance = abs(event.commence_time.timestamp() - reference_ms / 1000) / 3600
+                if distance > self.match_window_hours:
+                    continue
+            else:
+                distance = 0.0
+            if best is None or distance < best[0]:
+                best = (distance, event_id)
+
+        if best is None:
+            return None
+
+        _, event_id = best
+        sport, event = index.events[event_id]
+        yes_outcome = self.resolve_yes_outcome(market, event, index)
+        if yes_outcome is None:
+            logger.info(f"Cannot tell which team is YES for market {market.id} ({market.topic})")
+            return None
+        return MarketMatch(
+            market_id=market.id,
+            market_app_id=market.marketAppId or 0,
+            sport=sport,
+            event_id=event.id,
+            home_team=event.home_team,
+            away_team=event.away_team,
+            commence_time=event.commence_time.astimezone(timezone.utc).isoformat(),
+            yes_outcome=yes_outcome,
+            yes_is_home=yes_outcome == event.home_team,
+            matched_at=now if now is not None else time.time()
+        )
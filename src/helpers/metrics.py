@@ -0,0 +1,272 @@
+import asyncio
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from helpers.log_helpers import get_logger
+
+logger = get_logger(__name__)
+
+# Latency buckets in seconds: four per doubling from 50 us to about 100 s, so quantiles
+# read from the buckets are within ~10% of the true value
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(0.00005 * 2 ** (i / 4) for i in range(84))
+# Buckets for small counts, e.g. indexer calls per orderbook snapshot
+COUNT_BUCKETS: Tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]  # (name, sorted label pairs)
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style, with quantile estimates."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: Ascending upper bounds; values above the last one go to the +Inf bucket
+        """
+        self.bounds = list(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile by interpolating within the bucket it falls in, clamped to the
+        observed range.
+
+        Returns:
+            The estimate, or NaN if nothing was observed
+        """
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if index == len(self.bounds):
+                    return self.max
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                estimate = lower + (self.bounds[index] - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+
+class MetricsRegistry:
+    """
+    Process-wide counters, gauges and histograms.
+
+    Every recording method returns immediately while `enabled` is False, so instrumented
+    code costs one attribute check when metrics are off. Metrics are keyed by name plus
+    optional labels, e.g. `observe("http_request_seconds", 0.05, host="api.example.com")`.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters: Dict[MetricKey, float] = {}
+        self.gauges: Dict[MetricKey, float] = {}
+        self.histograms: Dict[MetricKey, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        """Adds to a counter."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """Sets a gauge."""
+        if not self.enabled:
+            return
+        self.gauges[self._key(name, labels)] = value
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: Any) -> None:
+        """Records a value in a histogram, created with `buckets` on first use."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        """Drops every recorded metric."""
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    def summary(self) -> List[str]:
+        """One line per metric: p50/p99/count for histograms, values for counters and gauges."""
+        lines = []
+        with self._lock:
+            for key, histogram in sorted(self.histograms.items()):
+                scale, unit = (1000, "ms") if key[0].endswith("_seconds") else (1, "")
+                lines.append(
+                    f"{self._label(key)} p50={histogram.quantile(0.5) * scale:.2f}{unit} "
+                    f"p99={histogram.quantile(0.99) * scale:.2f}{unit} n={histogram.count}"
+                )
+            for key, value in sorted(self.counters.items()):
+                lines.append(f"{self._label(key)} {value:g}")
+            for key, value in sorted(self.gauges.items()):
+                lines.append(f"{self._label(key)} {value:g}")
+        return lines
+
+    def render_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, metrics in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted({key[0] for key in metrics}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for key, value in sorted(item for item in metrics.items() if item[0][0] == name):
+                        lines.append(f"{name}{self._format_labels(key[1])} {value:g}")
+            for name in sorted({key[0] for key in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(item for item in self.histograms.items() if item[0][0] == name):
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.bounds + [math.inf], histogram.counts):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == math.inf else f"{bound:.6g}"
+                        lines.append(f"{name}_bucket{self._format_labels(key[1] + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{self._format_labels(key[1])} {histogram.sum:.9g}")
+                    lines.append(f"{name}_count{self._format_labels(key[1])} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> MetricKey:
+        if not labels:
+            return name, ()
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    @classmethod
+    def _label(cls, key: MetricKey) -> str:
+        return f"{key[0]}{cls._format_labels(key[1])}"
+
+    @staticmethod
+    def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+
+_metrics = MetricsRegistry()
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Returns the process-wide MetricsRegistry (disabled until `enabled` is set).
+
+    Returns:
+        MetricsRegistry: The shared registry
+    """
+    return _metrics
+
+def timed(name: str, **labels: Any) -> Callable:
+    """
+    Decorator recording a function's duration in the `name` histogram (seconds) and
+    counting its exceptions in `{name}_errors_total`. Works on sync and async functions.
+
+    Args:
+        name: Histogram name, conventionally ending in `_seconds`
+        **labels: Fixed labels for the histogram
+    """
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _metrics.enabled:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    _metrics.inc(f"{name}_errors_total", **labels)
+                    raise
+                finally:
+                    _metrics.observe(name, time.perf_counter() - start, **labels)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _metrics.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                _metrics.inc(f"{name}_errors_total", **labels)
+                raise
+            finally:
+                _metrics.observe(name, time.perf_counter() - start, **labels)
+        return wrapper
+    return decorator
+
+class MetricsServer:
+    """Serves the shared registry at `/metrics` over plain HTTP, on the running event loop."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, host: str = "127.0.0.1", port: int = 9108):
+        """
+        Args:
+            registry: Registry to serve (defaults to the shared one)
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+        """
+        self.registry = registry or _metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # Headers are not needed
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.registry.render_prometheus().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.warning(f"Failed to serve metrics request: {str(e)}")
+        finally:
+            writer.close()
+
+async def log_metrics_summary(interval_seconds: float, registry: Optional[MetricsRegistry] = None) -> None:
+    """Logs the registry summary every `interval_seconds` until cancelled."""
+    registry = registry or _metrics
+    while True:
+        await asyncio.sleep(interval_seconds)
+        lines = registry.summary()
+        if lines:
+            logger.info("Metrics summary:\n  " + "\n  ".join(lines))
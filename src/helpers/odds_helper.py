@@ -1,64 +1,202 @@
-import requests
+from helpers.http_client import AsyncHttpClient, get_http_client
 from helpers.log_helpers import get_logger
+from helpers.metrics import get_metrics, timed
+from helpers.odds_stream import LazyOddsOrderbooks, OddsEventFilter, iter_odds_events, parse_odds_event
+from helpers.ttl_cache import TTLCache
 from config import get_settings
-from models.odds_orderbook import OddsOrderbook
-from typing import Optional
+from models.odds_orderbook import OddsOrderbook, OddsQuota
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+import asyncio
 import json
+import logging
 
 
 logger = get_logger(__name__)
 
 class OddsAPIHelper:
-    def __init__(self):
+    def __init__(self, http_client: Optional[AsyncHttpClient] = None):
         settings = get_settings()
+        self.http = http_client or get_http_client()
         self.api_key = settings.ODDS_API_KEY
         self.region = "us"
-        self.market = "h2h,spreads"  # Include both h2h and spreads markets
+        self.market = settings.ODDS_MARKETS  # h2h and spreads by default
+        self.bookmakers = [key for key in settings.ODDS_BOOKMAKERS.split(",") if key]
+        self.event_filter = OddsEventFilter(bookmakers=self.bookmakers, markets=self.market.split(","))
         self.base_url = "https://api.the-odds-api.com/v4/sports"
+        self.quota = OddsQuota()
+        self.cache = TTLCache(
+            ttl_seconds=settings.ODDS_CACHE_TTL_SECONDS,
+            stale_seconds=settings.ODDS_CACHE_STALE_SECONDS,
+            max_entries=settings.ODDS_CACHE_MAX_ENTRIES
+        )
+        # Parsed bookmakers keyed by (event id, bookmaker key), reused while last_update is unchanged
+        self._bookmakers = TTLCache(ttl_seconds=float("inf"), max_entries=settings.ODDS_CACHE_MAX_ENTRIES * 64)
         
         if not self.api_key:
             logger.warning("ODDS_API_KEY not found in environment variables")
 
-    def get_matchup_odds(self, sport: str, event_id: str) -> Optional[OddsOrderbook]:
+    @timed("odds_get_matchup_odds_seconds")
+    async def get_matchup_odds(self, sport: str, event_id: str) -> Optional[OddsOrderbook]:
         """
         Fetches details (team names and odds) for a specific event using its event_id.
         Returns an OddsOrderbook object if found, None otherwise.
         """
+        events = await self.get_sport_odds(sport, event_ids=[event_id])
+        odds_orderbook = events.get(event_id)
+        if odds_orderbook is None:
+            logger.warning(f"Event with id {event_id} not found")
+        return odds_orderbook
+
+    async def get_sport_odds(self, sport: str, event_ids: Optional[Iterable[str]] = None) -> Mapping[str, OddsOrderbook]:
+        """
+        Fetches odds for every event of a sport (or a subset of events) in a single request.
+        
+        Responses are cached per (sport, markets, regions, event set) for ODDS_CACHE_TTL_SECONDS
+        and served stale for up to ODDS_CACHE_STALE_SECONDS more while they refresh. The
+        returned mapping is shared with the cache.
+        
+        Args:
+            sport: The sport key (e.g. "baseball_mlb")
+            event_ids: Optional event IDs to restrict the response to
+            
+        Returns:
+            Mapping of event ID to OddsOrderbook, validated lazily; empty if the request fails
+        """
+        event_ids = sorted(set(event_ids)) if event_ids else None
+        key = (sport, self.market, self.region, tuple(self.bookmakers), tuple(event_ids) if event_ids else None)
+        odds_orderbooks = await self.cache.get_or_fetch(key, lambda: self._fetch_sport_odds(sport, event_ids))
+        return odds_orderbooks if odds_orderbooks is not None else {}
+
+    @timed("odds_request_seconds")
+    async def _fetch_sport_odds(self, sport: str, event_ids: Optional[List[str]]) -> Optional[LazyOddsOrderbooks]:
+        """
+        Requests odds for a sport from the Odds API.
+        
+        The response body is parsed as it streams in, one event at a time. Bookmakers and
+        markets outside the configured whitelist are dropped before anything is validated,
+        and events are only validated into OddsOrderbook objects when they are looked up.
+        
+        Args:
+            sport: The sport key
+            event_ids: Optional event IDs to restrict the response to
+            
+        Returns:
+            Mapping of event ID to OddsOrderbook, or None if the request fails
+        """
         url = f"{self.base_url}/{sport}/odds/"
         params = {
-            "regions": self.region,
             "markets": self.market,
-            "apiKey": self.api_key,
-            "eventIds": event_id
+            "apiKey": self.api_key
         }
+        if self.bookmakers:
+            params["bookmakers"] = ",".join(self.bookmakers)
+        else:
+            params["regions"] = self.region
+        if event_ids:
+            params["eventIds"] = ",".join(event_ids)
         
-        logger.debug(f"Making request to: {url}")
-        logger.debug(f"With params: {json.dumps(params, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Making request to: {url}")
+            logger.debug(f"With params: {json.dumps({**params, 'apiKey': '***'}, indent=2)}")
         
         try:
-            response = requests.get(url, params=params)
-            logger.debug(f"Response status code: {response.status_code}")
-            
-            if response.status_code != 200:
-                logger.error(f"Error fetching odds data: {response.status_code} - {response.text}")
-                return None
+            async with self.http.stream("GET", url, params=params) as response:
+                logger.debug(f"Response status code: {response.status_code}")
+                self._record_quota(response.headers)
                 
-            data = response.json()
-            logger.debug(f"Raw API response: {json.dumps(data, indent=2)}")
-            
-            if not data:
-                logger.warning(f"Event with id {event_id} not found")
-                return None
+                if response.status_code != 200:
+                    await response.aread()
+                    logger.error(f"Error fetching odds data: {response.status_code} - {response.text}")
+                    return None
                 
-            # Create OddsOrderbook object from the first (and should be only) event
-            try:
-                odds_orderbook = OddsOrderbook(**data[0])
-                logger.debug(f"Created OddsOrderbook: {odds_orderbook.model_dump_json(indent=2)}")
-                return odds_orderbook
-            except Exception as e:
-                logger.error(f"Failed to create OddsOrderbook: {str(e)}")
-                return None
+                raw_events: Dict[str, Dict[str, Any]] = {}
+                event_filter = self.event_filter.with_event_ids(event_ids)
+                async for event in iter_odds_events(response.aiter_bytes(), event_filter):
+                    if "id" in event:
+                        raw_events[event["id"]] = event
+            
+            self.quota.events_fetched += len(raw_events)
+            logger.debug(f"Fetched {len(raw_events)} {sport} events, quota: {self.quota}")
+            return LazyOddsOrderbooks(raw_events, self._parse_event)
             
         except Exception as e:
             logger.error(f"Failed to fetch odds data: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def _parse_event(self, event: Dict[str, Any]) -> OddsOrderbook:
+        """
+        Builds an OddsOrderbook from a raw event, skipping validation of unchanged bookmakers.
+        
+        A bookmaker whose `last_update` matches the previously parsed one is reused as-is.
+        
+        Args:
+            event: One event from the Odds API response
+            
+        Returns:
+            OddsOrderbook for the event
+        """
+        return parse_odds_event(event, self._bookmakers)
+
+    async def get_multi_sport_odds(self, sports: Iterable[str]) -> Dict[str, Mapping[str, OddsOrderbook]]:
+        """
+        Fetches odds for every event of several sports, one request per sport, in parallel.
+        
+        Args:
+            sports: The sport keys to fetch
+            
+        Returns:
+            Dict of sport key to a mapping of event ID to OddsOrderbook
+        """
+        sports = list(sports)
+        results = await asyncio.gather(*(self.get_sport_odds(sport) for sport in sports))
+        return dict(zip(sports, results))
+
+    async def get_events(self, sport: str) -> List[OddsOrderbook]:
+        """
+        Lists upcoming and live events for a sport, without odds.
+        
+        The `/events` endpoint does not count against the usage quota.
+        
+        Args:
+            sport: The sport key (e.g. "baseball_mlb")
+            
+        Returns:
+            List of OddsOrderbook objects with no bookmakers; empty if the request fails
+        """
+        url = f"{self.base_url}/{sport}/events"
+        
+        try:
+            response = await self.http.get(url, params={"apiKey": self.api_key})
+            if response.status_code != 200:
+                logger.error(f"Error fetching {sport} events: {response.status_code} - {response.text}")
+                return []
+            return [OddsOrderbook(**{**event, "bookmakers": []}) for event in response.json()]
+        except Exception as e:
+            logger.error(f"Failed to fetch {sport} events: {str(e)}")
+            return []
+
+    def _record_quota(self, headers: Mapping[str, str]) -> None:
+        """
+        Updates quota usage from Odds API response headers.
+        
+        Args:
+            headers: The response headers
+        """
+        self.quota.calls_made += 1
+        for header, field in (
+            ("x-requests-remaining", "requests_remaining"),
+            ("x-requests-used", "requests_used"),
+            ("x-requests-last", "last_cost")
+        ):
+            value = headers.get(header)
+            if value is not None:
+                try:
+                    setattr(self.quota, field, int(float(value)))
+                except ValueError:
+                    logger.warning(f"Unexpected {header} header value: {value}")
+        metrics = get_metrics()
+        metrics.inc("odds_requests_total")
+        if self.quota.requests_remaining is not None:
+            metrics.set("odds_requests_remaining", self.quota.requests_remaining)
+        if self.quota.requests_used is not None:
+            metrics.set("odds_requests_used", self.quota.requests_used)
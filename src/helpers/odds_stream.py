@@ -0,0 +1,304 @@
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+import ijson
+from pydantic import ValidationError
+
+from helpers.log_helpers import get_logger
+from helpers.ttl_cache import TTLCache
+from models.odds_orderbook import Bookmaker, OddsOrderbook
+
+logger = get_logger(__name__)
+
+EVENT = "item"
+BOOKMAKER = "item.bookmakers.item"
+MARKET = "item.bookmakers.item.markets.item"
+
+class OddsEventFilter:
+    """Drops events, bookmakers and markets outside a whitelist from raw Odds API events."""
+
+    def __init__(
+        self,
+        bookmakers: Optional[Iterable[str]] = None,
+        markets: Optional[Iterable[str]] = None,
+        event_ids: Optional[Iterable[str]] = None
+    ):
+        """
+        Initialize the filter.
+
+        Args:
+            bookmakers: Bookmaker keys to keep (all when empty or None)
+            markets: Market keys to keep, e.g. "h2h" and "spreads" (all when empty or None)
+            event_ids: Event IDs to keep (all when empty or None)
+        """
+        self.bookmakers: Optional[Set[str]] = set(bookmakers) if bookmakers else None
+        self.markets: Optional[Set[str]] = set(markets) if markets else None
+        self.event_ids: Optional[Set[str]] = set(event_ids) if event_ids else None
+
+    def with_event_ids(self, event_ids: Optional[Iterable[str]]) -> "OddsEventFilter":
+        """Returns a copy of this filter that also keeps only `event_ids` (all when empty or None)."""
+        return OddsEventFilter(self.bookmakers, self.markets, event_ids)
+
+    def rejects(self, prefix: str, key: Any) -> bool:
+        """
+        Returns whether the object at `prefix` of a streamed `/odds` body is dropped, given its
+        `id` (events) or `key` (bookmakers and markets).
+        """
+        if prefix == BOOKMAKER:
+            return self.bookmakers is not None and key not in self.bookmakers
+        if prefix == MARKET:
+            return self.markets is not None and key not in self.markets
+        return self.event_ids is not None and key not in self.event_ids
+
+class _EventBuilder:
+    """
+    Builds raw events from ijson parse events, applying an OddsEventFilter as soon as an
+    event's `id` or a bookmaker's or market's `key` arrives: the rest of a rejected object is
+    skipped token by token without being built.
+    """
+
+    def __init__(self, event_filter: Optional[OddsEventFilter]):
+        self.event_filter = event_filter
+        self.events: List[Dict[str, Any]] = []  # Completed events not yet taken
+        self._stack: List[Any] = []  # Containers being built, outermost (the event) first
+        self._prefixes: List[str] = []
+        self._key: Optional[str] = None
+        self._skip = 0  # Nesting depth inside a rejected object
+
+    def feed(self, tokens: Iterable[Tuple[str, str, Any]]) -> None:
+        """Consumes (prefix, event, value) tokens from ijson.parse."""
+        stack = self._stack
+        for prefix, event, value in tokens:
+            if self._skip:
+                if event == "start_map" or event == "start_array":
+                    self._skip += 1
+                elif event == "end_map" or event == "end_array":
+                    self._skip -= 1
+                continue
+            if not stack and event != "start_map":
+                continue  # The top-level array, or anything in it that is not an event
+            if event == "map_key":
+                self._key = value
+            elif event == "start_map" or event == "start_array":
+                container: Any = {} if event == "start_map" else []
+                if stack:
+                    self._add(container)
+                stack.append(container)
+                self._prefixes.append(prefix)
+            elif event == "end_map" or event == "end_array":
+                container = stack.pop()
+                self._prefixes.pop()
+                if prefix == BOOKMAKER and not container.get("markets") and self._filters_markets():
+                    stack[-1].pop()  # Every market of the bookmaker was rejected
+                elif not stack:
+                    self.events.append(container)
+            else:
+                self._add(value)
+                filtered = self._key == ("id" if len(stack) == 1 else "key")
+                if filtered and self.event_filter is not None and self._prefixes[-1] in (EVENT, BOOKMAKER, MARKET):
+                    if self.event_filter.rejects(self._prefixes[-1], value):
+                        self._reject()
+
+    def _filters_markets(self) -> bool:
+        return self.event_filter is not None and self.event_filter.markets is not None
+
+    def _add(self, value: Any) -> None:
+        parent = self._stack[-1]
+        if isinstance(parent, list):
+            parent.append(value)
+        else:
+            parent[self._key] = value
+
+    def _reject(self) -> None:
+        """Drops the object being built and skips the rest of it."""
+        self._stack.pop()
+        self._prefixes.pop()
+        if self._stack:
+            self._stack[-1].pop()
+        self._skip = 1
+
+async def iter_odds_events(
+    chunks: AsyncIterator[bytes],
+    event_filter: Optional[OddsEventFilter] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Incrementally parses an Odds API `/odds` response body, yielding one event at a time.
+
+    Only the event being parsed is held in memory. Filtering happens while parsing: events,
+    bookmakers and markets the filter rejects are skipped as soon as their `id` or `key`
+    arrives, without building the rest of them.
+
+    Args:
+        chunks: The response body as an async stream of bytes
+        event_filter: Optional event/bookmaker/market whitelist
+
+    Returns:
+        Async iterator of raw event dicts
+    """
+    tokens = ijson.sendable_list()
+    parser = ijson.parse_coro(tokens, use_float=True)
+    builder = _EventBuilder(event_filter)
+    async for chunk in chunks:
+        parser.send(chunk)
+        builder.feed(tokens)
+        del tokens[:]
+        for event in builder.events:
+            yield event
+        del builder.events[:]
+    parser.close()
+    builder.feed(tokens)
+    for event in builder.events:
+        yield event
+
+def parse_odds_event(event: Dict[str, Any], bookmaker_cache: Any) -> OddsOrderbook:
+    """
+    Builds an OddsOrderbook from a raw event, skipping validation of unchanged bookmakers.
+
+    A bookmaker whose `last_update` matches the cached one is reused as-is.
+
+    Args:
+        event: One raw event from the Odds API
+        bookmaker_cache: Cache of parsed bookmakers keyed by (event ID, bookmaker key), with
+            `get` and `set` (e.g. a TTLCache)
+
+    Returns:
+        OddsOrderbook for the event
+    """
+    bookmakers = []
+    for raw_bookmaker in event.get("bookmakers", []):
+        key = (event["id"], raw_bookmaker.get("key"))
+        cached = bookmaker_cache.get(key)
+        if cached is not None and cached[0] == raw_bookmaker.get("last_update"):
+            bookmakers.append(cached[1])
+            continue
+        bookmaker = Bookmaker(**raw_bookmaker)
+        bookmaker_cache.set(key, (raw_bookmaker.get("last_update"), bookmaker))
+        bookmakers.append(bookmaker)
+
+    odds_orderbook = OddsOrderbook(**{**event, "bookmakers": []})
+    odds_orderbook.bookmakers = bookmakers
+    return odds_orderbook
+
+class LazyOddsOrderbooks(Mapping[str, OddsOrderbook]):
+    """
+    Read-only mapping of event ID to OddsOrderbook that validates each event on first access.
+
+    Iterating keys, `in` checks and `len` never run pydantic validation. An event that fails
+    validation is logged once and treated as missing from then on (`get` returns None).
+    """
+
+    def __init__(self, raw_events: Dict[str, Dict[str, Any]], parse: Callable[[Dict[str, Any]], OddsOrderbook]):
+        """
+        Args:
+            raw_events: Raw events keyed by event ID
+            parse: Function building an OddsOrderbook from a raw event
+        """
+        self._raw_events = raw_events
+        self._parse = parse
+        self._parsed: Dict[str, OddsOrderbook] = {}
+        self._invalid: Set[str] = set()
+
+    def __getitem__(self, event_id: str) -> OddsOrderbook:
+        odds_orderbook = self._parsed.get(event_id)
+        if odds_orderbook is None:
+            if event_id in self._invalid:
+                raise KeyError(event_id)
+            try:
+                odds_orderbook = self._parse(self._raw_events[event_id])
+            except ValidationError as e:
+                self._invalid.add(event_id)
+                logger.error(f"Failed to validate odds event {event_id}: {str(e)}")
+                raise KeyError(event_id) from None
+            self._parsed[event_id] = odds_orderbook
+        return odds_orderbook
+
+    def raw(self, event_id: str) -> Dict[str, Any]:
+        """Returns an event as received, without validating it."""
+        return self._raw_events[event_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw_events)
+
+    def __len__(self) -> int:
+        return len(self._raw_events)
+
+    def __contains__(self, event_id: object) -> bool:
+        return event_id in self._raw_events and event_id not in self._invalid
+
+def raw_odds_event(odds: Mapping[str, OddsOrderbook], event_id: str) -> Dict[str, Any]:
+    """
+    Returns one event of an odds response as raw JSON data.
+
+    Events of a LazyOddsOrderbooks are returned as received, without validating them.
+
+    Args:
+        odds: Odds response, as returned by OddsAPIHelper.get_sport_odds
+        event_id: Event ID
+
+    Returns:
+        The raw event dict
+    """
+    if isinstance(odds, LazyOddsOrderbooks):
+        return odds.raw(event_id)
+    return odds[event_id].model_dump(mode="json")
+
+class RawOddsEvents:
+    """
+    The latest raw Odds API event per sport and event ID, served as OddsOrderbooks.
+
+    An event is validated only when it is requested after it changed, reusing its unchanged
+    bookmakers (see `parse_odds_event`); one that fails validation is left out until it changes.
+    """
+
+    def __init__(self, max_bookmakers: int = 4096):
+        """
+        Args:
+            max_bookmakers: Parsed bookmakers kept for reuse
+        """
+        self.events: Dict[str, Dict[str, Dict[str, Any]]] = {}  # Sport -> event ID -> raw event
+        self._parsed: Dict[str, Optional[OddsOrderbook]] = {}  # None for events that failed validation
+        self._bookmakers = TTLCache(ttl_seconds=float("inf"), max_entries=max_bookmakers)
+
+    def set(self, sport: str, event_id: str, event: Dict[str, Any]) -> None:
+        """Makes a raw event the current one for its event ID."""
+        self.events.setdefault(sport, {})[event_id] = event
+        self._parsed.pop(event_id, None)
+
+    def discard(self, sport: str, event_id: str) -> None:
+        """Forgets an event."""
+        self.events.get(sport, {}).pop(event_id, None)
+        self._parsed.pop(event_id, None)
+
+    def retain(self, event_ids: Set[str]) -> None:
+        """Forgets every event not in `event_ids`."""
+        for events in self.events.values():
+            for event_id in [e for e in events if e not in event_ids]:
+                del events[event_id]
+                self._parsed.pop(event_id, None)
+
+    def get(self, sport: str, event_ids: Iterable[str]) -> Dict[str, OddsOrderbook]:
+        """
+        Returns the current events of a sport among `event_ids`.
+
+        Args:
+            sport: The sport key
+            event_ids: Event IDs to look up; unknown ones are left out
+
+        Returns:
+            Dict of event ID to OddsOrderbook
+        """
+        events = self.events.get(sport, {})
+        odds = {}
+        for event_id in event_ids:
+            if event_id not in self._parsed:
+                event = events.get(event_id)
+                if event is None:
+                    continue
+                try:
+                    self._parsed[event_id] = parse_odds_event(event, self._bookmakers)
+                except ValidationError as e:
+                    self._parsed[event_id] = None
+                    logger.error(f"Failed to validate odds event {event_id}: {str(e)}")
+            odds_orderbook = self._parsed[event_id]
+            if odds_orderbook is not None:
+                odds[event_id] = odds_orderbook
+        return odds
@@ -0,0 +1,239 @@
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from helpers.escrow_fetcher import EscrowStateFetcher
+from helpers.log_helpers import get_logger
+from models.escrow import EscrowState
+from models.order import OpenOrder
+
+logger = get_logger(__name__)
+
+LevelKey = Tuple[int, int, int, int]  # (market app ID, position, side, price)
+ExposureKey = Tuple[int, int, int]  # (market app ID, position, side)
+
+class OrderRegistry:
+    """
+    Our own open escrows, indexed for O(1) lookups and persisted to a JSON file.
+
+    Orders are indexed by market and by (market, position, side, price), and the remaining
+    quantity per (market, position, side) is kept as a running total, so cancels, requotes
+    and exposure checks never scan an orderbook. The registry is fed by our own confirmed
+    `create_escrow`/`delete_escrow` calls, by the escrow changes the incremental orderbooks
+    see anyway (fills and deletions by others), and by `reconcile`. Reconciling reads only
+    our escrows, by default just the ones loaded from disk and not seen on chain since.
+
+    Orderbook syncs run in worker threads while confirmations arrive on the event loop, so
+    every read and write of the indexes holds a lock.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the registry and load the persisted orders, if any.
+
+        Args:
+            path: JSON file the registry is kept in; None keeps it in memory only
+        """
+        self.path = path
+        self.orders: Dict[int, OpenOrder] = {}
+        self._by_market: Dict[int, Set[int]] = {}
+        self._by_level: Dict[LevelKey, Set[int]] = {}
+        self._exposure: Dict[ExposureKey, int] = {}
+        self._unchecked: Set[int] = set()  # Loaded from disk and not seen on chain since
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __contains__(self, escrow_app_id: int) -> bool:
+        return escrow_app_id in self.orders
+
+    def get(self, escrow_app_id: int) -> Optional[OpenOrder]:
+        return self.orders.get(escrow_app_id)
+
+    def for_market(self, market_app_id: int) -> List[OpenOrder]:
+        """Returns our open orders on a market."""
+        with self._lock:
+            return [self.orders[app_id] for app_id in self._by_market.get(market_app_id, ())]
+
+    def at_price(self, market_app_id: int, position: int, side: int, price: int) -> List[OpenOrder]:
+        """
+        Returns our open orders resting at one price level.
+
+        Args:
+            market_app_id: The application ID of the market
+            position: 1 for YES, 0 for NO
+            side: 1 for buy, 0 for sell
+            price: Price in micro-units
+        """
+        with self._lock:
+            return [self.orders[app_id] for app_id in self._by_level.get((market_app_id, position, side, price), ())]
+
+    def exposure(self, market_app_id: int, position: int, side: int) -> int:
+        """Returns our unfilled quantity in micro-units on one side of a market position."""
+        return self._exposure.get((market_app_id, position, side), 0)
+
+    def add(self, order: OpenOrder) -> None:
+        """Adds or replaces an order."""
+        with self._lock:
+            self._unindex(order.escrow_app_id)
+            self.orders[order.escrow_app_id] = order
+            self._by_market.setdefault(order.market_app_id, set()).add(order.escrow_app_id)
+            self._by_level.setdefault(self._level_key(order), set()).add(order.escrow_app_id)
+            self._add_exposure(order, 1)
+            self._dirty = True
+
+    def remove(self, escrow_app_id: int) -> Optional[OpenOrder]:
+        """Removes an order, returning it if it was registered."""
+        with self._lock:
+            order = self._unindex(escrow_app_id)
+            if order is not None:
+                self._dirty = True
+            return order
+
+    def update_fill(self, escrow_app_id: int, quantity_filled: int, round_number: int = 0) -> None:
+        """Records an order's filled quantity as read from its escrow's `quantity_filled`."""
+        with self._lock:
+            order = self.orders.get(escrow_app_id)
+            if order is None:
+                return
+            self._unchecked.discard(escrow_app_id)
+            order.checked_round = max(order.checked_round, round_number)
+            if quantity_filled == order.quantity_filled:
+                return
+            self._add_exposure(order, -1)
+            order.quantity_filled = quantity_filled
+            self._add_exposure(order, 1)
+            self._dirty = True
+        logger.debug(f"Escrow {escrow_app_id} filled {quantity_filled}/{order.quantity}")
+
+    def apply_escrow_state(self, escrow_app_id: int, state: Optional[EscrowState]) -> None:
+        """
+        Applies an escrow change seen on chain; ignores escrows that are not ours.
+
+        Args:
+            escrow_app_id: The escrow application ID
+            state: The escrow's decoded state, or None if it was deleted
+        """
+        with self._lock:
+            if escrow_app_id not in self.orders:
+                return
+            if state is None:
+                self.remove(escrow_app_id)
+            else:
+                self.update_fill(escrow_app_id, state.quantity_filled)
+
+    def reconcile(
+        self,
+        fetcher: EscrowStateFetcher,
+        decode_escrow: Callable[[Dict], EscrowState],
+        escrow_app_ids: Optional[Iterable[int]] = None
+    ) -> None:
+        """
+        Re-reads our escrows from the indexer, dropping deleted ones and updating fills.
+
+        Args:
+            fetcher: Fetcher used for escrow state lookups
+            decode_escrow: Function decoding an indexer application record into an EscrowState
+            escrow_app_ids: Escrows to read; defaults to those not seen since they were loaded
+        """
+        with self._lock:
+            app_ids = set(self._unchecked if escrow_app_ids is None else escrow_app_ids) & self.orders.keys()
+        if app_ids:
+            for app_id, app_info in fetcher.fetch_application_ids(app_ids).items():
+                if app_info is None:
+                    continue
+                application = app_info.get("application", {})
+                if application.get("deleted"):
+                    self.remove(app_id)
+                else:
+                    self.update_fill(app_id, decode_escrow(app_info).quantity_filled, app_info.get("current-round", 0))
+            logger.info(f"Reconciled {len(app_ids)} escrows, {len(self.orders)} open orders")
+        self.save_if_dirty()
+
+    def adopt(self, escrows: Iterable[EscrowState], owner: str, round_number: int = 0) -> int:
+        """
+        Registers escrows owned by `owner` from a full orderbook listing, e.g. after the
+        registry file was lost.
+
+        Returns:
+            Number of escrows added
+        """
+        added = 0
+        with self._lock:
+            for state in escrows:
+                if state.app_id in self.orders or state.owner != owner:
+                    continue
+                self.add(OpenOrder(
+                    escrow_app_id=state.app_id,
+                    market_app_id=state.market_app_id,
+                    position=state.position,
+                    side=state.side,
+                    price=state.price,
+                    quantity=state.quantity,
+                    quantity_filled=state.quantity_filled,
+                    slippage=state.slippage,
+                    checked_round=round_number
+                ))
+                added += 1
+        self.save_if_dirty()
+        return added
+
+    def load(self) -> None:
+        """Loads the persisted orders, if there are any; they are unchecked until reconciled."""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+            for record in data.get("orders", []):
+                self.add(OpenOrder(**record))
+            self._unchecked = set(self.orders)
+            self._dirty = False
+            logger.info(f"Loaded {len(self.orders)} open orders from {self.path}")
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.error(f"Failed to load order registry {self.path}: {str(e)}")
+
+    def save(self) -> None:
+        """Writes the registry atomically."""
+        with self._lock:
+            self._dirty = False
+            if self.path is None:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump({"orders": [order.to_dict() for order in self.orders.values()]}, file, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def save_if_dirty(self) -> None:
+        """Writes the registry if it changed since the last write."""
+        with self._lock:
+            if self._dirty:
+                self.save()
+
+    @staticmethod
+    def _level_key(order: OpenOrder) -> LevelKey:
+        return order.market_app_id, order.position, order.side, order.price
+
+    def _add_exposure(self, order: OpenOrder, sign: int) -> None:
+        """Adds (sign 1) or subtracts (sign -1) an order's remaining quantity from its exposure total."""
+        key = (order.market_app_id, order.position, order.side)
+        self._exposure[key] = self._exposure.get(key, 0) + sign * max(0, order.remaining)
+
+    def _unindex(self, escrow_app_id: int) -> Optional[OpenOrder]:
+        """Takes an order out of every index."""
+        order = self.orders.pop(escrow_app_id, None)
+        if order is None:
+            return None
+        for index, key in ((self._by_market, order.market_app_id), (self._by_level, self._level_key(order))):
+            app_ids = index.get(key)
+            if app_ids is not None:
+                app_ids.discard(escrow_app_id)
+                if not app_ids:
+                    del index[key]
+        self._add_exposure(order, -1)
+        self._unchecked.discard(escrow_app_id)
+        return order
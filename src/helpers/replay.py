@@ -0,0 +1,185 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from helpers.capture import CaptureReader, CaptureRecord
+from helpers.log_helpers import get_logger
+from helpers.odds_stream import RawOddsEvents
+from helpers.scanner import ArbitrageScanner
+from models.market import MarketCore
+from models.odds_orderbook import OddsOrderbook
+from models.orderbook import OrderBook
+from models.signal import EdgeSignal, PairQuote, ReplayStats, ScanPair
+
+logger = get_logger(__name__)
+
+class ReplayDataSource:
+    """
+    Scanner data source serving the latest captured value of every market, event and orderbook.
+
+    Records are applied in capture order with `apply`. Odds events are validated only when
+    the scanner asks for them after they changed (see RawOddsEvents), and each orderbook is
+    built once per captured change.
+    """
+
+    def __init__(self):
+        self.markets: Dict[str, MarketCore] = {}
+        self.orderbooks: Dict[int, OrderBook] = {}
+        self.odds = RawOddsEvents()
+        self.now: Optional[float] = None  # Capture time being replayed, epoch seconds
+
+    def apply(self, record: CaptureRecord) -> None:
+        """Makes a captured record the current value of its market, event or orderbook."""
+        if record.kind == "orderbook":
+            orderbook = OrderBook(levels=record.value)
+            orderbook.timestamp = datetime.fromtimestamp(record.ts)
+            self.orderbooks[record.key] = orderbook
+        elif record.kind == "odds":
+            sport, event_id = record.key
+            if record.value is None:
+                self.odds.discard(sport, event_id)
+            else:
+                self.odds.set(sport, event_id, record.value)
+        elif record.kind == "market":
+            self.markets[record.key] = record.value
+
+    async def get_market(self, market_id: str) -> Optional[MarketCore]:
+        return self.markets.get(market_id)
+
+    async def get_sport_odds(self, sport: str, event_ids: List[str]) -> Mapping[str, OddsOrderbook]:
+        return self.odds.get(sport, event_ids)
+
+    async def get_orderbook(self, market_app_id: int) -> Optional[OrderBook]:
+        return self.orderbooks.get(market_app_id)
+
+class ReplayEngine:
+    """
+    Feeds captured market data through ArbitrageScanner, faster than real time.
+
+    Capture time is split into `interval_seconds` ticks. Records captured during a tick are
+    applied to a ReplayDataSource and the scanner then runs one tick over them, exactly as it
+    does live. With `skip_unchanged` (the default) ticks in which nothing was captured are
+    skipped: the scanner would see the same inputs as on the previous tick, so only repeats
+    of already emitted signals are lost, and idle hours cost nothing. Signals are stamped with
+    the capture time of their tick, and so are quotes.
+    """
+
+    def __init__(
+        self,
+        reader: CaptureReader,
+        pairs: Optional[Iterable[ScanPair]] = None,
+        interval_seconds: float = 5.0,
+        speed: Optional[float] = None,
+        skip_unchanged: bool = True,
+        on_signal: Optional[Callable[[EdgeSignal], Any]] = None,
+        on_quotes: Optional[Callable[[List[PairQuote]], Any]] = None,
+        **scanner_options: Any
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            reader: Reader over the capture to replay
+            pairs: Pairs to scan; by default the pairs captured alongside the data are used,
+                changing whenever they changed live
+            interval_seconds: Capture time between ticks
+            speed: Optional pacing, in capture seconds per wall second; None replays as fast
+                as possible
+            skip_unchanged: Whether to skip ticks in which no record was captured
+            on_signal: Optional callback (plain or async) invoked for every signal
+            on_quotes: Optional callback (plain or async) invoked with every tick's quotes, e.g.
+                TimeSeriesStore.ingest to backfill history
+            **scanner_options: Passed to ArbitrageScanner (edge_threshold, devig_method, ...)
+        """
+        self.reader = reader
+        self.interval_seconds = interval_seconds
+        self.speed = speed
+        self.skip_unchanged = skip_unchanged
+        self.on_signal = on_signal
+        self.on_quotes = on_quotes
+        self.source = ReplayDataSource()
+        self.fixed_pairs = pairs is not None
+        self.scanner = ArbitrageScanner(
+            pairs=pairs or [],
+            source=self.source,
+            on_signal=self._stamp_signal,
+            on_quotes=self._stamp_quotes if on_quotes is not None else None,
+            **scanner_options
+        )
+        self.stats = ReplayStats()
+        self._wall_start = 0.0
+
+    async def run(self) -> ReplayStats:
+        """
+        Replays the whole capture (or the reader's time range).
+
+        Returns:
+            ReplayStats totals
+        """
+        self.stats = ReplayStats()
+        self._wall_start = time.perf_counter()
+        next_tick: Optional[float] = None
+        changed = False
+
+        for record in self.reader.records():
+            if next_tick is None:
+                next_tick = record.ts + self.interval_seconds
+                self.stats.first_ts = record.ts
+            while record.ts >= next_tick:
+                if changed or not self.skip_unchanged:
+                    await self._tick(next_tick)
+                    changed = False
+                next_tick += self.interval_seconds
+                if self.skip_unchanged and record.ts >= next_tick:
+                    # Jump over the idle ticks to the one this record falls in
+                    next_tick += (record.ts - next_tick) // self.interval_seconds * self.interval_seconds
+            self._apply(record)
+            changed = True
+
+        if changed and next_tick is not None:
+            await self._tick(next_tick)
+        self.stats.wall_seconds = time.perf_counter() - self._wall_start
+        logger.info(
+            f"Replayed {self.stats.records} records in {self.stats.ticks} ticks: {self.stats.signals} signals "
+            f"in {self.stats.wall_seconds:.1f}s ({self.stats.speedup:.0f}x real time)"
+        )
+        return self.stats
+
+    def _apply(self, record: CaptureRecord) -> None:
+        """Applies one record to the source, or to the scanner's pairs."""
+        self.stats.records += 1
+        self.stats.last_ts = record.ts
+        if record.kind == "pairs":
+            if not self.fixed_pairs:
+                self.scanner.set_pairs(record.value)
+        else:
+            self.source.apply(record)
+
+    async def _tick(self, ts: float) -> None:
+        """Runs one scanner tick at capture time `ts`."""
+        if self.speed:
+            delay = (ts - self.stats.first_ts) / self.speed - (time.perf_counter() - self._wall_start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self.source.now = ts
+        await self.scanner.tick()
+        self.stats.ticks += 1
+
+    async def _stamp_signal(self, signal: EdgeSignal) -> None:
+        """Stamps a signal with the capture time and hands it to `on_signal`."""
+        signal.timestamp = datetime.fromtimestamp(self.source.now)
+        self.stats.signals += 1
+        if self.on_signal is not None:
+            result = self.on_signal(signal)
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def _stamp_quotes(self, quotes: List[PairQuote]) -> None:
+        """Stamps a tick's quotes with the capture time and hands them to `on_quotes`."""
+        timestamp = datetime.fromtimestamp(self.source.now)
+        for quote in quotes:
+            quote.timestamp = timestamp
+        result = self.on_quotes(quotes)
+        if asyncio.iscoroutine(result):
+            await result
@@ -0,0 +1,377 @@
+import asyncio
+import json
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from helpers.data_formatter import DataFormatter
+from helpers.log_helpers import get_logger
+from helpers.metrics import get_metrics
+from models.market import MarketCore
+from models.odds_orderbook import OddsOrderbook
+from models.orderbook import MICRO_UNIT, OrderBook
+from models.signal import EdgeSignal, PairQuote, ScanPair, TickStats
+
+logger = get_logger(__name__)
+
+def load_scan_pairs(path: str) -> List[ScanPair]:
+    """
+    Loads scan pairs from a JSON file holding a list of ScanPair objects.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        List of ScanPair
+    """
+    with open(path, 'r') as file:
+        return [ScanPair(**pair) for pair in json.load(file)]
+
+def finish_tick(stats: TickStats, start: float, signals: int) -> None:
+    """Completes a tick's stats, records its metrics and logs its summary."""
+    stats.duration_ms = (time.perf_counter() - start) * 1000
+    stats.signals = signals
+    pair_times = {k: v for k, v in stats.source_ms.items() if k.startswith("pair:")}
+    if pair_times:
+        stats.slowest_pair = max(pair_times, key=pair_times.get)[len("pair:"):]
+    metrics = get_metrics()
+    metrics.observe("scanner_tick_seconds", stats.duration_ms / 1000)
+    metrics.inc("scanner_signals_total", stats.signals)
+    metrics.inc("scanner_pairs_skipped_total", stats.pairs_skipped)
+    logger.info(
+        f"Tick: {stats.pairs_scanned} pairs scanned, {stats.pairs_skipped} skipped, "
+        f"{stats.signals} signals in {stats.duration_ms:.1f} ms (slowest {stats.slowest_pair})"
+    )
+
+async def run_ticks(tick: Callable[[], Awaitable[Any]], interval_seconds: float, max_ticks: Optional[int] = None) -> None:
+    """
+    Calls `tick` every `interval_seconds` until cancelled (or `max_ticks` ticks have run).
+
+    Ticks start on a fixed schedule; a tick that overruns the interval delays the next
+    one instead of overlapping it.
+
+    Args:
+        tick: Coroutine function running one tick
+        interval_seconds: Seconds between tick starts
+        max_ticks: Optional number of ticks after which to stop
+    """
+    ticks = 0
+    next_tick = time.monotonic()
+    while max_ticks is None or ticks < max_ticks:
+        await tick()
+        ticks += 1
+        next_tick += interval_seconds
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            logger.warning(f"Tick overran the {interval_seconds}s interval by {-delay:.2f}s")
+            next_tick = time.monotonic()
+
+class LiveDataSource:
+    """Data source backed by the live Alpha, Algorand indexer and Odds APIs."""
+
+    def __init__(self, alpha: Any, odds: Any):
+        """
+        Args:
+            alpha: AlphaHelper used for market info and orderbooks
+            odds: OddsAPIHelper used for bookmaker odds
+        """
+        self.alpha = alpha
+        self.odds = odds
+        self._orderbook_calls: Dict[int, "asyncio.Future[Optional[OrderBook]]"] = {}
+
+    async def get_market(self, market_id: str) -> Optional[MarketCore]:
+        # Only immutable fields (app ID, fee rate) are read, no need to refresh volatile ones
+        return await self.alpha.get_market_core(market_id, refresh_volatile=False)
+
+    async def get_sport_odds(self, sport: str, event_ids: List[str]) -> Mapping[str, OddsOrderbook]:
+        return await self.odds.get_sport_odds(sport, event_ids=event_ids)
+
+    async def get_orderbook(self, market_app_id: int) -> Optional[OrderBook]:
+        # The indexer client is blocking, keep it off the event loop. A timed out call keeps
+        # running in its thread, so the next tick awaits it again instead of starting a second
+        # sync of the same book
+        call = self._orderbook_calls.get(market_app_id)
+        if call is None:
+            call = asyncio.ensure_future(asyncio.to_thread(self.alpha.get_orderbook, market_app_id))
+            self._orderbook_calls[market_app_id] = call
+            call.add_done_callback(lambda _: self._orderbook_calls.pop(market_app_id, None))
+        return await asyncio.shield(call)
+
+class ArbitrageScanner:
+    """
+    Compares de-vigged bookmaker fair value with the Alpha top of book for many pairs per tick.
+
+    Within a tick, odds are fetched once per sport and each pair's orderbook is fetched in its
+    own task, so a pair is evaluated as soon as its own inputs arrive. Every source call has a
+    timeout; when it expires the previous value is reused if there is one, otherwise the pair
+    is skipped for that tick. A pair whose orderbook fetch fails is skipped too.
+    """
+
+    def __init__(
+        self,
+        pairs: Iterable[ScanPair],
+        source: Any,
+        edge_threshold: float = 0.02,
+        devig_method: str = "multiplicative",
+        source_timeout: float = 5.0,
+        on_signal: Optional[Callable[[EdgeSignal], Any]] = None,
+        on_quotes: Optional[Callable[[List[PairQuote]], Any]] = None
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            pairs: Alpha market / Odds API event pairs to scan
+            source: Data source exposing get_market, get_sport_odds and get_orderbook coroutines
+            edge_threshold: Minimum edge, in probability points after fees, to emit a signal
+            devig_method: De-vig method passed to DataFormatter.consensus_fair_probabilities
+            source_timeout: Seconds to wait for any single source call
+            on_signal: Optional callback (plain or async) invoked for every signal as soon as it is found
+            on_quotes: Optional callback (plain or async) invoked after every tick with the quotes
+                of the pairs evaluated in it
+        """
+        self.pairs = list(pairs)
+        self.source = source
+        self.edge_threshold = edge_threshold
+        self.devig_method = devig_method
+        self.source_timeout = source_timeout
+        self.on_signal = on_signal
+        self.on_quotes = on_quotes
+
+        self.markets: Dict[str, MarketCore] = {}
+        self.quotes: Dict[str, PairQuote] = {}  # Latest quote per market ID
+        self._last_orderbooks: Dict[str, OrderBook] = {}
+        self._last_odds: Dict[str, Mapping[str, OddsOrderbook]] = {}
+        self.last_tick: Optional[TickStats] = None
+
+    def set_pairs(self, pairs: Iterable[ScanPair]) -> None:
+        """
+        Replaces the pairs to scan from the next tick on, dropping cached data for removed markets.
+
+        Args:
+            pairs: Alpha market / Odds API event pairs to scan
+        """
+        self.pairs = list(pairs)
+        market_ids = {pair.market_id for pair in self.pairs}
+        for cache in (self.markets, self._last_orderbooks, self.quotes):
+            for market_id in [m for m in cache if m not in market_ids]:
+                del cache[market_id]
+
+    async def _timed(self, name: str, stats: TickStats, call: Awaitable[Any]) -> Any:
+        """Awaits a source call with the timeout, recording its latency; returns None on timeout."""
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(call, self.source_timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts.append(name)
+            logger.warning(f"Timed out after {self.source_timeout}s waiting for {name}")
+            return None
+        finally:
+            stats.source_ms[name] = (time.perf_counter() - start) * 1000
+
+    async def _market(self, pair: ScanPair, stats: TickStats) -> Optional[MarketCore]:
+        """Returns the pair's market, fetching it on first use."""
+        market = self.markets.get(pair.market_id)
+        if market is None:
+            market = await self._timed(f"market:{pair.market_id}", stats, self.source.get_market(pair.market_id))
+            if market is None or market.marketAppId is None:
+                return None
+            self.markets[pair.market_id] = market
+        return market
+
+    async def _sport_odds(self, sport: str, event_ids: List[str], stats: TickStats) -> Mapping[str, OddsOrderbook]:
+        """Fetches one sport's odds, falling back to the previous response on timeout."""
+        odds = await self._timed(f"odds:{sport}", stats, self.source.get_sport_odds(sport, event_ids))
+        if odds:
+            self._last_odds[sport] = odds
+            return odds
+        return self._last_odds.get(sport, {})
+
+    async def _orderbook(self, pair: ScanPair, stats: TickStats) -> Optional[OrderBook]:
+        """Fetches a pair's orderbook, falling back to the previous one on timeout."""
+        market = await self._market(pair, stats)
+        if market is None:
+            return None
+        name = f"orderbook:{pair.market_id}"
+        orderbook = await self._timed(name, stats, self.source.get_orderbook(market.marketAppId))
+        if orderbook is not None:
+            self._last_orderbooks[pair.market_id] = orderbook
+            return orderbook
+        if name in stats.timeouts:
+            return self._last_orderbooks.get(pair.market_id)
+        # The fetch failed, and the source dropped its copy of the book: skip the pair
+        self._last_orderbooks.pop(pair.market_id, None)
+        return None
+
+    async def _scan_pair(
+        self,
+        pair: ScanPair,
+        odds_task: "asyncio.Task",
+        stats: TickStats,
+        quotes: List[PairQuote]
+    ) -> List[EdgeSignal]:
+        """Waits for one pair's inputs and evaluates it, appending its quote to `quotes`."""
+        start = time.perf_counter()
+        orderbook, odds = await asyncio.gather(self._orderbook(pair, stats), odds_task)
+        odds_orderbook = odds.get(pair.event_id) if odds else None
+        if orderbook is None or odds_orderbook is None:
+            stats.pairs_skipped += 1
+            return []
+
+        signals = self.evaluate(pair, odds_orderbook, orderbook, self.markets.get(pair.market_id))
+        stats.pairs_scanned += 1
+        quote = self.quotes.get(pair.market_id)
+        if quote is not None:
+            quotes.append(quote)
+        stats.source_ms[f"pair:{pair.market_id}"] = (time.perf_counter() - start) * 1000
+        for signal in signals:
+            logger.info(
+                f"Edge {signal.edge:.4f} on {pair.market_id}: {'buy' if signal.side else 'sell'} "
+                f"{'YES' if signal.position else 'NO'} at {signal.price} (fair {signal.fair_probability:.4f})"
+            )
+            if self.on_signal is not None:
+                result = self.on_signal(signal)
+                if asyncio.iscoroutine(result):
+                    await result
+        return signals
+
+    def evaluate(
+        self,
+        pair: ScanPair,
+        odds_orderbook: OddsOrderbook,
+        orderbook: OrderBook,
+        market: Optional[MarketCore] = None
+    ) -> List[EdgeSignal]:
+        """
+        Compares fair value with the top of book on both positions, and keeps the pair's quote.
+
+        Buying at the ask has edge `fair - ask - fee`; selling at the bid has edge
+        `bid - fair - fee`, where the fee is feeBasePercent * p * (1 - p) per contract.
+        The quote (fair value, best YES bid and ask) replaces the pair's entry in `quotes`.
+
+        Args:
+            pair: The pair being evaluated
+            odds_orderbook: The bookmaker odds for the pair's event
+            orderbook: The Alpha orderbook for the pair's market
+            market: The Alpha market, for its fee rate
+
+        Returns:
+            List of EdgeSignal objects above the threshold
+        """
+        fair = DataFormatter.consensus_fair_probabilities(odds_orderbook, "h2h", self.devig_method)
+        fair_yes = fair.get(pair.yes_outcome)
+        if fair_yes is None:
+            logger.warning(f"Outcome {pair.yes_outcome} not quoted for event {pair.event_id}")
+            self.quotes.pop(pair.market_id, None)
+            return []
+
+        # Best level per (position, level side): level side 1 holds bids, 0 asks
+        tops = {
+            (position, level_side): orderbook.levels.levels(position, level_side).best()
+            for position in (1, 0) for level_side in (1, 0)
+        }
+        self.quotes[pair.market_id] = self._quote(pair, fair_yes, tops)
+
+        fee_rate = (market.feeBasePercent or 0) / MICRO_UNIT if market is not None else 0.0
+        signals = []
+        for position, fair_probability in ((1, fair_yes), (0, 1.0 - fair_yes)):
+            for side in (1, 0):
+                best = tops[(position, 1 - side)]
+                if best is None:
+                    continue
+                price = best[0] / MICRO_UNIT
+                fee = fee_rate * price * (1 - price)
+                edge = (fair_probability - price if side == 1 else price - fair_probability) - fee
+                if edge >= self.edge_threshold:
+                    signals.append(EdgeSignal(
+                        market_id=pair.market_id,
+                        event_id=pair.event_id,
+                        position=position,
+                        side=side,
+                        price=price,
+                        quantity=best[1] / MICRO_UNIT,
+                        fair_probability=fair_probability,
+                        fee=fee,
+                        edge=edge
+                    ))
+        return signals
+
+    @staticmethod
+    def _quote(pair: ScanPair, fair_yes: float, tops: Dict[Tuple[int, int], Optional[Tuple[int, int]]]) -> PairQuote:
+        """Builds a pair's quote; a NO bid at p is a YES ask at 1 - p and vice versa."""
+        bids, asks = [], []
+        if tops[(1, 1)]:
+            bids.append(tops[(1, 1)][0])
+        if tops[(0, 0)]:
+            bids.append(MICRO_UNIT - tops[(0, 0)][0])
+        if tops[(1, 0)]:
+            asks.append(tops[(1, 0)][0])
+        if tops[(0, 1)]:
+            asks.append(MICRO_UNIT - tops[(0, 1)][0])
+        return PairQuote(
+            market_id=pair.market_id,
+            event_id=pair.event_id,
+            fair=fair_yes,
+            bid=max(bids) / MICRO_UNIT if bids else None,
+            ask=min(asks) / MICRO_UNIT if asks else None
+        )
+
+    async def tick(self) -> List[EdgeSignal]:
+        """
+        Runs one scan over every pair.
+
+        Returns:
+            All signals found during the tick
+        """
+        stats = TickStats(started_at=datetime.now())
+        start = time.perf_counter()
+        pairs = self.pairs
+        quotes: List[PairQuote] = []
+
+        events_by_sport: Dict[str, List[str]] = defaultdict(list)
+        for pair in pairs:
+            events_by_sport[pair.sport].append(pair.event_id)
+        odds_tasks = {
+            sport: asyncio.ensure_future(self._sport_odds(sport, event_ids, stats))
+            for sport, event_ids in events_by_sport.items()
+        }
+
+        results = await asyncio.gather(
+            *(self._scan_pair(pair, odds_tasks[pair.sport], stats, quotes) for pair in pairs),
+            return_exceptions=True
+        )
+
+        signals: List[EdgeSignal] = []
+        for pair, result in zip(pairs, results):
+            if isinstance(result, BaseException):
+                stats.pairs_skipped += 1
+                logger.error(f"Failed to scan market {pair.market_id}: {result}")
+            else:
+                signals.extend(result)
+
+        finish_tick(stats, start, len(signals))
+        self.last_tick = stats
+        if self.on_quotes is not None and quotes:
+            try:
+                result = self.on_quotes(quotes)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Failed to handle tick quotes: {str(e)}")
+        return signals
+
+    async def run(self, interval_seconds: float, max_ticks: Optional[int] = None) -> None:
+        """
+        Scans every `interval_seconds` until cancelled (or `max_ticks` ticks have run).
+
+        Ticks start on a fixed schedule; a tick that overruns the interval delays the next
+        one instead of overlapping it.
+
+        Args:
+            interval_seconds: Seconds between tick starts
+            max_ticks: Optional number of ticks after which to stop
+        """
+        await run_ticks(self.tick, interval_seconds, max_ticks)
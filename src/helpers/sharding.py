@@ -0,0 +1,400 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from helpers.alpha_helper import AlphaHelper
+from helpers.log_helpers import LogReceiver, configure_logging, forward_logs, get_logger
+from helpers.odds_stream import RawOddsEvents, raw_odds_event
+from helpers.scanner import ArbitrageScanner, LiveDataSource, finish_tick, run_ticks
+from models.market import MarketCore
+from models.odds_orderbook import OddsOrderbook
+from models.orderbook import OrderBook
+from models.signal import EdgeSignal, PairQuote, ScanPair, TickStats
+
+logger = get_logger(__name__)
+
+def live_shard_source(market_volatile_ttl_seconds: float = 30.0) -> LiveDataSource:
+    """
+    Builds a worker's market and orderbook source: its own AlphaHelper, so each worker owns
+    the incremental orderbooks and market caches of its markets. Odds come from the coordinator.
+
+    Args:
+        market_volatile_ttl_seconds: Passed to AlphaHelper
+    """
+    return LiveDataSource(AlphaHelper(market_volatile_ttl_seconds=market_volatile_ttl_seconds), odds=None)
+
+class ShardDataSource:
+    """Scanner data source of a worker: markets and orderbooks from its own source, odds as sent by the coordinator."""
+
+    def __init__(self, source: Any):
+        """
+        Args:
+            source: Data source exposing get_market and get_orderbook coroutines
+        """
+        self.source = source
+        self.odds = RawOddsEvents()
+
+    async def get_market(self, market_id: str) -> Optional[MarketCore]:
+        return await self.source.get_market(market_id)
+
+    async def get_sport_odds(self, sport: str, event_ids: List[str]) -> Mapping[str, OddsOrderbook]:
+        return self.odds.get(sport, event_ids)
+
+    async def get_orderbook(self, market_app_id: int) -> Optional[OrderBook]:
+        return await self.source.get_orderbook(market_app_id)
+
+def _worker_main(
+    conn: Any,
+    source_factory: Callable[[], Any],
+    scanner_options: Dict[str, Any],
+    log_queue: Any,
+    log_level: Optional[str],
+    log_sample_rates: str
+) -> None:
+    """Entry point of a worker process."""
+    forward_logs(log_queue)
+    configure_logging(level=log_level, sample_rates=log_sample_rates)
+    asyncio.run(_serve(conn, source_factory, scanner_options))
+
+async def _serve(conn: Any, source_factory: Callable[[], Any], scanner_options: Dict[str, Any]) -> None:
+    """
+    Runs a worker's scanner on the coordinator's messages until told to stop:
+    ("pairs", pairs), ("tick", raw events by sport and event ID, whether to return quotes)
+    and ("stop",). Each tick is answered with ("ok", signals, quotes, TickStats) or ("error", message).
+    """
+    source = ShardDataSource(source_factory())
+    quotes: List[PairQuote] = []
+    scanner = ArbitrageScanner(pairs=[], source=source, on_quotes=quotes.extend, **scanner_options)
+    while True:
+        message = await asyncio.to_thread(conn.recv)
+        if message[0] == "stop":
+            break
+        if message[0] == "pairs":
+            scanner.set_pairs(message[1])
+            source.odds.retain({pair.event_id for pair in message[1]})
+        elif message[0] == "tick":
+            _, events, want_quotes = message
+            for sport, raw_events in events.items():
+                for event_id, event in raw_events.items():
+                    if event is None:
+                        source.odds.discard(sport, event_id)
+                    else:
+                        source.odds.set(sport, event_id, event)
+            quotes.clear()
+            try:
+                signals = await scanner.tick()
+                conn.send(("ok", signals, list(quotes) if want_quotes else [], scanner.last_tick))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    conn.close()
+
+class _Shard:
+    """A worker process and the coordinator's view of its pairs and of the odds it holds."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[Any] = None
+        self.conn: Optional[Any] = None
+        self.pairs: List[ScanPair] = []
+        self.pairs_changed = True
+        self.sent: Dict[str, Any] = {}  # Event ID -> raw event last sent
+        # A queue per worker, so a worker dying mid-record cannot stall the others' logs
+        self.log_receiver: Optional[LogReceiver] = None
+
+class ShardedScanner:
+    """
+    Runs ArbitrageScanner over pairs partitioned across a pool of worker processes.
+
+    Decoding escrow state, aggregating orderbooks and validating odds are CPU-bound, so a
+    single process saturates one core once hundreds of markets are tracked. Each worker runs
+    its own scanner over its share of the pairs, with a data source built in the worker by
+    `source_factory`, so it owns its markets' orderbooks and caches. A market stays on its
+    worker when the pairs change; new markets go to the least loaded worker.
+
+    The coordinator fetches odds once per sport and tick, so the Odds API quota does not grow
+    with the number of workers, and sends each worker only the raw events of its pairs that
+    changed; the workers validate them. Workers' signals, quotes and tick stats are merged in
+    the coordinator, which runs `on_signal` and `on_quotes` once all workers have answered.
+    Worker logs are written by the coordinator. A worker that dies, or does not answer within
+    `REPLY_TIMEOUT_FACTOR` source timeouts, is restarted, and its pairs are skipped for that tick.
+    """
+
+    # A worker's tick waits on a market and an orderbook call per pair, each with its own timeout
+    REPLY_TIMEOUT_FACTOR = 3
+
+    def __init__(
+        self,
+        pairs: Iterable[ScanPair],
+        odds: Any,
+        source_factory: Callable[[], Any],
+        workers: Optional[int] = None,
+        edge_threshold: float = 0.02,
+        devig_method: str = "multiplicative",
+        source_timeout: float = 5.0,
+        on_signal: Optional[Callable[[EdgeSignal], Any]] = None,
+        on_quotes: Optional[Callable[[List[PairQuote]], Any]] = None,
+        log_level: Optional[str] = None,
+        log_sample_rates: str = ""
+    ):
+        """
+        Initialize the scanner; workers start on the first tick (or `start`).
+
+        Args:
+            pairs: Alpha market / Odds API event pairs to scan
+            odds: Odds source exposing a get_sport_odds coroutine (e.g. OddsAPIHelper)
+            source_factory: Picklable callable run in each worker to build its market and
+                orderbook source (e.g. functools.partial(live_shard_source, ...))
+            workers: Number of worker processes; defaults to the number of CPUs
+            edge_threshold: Minimum edge, in probability points after fees, to emit a signal
+            devig_method: De-vig method passed to DataFormatter.consensus_fair_probabilities
+            source_timeout: Seconds to wait for any single source call
+            on_signal: Optional callback (plain or async) invoked for every signal
+            on_quotes: Optional callback (plain or async) invoked after every tick with the
+                quotes of the pairs evaluated in it
+            log_level: Log level applied in the workers
+            log_sample_rates: Log sample rates applied in the workers (see configure_logging)
+        """
+        self.pairs = list(pairs)
+        self.odds = odds
+        self.source_factory = source_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.source_timeout = source_timeout
+        self.on_signal = on_signal
+        self.on_quotes = on_quotes
+        self.log_level = log_level
+        self.log_sample_rates = log_sample_rates
+        self.scanner_options = {
+            "edge_threshold": edge_threshold,
+            "devig_method": devig_method,
+            "source_timeout": source_timeout
+        }
+        self.last_tick: Optional[TickStats] = None
+
+        self._context = multiprocessing.get_context("spawn")
+        self._shards = [_Shard(index) for index in range(self.workers)]
+        self._assignment: Dict[str, int] = {}  # Market ID -> shard index
+        self._last_odds: Dict[str, Mapping[str, OddsOrderbook]] = {}
+        self._started = False
+        self._assign()
+
+    async def start(self) -> None:
+        """Starts the worker processes."""
+        if self._started:
+            return
+        self._started = True
+        for shard in self._shards:
+            self._spawn(shard)
+        logger.info(f"Started {self.workers} scan workers")
+
+    def set_pairs(self, pairs: Iterable[ScanPair]) -> None:
+        """
+        Replaces the pairs to scan from the next tick on.
+
+        Args:
+            pairs: Alpha market / Odds API event pairs to scan
+        """
+        self.pairs = list(pairs)
+        self._assign()
+
+    async def tick(self) -> List[EdgeSignal]:
+        """
+        Runs one scan over every pair, across the workers.
+
+        Returns:
+            All signals found during the tick
+        """
+        await self.start()
+        stats = TickStats(started_at=datetime.now())
+        start = time.perf_counter()
+
+        events_by_sport: Dict[str, List[str]] = defaultdict(list)
+        for pair in self.pairs:
+            events_by_sport[pair.sport].append(pair.event_id)
+        sports = list(events_by_sport)
+        results = await asyncio.gather(*(self._sport_odds(sport, events_by_sport[sport], stats) for sport in sports))
+        odds = dict(zip(sports, results))
+
+        active = [shard for shard in self._shards if shard.pairs and self._dispatch(shard, odds, stats)]
+        reply_timeout = self.source_timeout * self.REPLY_TIMEOUT_FACTOR
+        replies = await asyncio.gather(
+            *(asyncio.to_thread(self._receive, shard, reply_timeout) for shard in active),
+            return_exceptions=True
+        )
+
+        signals: List[EdgeSignal] = []
+        quotes: List[PairQuote] = []
+        for shard, reply in zip(active, replies):
+            if isinstance(reply, TimeoutError):
+                logger.error(f"Scan worker {shard.index} did not answer within {reply_timeout}s, restarting it")
+                stats.timeouts.append(f"worker:{shard.index}")
+                stats.pairs_skipped += len(shard.pairs)
+                self._restart(shard)
+                continue
+            if isinstance(reply, BaseException):
+                logger.error(f"Scan worker {shard.index} died ({reply!r}), restarting it")
+                stats.pairs_skipped += len(shard.pairs)
+                self._restart(shard)
+                continue
+            if reply[0] == "error":
+                logger.error(f"Scan worker {shard.index} failed its tick: {reply[1]}")
+                stats.pairs_skipped += len(shard.pairs)
+                continue
+            _, shard_signals, shard_quotes, shard_stats = reply
+            signals.extend(shard_signals)
+            quotes.extend(shard_quotes)
+            stats.pairs_scanned += shard_stats.pairs_scanned
+            stats.pairs_skipped += shard_stats.pairs_skipped
+            stats.source_ms.update(shard_stats.source_ms)
+            stats.timeouts.extend(shard_stats.timeouts)
+
+        finish_tick(stats, start, len(signals))
+        self.last_tick = stats
+        if self.on_signal is not None:
+            for signal in signals:
+                await self._notify(self.on_signal, signal)
+        if self.on_quotes is not None and quotes:
+            await self._notify(self.on_quotes, quotes)
+        return signals
+
+    async def run(self, interval_seconds: float, max_ticks: Optional[int] = None) -> None:
+        """
+        Scans every `interval_seconds` until cancelled (or `max_ticks` ticks have run).
+
+        Args:
+            interval_seconds: Seconds between tick starts
+            max_ticks: Optional number of ticks after which to stop
+        """
+        await run_ticks(self.tick, interval_seconds, max_ticks)
+
+    async def close(self) -> None:
+        """Stops the worker processes."""
+        for shard in self._shards:
+            if shard.conn is not None:
+                try:
+                    shard.conn.send(("stop",))
+                except OSError:
+                    pass
+        for shard in self._shards:
+            if shard.process is not None:
+                await asyncio.to_thread(shard.process.join, 5.0)
+                if shard.process.is_alive():
+                    shard.process.terminate()
+                shard.conn.close()
+                shard.process = shard.conn = None
+            if shard.log_receiver is not None:
+                await asyncio.to_thread(shard.log_receiver.stop)
+                shard.log_receiver = None
+        self._started = False
+
+    @staticmethod
+    async def _notify(callback: Callable[[Any], Any], value: Any) -> None:
+        """Invokes a plain or async result callback, logging its errors."""
+        try:
+            result = callback(value)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.error(f"Failed to handle tick results: {str(e)}")
+
+    def _assign(self) -> None:
+        """Partitions the pairs across the shards, keeping markets on the shard they were on."""
+        market_ids = {pair.market_id for pair in self.pairs}
+        for market_id in [m for m in self._assignment if m not in market_ids]:
+            del self._assignment[market_id]
+        loads = [0] * len(self._shards)
+        for index in self._assignment.values():
+            loads[index] += 1
+        shard_pairs: List[List[ScanPair]] = [[] for _ in self._shards]
+        for pair in self.pairs:
+            index = self._assignment.get(pair.market_id)
+            if index is None:
+                index = self._assignment[pair.market_id] = loads.index(min(loads))
+                loads[index] += 1
+            shard_pairs[index].append(pair)
+        for shard, pairs in zip(self._shards, shard_pairs):
+            if pairs != shard.pairs:
+                shard.pairs = pairs
+                shard.pairs_changed = True
+
+    def _spawn(self, shard: _Shard) -> None:
+        """Starts a shard's worker process; it gets the shard's pairs and odds on the next tick."""
+        parent, child = self._context.Pipe()
+        log_queue = self._context.Queue()
+        shard.log_receiver = LogReceiver(log_queue)
+        shard.process = self._context.Process(
+            target=_worker_main,
+            args=(child, self.source_factory, self.scanner_options, log_queue, self.log_level, self.log_sample_rates),
+            name=f"scan-worker-{shard.index}",
+            daemon=True
+        )
+        shard.process.start()
+        child.close()
+        shard.conn = parent
+        shard.pairs_changed = True
+        shard.sent = {}
+
+    @staticmethod
+    def _receive(shard: _Shard, timeout: float) -> Any:
+        """Waits for a shard's reply (in a thread); raises TimeoutError if none arrives in time."""
+        if not shard.conn.poll(timeout):
+            raise TimeoutError
+        return shard.conn.recv()
+
+    def _restart(self, shard: _Shard) -> None:
+        if shard.process is not None and shard.process.is_alive():
+            shard.process.terminate()
+        if shard.conn is not None:
+            shard.conn.close()
+        if shard.log_receiver is not None:
+            shard.log_receiver.stop(timeout=0.0)
+        self._spawn(shard)
+
+    def _dispatch(self, shard: _Shard, odds: Dict[str, Mapping[str, OddsOrderbook]], stats: TickStats) -> bool:
+        """Sends a shard its pairs (if changed) and the odds events that changed; False if it is gone."""
+        updates: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        for pair in shard.pairs:
+            sport_odds = odds.get(pair.sport, {})
+            if pair.event_id in sport_odds:
+                event = raw_odds_event(sport_odds, pair.event_id)
+            elif pair.event_id in shard.sent:
+                event = None  # No longer quoted
+            else:
+                continue
+            # Cached odds responses keep their raw events, so an unchanged event is the same object
+            if shard.sent.get(pair.event_id) is not event:
+                updates[pair.sport][pair.event_id] = event
+                if event is None:
+                    del shard.sent[pair.event_id]
+                else:
+                    shard.sent[pair.event_id] = event
+        try:
+            if shard.pairs_changed:
+                shard.conn.send(("pairs", shard.pairs))
+                shard.pairs_changed = False
+            shard.conn.send(("tick", dict(updates), self.on_quotes is not None))
+            return True
+        except OSError as e:
+            logger.error(f"Scan worker {shard.index} is gone ({e!r}), restarting it")
+            stats.pairs_skipped += len(shard.pairs)
+            self._restart(shard)
+            return False
+
+    async def _sport_odds(self, sport: str, event_ids: List[str], stats: TickStats) -> Mapping[str, OddsOrderbook]:
+        """Fetches one sport's odds, falling back to the previous response on timeout."""
+        start = time.perf_counter()
+        odds = None
+        try:
+            odds = await asyncio.wait_for(self.odds.get_sport_odds(sport, event_ids), self.source_timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts.append(f"odds:{sport}")
+            logger.warning(f"Timed out after {self.source_timeout}s waiting for odds:{sport}")
+        finally:
+            stats.source_ms[f"odds:{sport}"] = (time.perf_counter() - start) * 1000
+        if odds:
+            self._last_odds[sport] = odds
+            return odds
+        return self._last_odds.get(sport, {})
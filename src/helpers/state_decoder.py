@@ -0,0 +1,75 @@
+import base64
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from helpers.log_helpers import get_logger
+from models.escrow import EscrowState
+
+logger = get_logger(__name__)
+
+ESCROW_APP_SPEC_PATH = Path(__file__).parent.parent / 'app_specs' / 'escrow_app_spec.json'
+
+class EscrowStateDecoder:
+    """
+    Global-state decoder for escrow apps, precompiled from the escrow app spec.
+
+    The declared global-state keys are base64-encoded once up front, so decoding an escrow
+    is a dict lookup per state item: known keys go straight into an EscrowState slot, unknown
+    keys are skipped and bytes values are never UTF-8 decoded.
+    """
+
+    def __init__(self, schema: Dict[str, Dict[str, Any]]):
+        """
+        Initialize the decoder.
+
+        Args:
+            schema: The `schema.global.declared` section of the escrow app spec
+        """
+        self._fields: Dict[str, Tuple[str, bool]] = {}
+        for name, declared in schema.items():
+            slot = "_owner_b64" if name == "owner" else declared.get("key", name)
+            if slot not in EscrowState.__slots__:
+                logger.warning(f"Escrow state key {name} has no EscrowState field, it will be skipped")
+                continue
+            encoded_key = base64.b64encode(declared.get("key", name).encode()).decode()
+            self._fields[encoded_key] = (slot, declared["type"] == "bytes")
+
+    @classmethod
+    def from_app_spec(cls, spec_path: Optional[Path] = None) -> "EscrowStateDecoder":
+        """
+        Builds a decoder from an escrow app spec JSON file.
+
+        Args:
+            spec_path: Path to the app spec (defaults to app_specs/escrow_app_spec.json)
+
+        Returns:
+            EscrowStateDecoder for the declared global state
+        """
+        with open(spec_path or ESCROW_APP_SPEC_PATH, 'r') as file:
+            spec = json.load(file)
+        return cls(spec["schema"]["global"]["declared"])
+
+    def decode(self, app_info: Dict[str, Any]) -> EscrowState:
+        """
+        Decodes an escrow application record.
+
+        Args:
+            app_info: Application info from the indexer, either `{"application": {...}}` or the bare record
+
+        Returns:
+            EscrowState holding the known global-state fields
+        """
+        application = app_info.get("application", app_info)
+        state = EscrowState(application.get("id", 0))
+        fields = self._fields
+
+        for item in application.get("params", {}).get("global-state", ()):
+            field = fields.get(item["key"])
+            if field is None:
+                continue
+            slot, is_bytes = field
+            value = item["value"]
+            setattr(state, slot, value.get("bytes") if is_bytes else value.get("uint", 0))
+
+        return state
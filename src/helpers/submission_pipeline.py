@@ -0,0 +1,351 @@
+import asyncio
+import base64
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import msgpack
+from algosdk import abi
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    AtomicTransactionResponse,
+)
+from algosdk.error import AlgodHTTPError
+
+from helpers.log_helpers import get_logger
+from helpers.metrics import get_metrics
+from models.order import SubmissionHandle, SubmissionStatus
+
+logger = get_logger(__name__)
+
+class SubmissionPipeline:
+    """
+    Sends signed transaction groups without waiting for them to confirm.
+
+    `submit` returns a SubmissionHandle as soon as algod has accepted the group. A single
+    background task follows new blocks with `status_after_block` and, for each new round,
+    reads the block's transaction IDs once and settles every in-flight group found in it,
+    so confirmation cost does not grow with the number of groups in flight. ABI return
+    values of the groups confirmed in a round are decoded from one fetch of that block.
+    Groups the node dropped from its pool never show up in a block, so every
+    `POOL_CHECK_ROUNDS` rounds the unconfirmed ones are checked for a `pool-error`. The task
+    sleeps while nothing is in flight. Callables in `confirm_listeners` are called with
+    the handle, composer and response of every confirmed group.
+    """
+
+    MAX_BLOCK_TXIDS_FAILURES = 3
+    POOL_CHECK_ROUNDS = 10
+
+    def __init__(self, algod_client: Any, history_size: int = 1000):
+        """
+        Initialize the pipeline.
+
+        Args:
+            algod_client: An algosdk AlgodClient
+            history_size: Number of settled handles kept in `confirmed` and `failed`
+        """
+        self.algod_client = algod_client
+        self.in_flight: Dict[str, SubmissionHandle] = {}
+        self.confirmed: Deque[SubmissionHandle] = deque(maxlen=history_size)
+        self.failed: Deque[SubmissionHandle] = deque(maxlen=history_size)
+        self.last_round: Optional[int] = None
+        self.confirm_listeners: List[
+            Callable[[SubmissionHandle, AtomicTransactionComposer, AtomicTransactionResponse], None]
+        ] = []
+
+        self._composers: Dict[str, AtomicTransactionComposer] = {}
+        self._rounds_left: Dict[str, int] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._block_txids_failures = 0
+
+    async def submit(
+        self,
+        atc: AtomicTransactionComposer,
+        label: str = "",
+        wait_rounds: Optional[int] = None
+    ) -> SubmissionHandle:
+        """
+        Signs and sends a transaction group and returns without waiting for confirmation.
+
+        Args:
+            atc: The built transaction group
+            label: Free-form description used in logs
+            wait_rounds: Rounds after submission after which the group is reported failed
+                if it has not confirmed (defaults to its last valid round)
+
+        Returns:
+            SubmissionHandle whose `done` future resolves to the AtomicTransactionResponse
+
+        Raises:
+            AlgodHTTPError: If algod rejects the group
+        """
+        await asyncio.to_thread(self._sign_and_send, atc)
+
+        handle = SubmissionHandle(
+            label=label,
+            tx_ids=list(atc.tx_ids),
+            last_valid_round=min(txn.txn.last_valid_round for txn in atc.txn_list),
+            submitted_at=time.time(),
+            done=asyncio.get_running_loop().create_future()
+        )
+        self.in_flight[handle.tx_id] = handle
+        self._composers[handle.tx_id] = atc
+        if wait_rounds is not None:
+            self._rounds_left[handle.tx_id] = wait_rounds
+        self._ensure_tracking()
+        metrics = get_metrics()
+        metrics.inc("algorand_groups_submitted_total")
+        metrics.set("algorand_groups_in_flight", len(self.in_flight))
+        logger.debug(f"Submitted {label or 'group'} ({len(handle.tx_ids)} txns), txID: {handle.tx_id}")
+        return handle
+
+    def _sign_and_send(self, atc: AtomicTransactionComposer) -> None:
+        """Signs and sends a group; runs in a worker thread."""
+        self.algod_client.send_transactions(atc.gather_signatures())
+
+    async def wait(self, handle: SubmissionHandle) -> AtomicTransactionResponse:
+        """
+        Waits for a submitted group to settle.
+
+        Returns:
+            AtomicTransactionResponse with the confirmed round and ABI results
+
+        Raises:
+            RuntimeError: If the group failed to confirm
+        """
+        return await handle.done
+
+    def summary(self) -> Dict[str, int]:
+        """Counts of in-flight groups and recently settled ones."""
+        return {
+            "in_flight": len(self.in_flight),
+            "confirmed": len(self.confirmed),
+            "failed": len(self.failed),
+            "last_round": self.last_round or 0
+        }
+
+    async def close(self) -> None:
+        """Stops the tracking task; groups still in flight are left unresolved."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _ensure_tracking(self) -> None:
+        """Starts the tracking task if needed and wakes it up."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # The first submission on an event loop (re)starts the tracking task on it
+            self._wakeup = asyncio.Event()
+            self.last_round = None
+            self._task = loop.create_task(self._track())
+        self._wakeup.set()
+
+    async def _track(self) -> None:
+        """Follows new rounds while groups are in flight and settles them."""
+        while True:
+            if not self.in_flight:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                self.last_round = None
+
+            try:
+                if self.last_round is None:
+                    # A group sent just before this status call may already be in the latest round
+                    status = await asyncio.to_thread(self.algod_client.status)
+                    self.last_round = status["last-round"] - 1
+                status = await asyncio.to_thread(self.algod_client.status_after_block, self.last_round)
+                current_round = status["last-round"]
+                for round_number in range(self.last_round + 1, current_round + 1):
+                    await self._settle_round(round_number)
+                rounds_advanced = current_round - self.last_round
+                self.last_round = current_round
+                self._expire(current_round, rounds_advanced)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to track pending transactions: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def _settle_round(self, round_number: int) -> None:
+        """Settles every in-flight group confirmed in a round."""
+        if not self.in_flight:
+            return
+        confirmed, infos = await self._confirmed_in_round(round_number)
+        if confirmed:
+            await asyncio.gather(*(
+                self._confirm(self.in_flight[tx_id], confirmed_round, infos)
+                for tx_id, confirmed_round in confirmed.items()
+            ))
+
+    async def _confirmed_in_round(self, round_number: int) -> Tuple[Dict[str, int], Dict[str, Dict[str, Any]]]:
+        """
+        Finds the in-flight groups confirmed by a round, from one block lookup if possible.
+
+        Returns:
+            Tuple of (dict of group ID to confirmed round, transaction info already read per
+            transaction ID, for decoding ABI results)
+        """
+        if self._block_txids_failures < self.MAX_BLOCK_TXIDS_FAILURES:
+            try:
+                block = await asyncio.to_thread(self.algod_client.get_block_txids, round_number)
+                self._block_txids_failures = 0
+                block_txids = block.get("blockTxids") or []
+                confirmed = {tx_id: round_number for tx_id in set(block_txids) & self.in_flight.keys()}
+                infos = await self._block_infos(round_number, block_txids, confirmed) if confirmed else {}
+                if round_number % self.POOL_CHECK_ROUNDS == 0:
+                    pending = [tx_id for tx_id in self.in_flight if tx_id not in confirmed]
+                    if pending:
+                        pending_confirmed, pending_infos = await self._pending_confirmations(pending)
+                        confirmed.update(pending_confirmed)
+                        infos.update(pending_infos)
+                return confirmed, infos
+            except AlgodHTTPError as e:
+                # Older nodes lack the endpoint; after a few failures in a row stop trying it
+                self._block_txids_failures += 1
+                logger.warning(f"Block txids lookup failed, polling pending transactions instead: {str(e)}")
+
+        return await self._pending_confirmations(list(self.in_flight))
+
+    async def _pending_confirmations(self, tx_ids: List[str]) -> Tuple[Dict[str, int], Dict[str, Dict[str, Any]]]:
+        """
+        Reads the pending transaction info of in-flight groups, failing the ones rejected by the pool.
+
+        Returns:
+            Tuple of (dict of group ID to confirmed round for the groups already confirmed,
+            their transaction info)
+        """
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.algod_client.pending_transaction_info, tx_id) for tx_id in tx_ids),
+            return_exceptions=True
+        )
+        confirmed: Dict[str, int] = {}
+        infos: Dict[str, Dict[str, Any]] = {}
+        for tx_id, info in zip(tx_ids, results):
+            if isinstance(info, BaseException) or tx_id not in self.in_flight:
+                continue
+            if info.get("pool-error"):
+                self._fail(self.in_flight[tx_id], f"Transaction rejected: {info['pool-error']}")
+            elif info.get("confirmed-round"):
+                confirmed[tx_id] = info["confirmed-round"]
+                infos[tx_id] = info
+        return confirmed, infos
+
+    async def _block_infos(
+        self,
+        round_number: int,
+        block_txids: List[str],
+        confirmed: Dict[str, int]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Reads the logs of the confirmed groups' ABI method calls from one fetch of the block.
+
+        The block's transactions are in the same order as its transaction IDs. Nothing is
+        fetched when no confirmed group calls a method with a return value.
+
+        Returns:
+            Dict of transaction ID to transaction info holding `logs`, as pending transaction
+            info does; empty if the block could not be read
+        """
+        wanted = {
+            atc.tx_ids[method_index]
+            for atc in (self._composers.get(tx_id) for tx_id in confirmed) if atc is not None
+            for method_index, method in atc.method_dict.items() if method.returns.type != abi.Returns.VOID
+        }
+        if not wanted:
+            return {}
+        try:
+            raw = await asyncio.to_thread(self.algod_client.block_info, round_number, response_format="msgpack")
+            txns = msgpack.unpackb(raw, raw=True, strict_map_key=False)[b"block"].get(b"txns") or []
+        except Exception as e:
+            logger.warning(f"Failed to read block {round_number}, reading results one by one instead: {str(e)}")
+            return {}
+        if len(txns) != len(block_txids):
+            logger.warning(f"Block {round_number} has {len(txns)} transactions for {len(block_txids)} IDs")
+            return {}
+        return {
+            tx_id: {
+                "confirmed-round": round_number,
+                "logs": [base64.b64encode(log).decode() for log in txn.get(b"dt", {}).get(b"lg", [])]
+            }
+            for tx_id, txn in zip(block_txids, txns) if tx_id in wanted
+        }
+
+    async def _confirm(self, handle: SubmissionHandle, round_number: int, infos: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Marks a group confirmed and resolves its ABI return values.
+
+        Results are decoded from `infos` (read from the block or while polling); only a
+        method call with a return value missing from it is read with pending transaction info.
+        """
+        atc = self._composers.get(handle.tx_id)
+        results = []
+        for method_index, method in atc.method_dict.items():
+            tx_id = atc.tx_ids[method_index]
+            try:
+                info = infos.get(tx_id)
+                if info is None:
+                    if method.returns.type == abi.Returns.VOID:
+                        info = {"confirmed-round": round_number}
+                    else:
+                        info = await asyncio.to_thread(self.algod_client.pending_transaction_info, tx_id)
+                results.append(atc.parse_result(method, tx_id, info))
+            except Exception as e:
+                logger.error(f"Failed to read result of {tx_id}: {str(e)}")
+                results.append(None)
+
+        handle.status = SubmissionStatus.CONFIRMED
+        handle.confirmed_round = round_number
+        handle.confirmed_at = time.time()
+        self._settle(handle)
+        self.confirmed.append(handle)
+        metrics = get_metrics()
+        metrics.inc("algorand_groups_confirmed_total")
+        metrics.observe("algorand_confirm_seconds", handle.confirmed_at - handle.submitted_at)
+        response = AtomicTransactionResponse(
+            confirmed_round=round_number,
+            tx_ids=handle.tx_ids,
+            results=results
+        )
+        for listener in self.confirm_listeners:
+            try:
+                listener(handle, atc, response)
+            except Exception as e:
+                logger.error(f"Confirm listener failed for {handle.tx_id}: {str(e)}")
+        if not handle.done.done():
+            handle.done.set_result(response)
+        logger.debug(f"Confirmed {handle.label or 'group'} {handle.tx_id} in round {round_number}")
+
+    def _expire(self, current_round: int, rounds_advanced: int) -> None:
+        """Fails groups past their last valid round or out of rounds to wait."""
+        for handle in list(self.in_flight.values()):
+            if current_round > handle.last_valid_round:
+                self._fail(handle, f"Transaction {handle.tx_id} expired at round {handle.last_valid_round}")
+            elif handle.tx_id in self._rounds_left:
+                self._rounds_left[handle.tx_id] -= rounds_advanced
+                if self._rounds_left[handle.tx_id] <= 0:
+                    self._fail(handle, f"Wait for transaction id {handle.tx_id} timed out")
+
+    def _fail(self, handle: SubmissionHandle, error: str) -> None:
+        """Marks a group failed."""
+        handle.status = SubmissionStatus.FAILED
+        handle.error = error
+        self._settle(handle)
+        self.failed.append(handle)
+        get_metrics().inc("algorand_groups_failed_total")
+        if not handle.done.done():
+            handle.done.set_exception(RuntimeError(error))
+            # Handles are often not awaited; mark the exception retrieved so asyncio does not warn
+            handle.done.exception()
+        logger.warning(f"{handle.label or 'Group'} failed: {error}")
+
+    def _settle(self, handle: SubmissionHandle) -> None:
+        """Stops tracking a group."""
+        self.in_flight.pop(handle.tx_id, None)
+        self._composers.pop(handle.tx_id, None)
+        self._rounds_left.pop(handle.tx_id, None)
+        get_metrics().set("algorand_groups_in_flight", len(self.in_flight))
@@ -0,0 +1,72 @@
+from typing import Dict, Tuple
+
+# Curated nicknames and colors per team, keyed by Odds API team name. Nicknames are the only
+# short names market topics are matched on (besides full names), so they must be unambiguous
+# within a league. Colors (primary first) are compared with a market's yes/noTeamColor to
+# tell which team is YES. Teams of other leagues match on their full name only, and their
+# markets need YES/NO share text naming a team.
+TEAM_NICKNAMES: Dict[str, Tuple[str, ...]] = {
+    "Arizona Diamondbacks": ("Diamondbacks", "D-backs"),
+    "Atlanta Braves": ("Braves",),
+    "Baltimore Orioles": ("Orioles",),
+    "Boston Red Sox": ("Red Sox",),
+    "Chicago Cubs": ("Cubs",),
+    "Chicago White Sox": ("White Sox",),
+    "Cincinnati Reds": ("Reds",),
+    "Cleveland Guardians": ("Guardians",),
+    "Colorado Rockies": ("Rockies",),
+    "Detroit Tigers": ("Tigers",),
+    "Houston Astros": ("Astros",),
+    "Kansas City Royals": ("Royals",),
+    "Los Angeles Angels": ("Angels",),
+    "Los Angeles Dodgers": ("Dodgers",),
+    "Miami Marlins": ("Marlins",),
+    "Milwaukee Brewers": ("Brewers",),
+    "Minnesota Twins": ("Twins",),
+    "New York Mets": ("Mets",),
+    "New York Yankees": ("Yankees",),
+    "Oakland Athletics": ("Athletics",),
+    "Philadelphia Phillies": ("Phillies",),
+    "Pittsburgh Pirates": ("Pirates",),
+    "San Diego Padres": ("Padres",),
+    "San Francisco Giants": ("Giants",),
+    "Seattle Mariners": ("Mariners",),
+    "St. Louis Cardinals": ("Cardinals",),
+    "Tampa Bay Rays": ("Rays",),
+    "Texas Rangers": ("Rangers",),
+    "Toronto Blue Jays": ("Blue Jays",),
+    "Washington Nationals": ("Nationals",),
+}
+
+TEAM_COLORS: Dict[str, Tuple[str, ...]] = {
+    "Arizona Diamondbacks": ("#A71930", "#E3D4AD", "#30CED8"),
+    "Atlanta Braves": ("#CE1141", "#13274F"),
+    "Baltimore Orioles": ("#DF4601", "#000000"),
+    "Boston Red Sox": ("#BD3039", "#0C2340"),
+    "Chicago Cubs": ("#0E3386", "#CC3433"),
+    "Chicago White Sox": ("#27251F", "#C4CED4"),
+    "Cincinnati Reds": ("#C6011F", "#000000"),
+    "Cleveland Guardians": ("#00385D", "#E50022"),
+    "Colorado Rockies": ("#333366", "#C4CED4"),
+    "Detroit Tigers": ("#0C2340", "#FA4616"),
+    "Houston Astros": ("#002D62", "#EB6E1F"),
+    "Kansas City Royals": ("#004687", "#BD9B60"),
+    "Los Angeles Angels": ("#BA0021", "#003263"),
+    "Los Angeles Dodgers": ("#005A9C", "#EF3E42"),
+    "Miami Marlins": ("#00A3E0", "#EF3340", "#000000"),
+    "Milwaukee Brewers": ("#12284B", "#FFC52F"),
+    "Minnesota Twins": ("#002B5C", "#D31145"),
+    "New York Mets": ("#002D72", "#FF5910"),
+    "New York Yankees": ("#003087", "#E4002C", "#0C2340"),
+    "Oakland Athletics": ("#003831", "#EFB21E"),
+    "Philadelphia Phillies": ("#E81828", "#002D72"),
+    "Pittsburgh Pirates": ("#27251F", "#FDB827"),
+    "San Diego Padres": ("#2F241D", "#FFC425"),
+    "San Francisco Giants": ("#FD5A1E", "#27251F"),
+    "Seattle Mariners": ("#0C2C56", "#005C5C"),
+    "St. Louis Cardinals": ("#C41E3A", "#0C2340"),
+    "Tampa Bay Rays": ("#092C5C", "#8FBCE6"),
+    "Texas Rangers": ("#003278", "#C0111F"),
+    "Toronto Blue Jays": ("#134A8E", "#1D2D5C"),
+    "Washington Nationals": ("#AB0003", "#14225A"),
+}
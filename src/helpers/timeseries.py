@@ -0,0 +1,490 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from helpers.log_helpers import get_logger
+from helpers.metrics import timed
+from models.orderbook import MICRO_UNIT
+from models.signal import PairQuote
+
+logger = get_logger(__name__)
+
+DAY = 86_400
+ID_CHUNK = 500  # Series IDs per IN (...) clause, well under SQLite's bound parameter limit
+RAW_TS_UNIT = 1000  # Raw rows are keyed in milliseconds, so ticks less than a second apart both stay
+
+class Tier(NamedTuple):
+    """One resolution of the store: raw ticks (resolution 0) or fixed-size buckets."""
+    resolution: int  # Bucket size in seconds, 0 for raw ticks
+    retention_seconds: int
+    partition_seconds: int  # Time span of one table; retention drops whole tables
+
+DEFAULT_TIERS = (
+    Tier(0, 2 * DAY, DAY),
+    Tier(60, 30 * DAY, 7 * DAY),
+    Tier(3600, 400 * DAY, 90 * DAY),
+)
+
+class QuotePoint(NamedTuple):
+    """
+    A pair's quote at one tick or over one bucket, as YES probabilities.
+
+    For buckets, `bid`, `ask` and `fair` are the last values in the bucket, `mid` and
+    `fair_avg` averages, and `mid_min`/`mid_max` the range of the midpoint.
+    """
+    ts: float  # Tick time (to the millisecond) or bucket start, epoch seconds
+    bid: Optional[float]
+    ask: Optional[float]
+    mid: Optional[float]
+    fair: float
+    fair_avg: float
+    mid_min: Optional[float]
+    mid_max: Optional[float]
+    samples: int
+
+class _Batch(NamedTuple):
+    """Buffered quotes taken out of a store to be written in one transaction."""
+    series: List[Tuple[int, str, str]]  # New (series ID, market ID, event ID) rows
+    raw: Dict[str, List[Tuple[Any, ...]]]  # Table -> raw rows
+    buckets: Dict[Tuple[str, int, int], List[Any]]  # (table, series, bucket) -> delta row
+    quotes: int
+    first_ts: float
+
+class QuoteSummary(NamedTuple):
+    """Averages of a pair's quotes over a time range."""
+    samples: int
+    mid: Optional[float]  # Average midpoint, over the ticks with both sides quoted
+    fair: float  # Average fair value
+    gap: Optional[float]  # Average of midpoint - fair value, over the ticks with both sides quoted
+
+RAW_COLUMNS = "series_id INTEGER NOT NULL, ts INTEGER NOT NULL, bid INTEGER, ask INTEGER, fair INTEGER NOT NULL"
+BUCKET_COLUMNS = (
+    "series_id INTEGER NOT NULL, ts INTEGER NOT NULL, n INTEGER NOT NULL, mid_n INTEGER NOT NULL, "
+    "mid_sum INTEGER, mid_min INTEGER, mid_max INTEGER, gap_sum INTEGER, fair_sum INTEGER NOT NULL, "
+    "bid INTEGER, ask INTEGER, fair INTEGER NOT NULL"
+)
+# Buckets are flushed as deltas and merged into the stored row, so a bucket can be flushed many times
+BUCKET_UPSERT = (
+    "INSERT INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (series_id, ts) DO UPDATE SET n = n + excluded.n, mid_n = mid_n + excluded.mid_n, "
+    "mid_sum = coalesce(mid_sum + excluded.mid_sum, mid_sum, excluded.mid_sum), "
+    "mid_min = coalesce(min(mid_min, excluded.mid_min), mid_min, excluded.mid_min), "
+    "mid_max = coalesce(max(mid_max, excluded.mid_max), mid_max, excluded.mid_max), "
+    "gap_sum = coalesce(gap_sum + excluded.gap_sum, gap_sum, excluded.gap_sum), "
+    "fair_sum = fair_sum + excluded.fair_sum, bid = excluded.bid, ask = excluded.ask, fair = excluded.fair"
+)
+
+def _micro(value: Optional[float]) -> Optional[int]:
+    return None if value is None else round(value * MICRO_UNIT)
+
+def _probability(value: Optional[float]) -> Optional[float]:
+    return None if value is None else value / MICRO_UNIT
+
+class TimeSeriesStore:
+    """
+    Embedded SQLite history of every pair's top of book and de-vigged fair value.
+
+    Quotes are kept at several resolutions (tiers): raw ticks and time buckets holding the
+    tick count, sums and range of the midpoint and fair value, and the last bid, ask and fair
+    value. Buckets are downsampled as quotes arrive, in memory, and flushed with the raw rows
+    in one transaction, so no query ever has to roll rows up after the fact. Prices are stored
+    as micro-unit integers.
+
+    Each tier is partitioned into one table per `partition_seconds`, keyed by (series, time)
+    (milliseconds for raw ticks, bucket start seconds otherwise) and stored without row IDs,
+    so a range query over a market is an index seek, and retention drops whole tables instead
+    of deleting rows. Queries pick the finest tier that still covers the range and keeps the
+    number of points bounded.
+
+    On an event loop, use `ingest_async` and `flush_async`: the buffer is swapped out on the
+    loop and written to SQLite in a worker thread, so a flush never blocks a scan tick.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        tiers: Sequence[Tier] = DEFAULT_TIERS,
+        flush_seconds: float = 10.0,
+        tick_seconds: float = 5.0
+    ):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            path: SQLite database file
+            tiers: Resolutions to keep, finest first; the first one should be raw ticks
+            flush_seconds: Age of the oldest buffered quote after which the buffer is written,
+                on ingest or by `flush_if_due`/`flush_async` (see `flush_periodically`)
+            tick_seconds: Expected time between raw ticks, used to estimate query sizes
+        """
+        self.path = path
+        self.tiers = sorted(tiers, key=lambda tier: tier.resolution)
+        self.flush_seconds = flush_seconds
+        self.tick_seconds = tick_seconds
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS series (id INTEGER PRIMARY KEY, market_id TEXT NOT NULL UNIQUE, event_id TEXT)"
+        )
+        self.db.commit()
+        self._series: Dict[str, int] = {
+            market_id: series_id for series_id, market_id in self.db.execute("SELECT id, market_id FROM series")
+        }
+        self._next_series_id = max(self._series.values(), default=0) + 1
+        self._tables = {
+            name for (name,) in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        self._write_lock = threading.Lock()  # One transaction at a time, from the loop or a worker thread
+        self._flush_lock = asyncio.Lock()  # Keeps async flushes in buffer order
+
+        self._new_series: List[Tuple[int, str, str]] = []  # Series registered since the last flush
+        self._raw: Dict[str, List[Tuple[Any, ...]]] = {}  # Table -> raw rows
+        self._buckets: Dict[Tuple[str, int, int], List[Any]] = {}  # (table, series, bucket) -> delta row
+        self._pending = 0
+        self._first_ts: Optional[float] = None
+        self._buffered_at: Optional[float] = None  # Monotonic time the oldest buffered quote arrived
+        self._last_ts: Optional[float] = None
+        self._retention_checked: Optional[int] = None  # Shortest partition retention was last enforced in
+        self.rows_written = 0
+
+    def ingest(self, quotes: Iterable[PairQuote]) -> None:
+        """
+        Buffers quotes (typically one tick's) and downsamples them into every bucket tier,
+        writing the buffer once it spans `flush_seconds`.
+
+        Args:
+            quotes: Quotes to store; their timestamps are the tick times
+        """
+        if self._buffer(quotes):
+            self.flush()
+
+    async def ingest_async(self, quotes: Iterable[PairQuote]) -> None:
+        """Like `ingest`, but writes the buffer in a worker thread (see `flush_async`)."""
+        if self._buffer(quotes):
+            await self.flush_async()
+
+    def _buffer(self, quotes: Iterable[PairQuote]) -> bool:
+        """Buffers quotes and returns whether the buffer now spans `flush_seconds` of ticks."""
+        ts = None
+        tick_ts = None
+        raw_ts = 0
+        targets: List[Tuple[str, Optional[int]]] = []  # (table, bucket start) per tier
+        for quote in quotes:
+            ts = quote.timestamp.timestamp()
+            if ts != tick_ts:
+                # Quotes of one tick share their timestamp, and so their tables and buckets
+                tick_ts = ts
+                raw_ts = round(ts * RAW_TS_UNIT)
+                second = int(ts)
+                targets = [(self._table(tier, second), second - second % tier.resolution if tier.resolution else None)
+                           for tier in self.tiers]
+            series_id = self._series_id(quote)
+            bid, ask, fair = _micro(quote.bid), _micro(quote.ask), _micro(quote.fair)
+            mid = (bid + ask) // 2 if bid is not None and ask is not None else None
+
+            for table, bucket in targets:
+                if bucket is None:
+                    self._raw.setdefault(table, []).append((series_id, raw_ts, bid, ask, fair))
+                    continue
+                key = (table, series_id, bucket)
+                row = self._buckets.get(key)
+                if row is None:
+                    # n, mid_n, mid_sum, mid_min, mid_max, gap_sum, fair_sum, bid, ask, fair
+                    row = self._buckets[key] = [0, 0, None, None, None, None, 0, None, None, None]
+                row[0] += 1
+                row[6] += fair
+                row[7], row[8], row[9] = bid, ask, fair
+                if mid is not None:
+                    row[1] += 1
+                    row[2] = mid if row[2] is None else row[2] + mid
+                    row[3] = mid if row[3] is None else min(row[3], mid)
+                    row[4] = mid if row[4] is None else max(row[4], mid)
+                    row[5] = mid - fair if row[5] is None else row[5] + mid - fair
+            self._pending += 1
+            if self._first_ts is None:
+                self._first_ts = ts
+                self._buffered_at = time.monotonic()
+        if ts is not None:
+            self._last_ts = ts if self._last_ts is None else max(self._last_ts, ts)
+        return ts is not None and ts - self._first_ts >= self.flush_seconds
+
+    def flush_due(self) -> bool:
+        """Returns whether the oldest buffered quote has waited `flush_seconds`."""
+        return bool(self._pending) and time.monotonic() - self._buffered_at >= self.flush_seconds
+
+    def flush_if_due(self) -> None:
+        """Writes the buffer once its oldest quote has waited `flush_seconds`, even with no new ticks."""
+        if self.flush_due():
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes buffered raw rows and bucket deltas in one transaction, then enforces retention."""
+        batch = self._take()
+        if batch is not None:
+            self._write(batch)
+
+    async def flush_async(self) -> None:
+        """
+        Like `flush`, but writes in a worker thread. The buffer is taken on the calling loop,
+        so quotes ingested while the write runs go into the next batch.
+        """
+        batch = self._take()
+        if batch is None:
+            return
+        async with self._flush_lock:
+            await asyncio.to_thread(self._write, batch)
+
+    def _take(self) -> Optional[_Batch]:
+        """Swaps out the buffer, or returns None if it is empty."""
+        if not self._pending:
+            return None
+        batch = _Batch(self._new_series, self._raw, self._buckets, self._pending, self._first_ts)
+        self._new_series = []
+        self._raw = {}
+        self._buckets = {}
+        self._pending = 0
+        self._first_ts = None
+        self._buffered_at = None
+        return batch
+
+    @timed("timeseries_flush_seconds")
+    def _write(self, batch: _Batch) -> None:
+        """Writes a batch in one transaction, then enforces retention."""
+        with self._write_lock:
+            with self.db:
+                self.db.executemany("INSERT INTO series (id, market_id, event_id) VALUES (?, ?, ?)", batch.series)
+                for table, rows in batch.raw.items():
+                    self._create(table)
+                    self.db.executemany(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?)", rows)
+                by_table: Dict[str, List[Tuple[Any, ...]]] = {}
+                for (table, series_id, bucket), row in batch.buckets.items():
+                    by_table.setdefault(table, []).append((series_id, bucket, *row))
+                for table, rows in by_table.items():
+                    self._create(table)
+                    self.db.executemany(BUCKET_UPSERT.format(table=table), rows)
+            self.rows_written += batch.quotes
+
+            # Partitions can only expire when a new one starts
+            period = int(batch.first_ts) // min(tier.partition_seconds for tier in self.tiers)
+            if period != self._retention_checked:
+                self.enforce_retention()
+                self._retention_checked = period
+
+    def close(self) -> None:
+        """Writes the buffered quotes and closes the database."""
+        self.flush()
+        with self._write_lock:
+            self.db.close()
+
+    def enforce_retention(self, now: Optional[float] = None) -> int:
+        """
+        Drops the partitions of every tier that lie entirely outside its retention.
+
+        Args:
+            now: Reference time, epoch seconds; defaults to the latest quote ingested (so a
+                backfill of old data keeps it), or the current time before any
+
+        Returns:
+            Number of tables dropped
+        """
+        if now is None:
+            now = time.time() if self._last_ts is None else self._last_ts
+        dropped = 0
+        for tier in self.tiers:
+            prefix = f"q{tier.resolution}_"
+            for table in sorted(t for t in self._tables if t.startswith(prefix)):
+                end = (int(table[len(prefix):]) + 1) * tier.partition_seconds
+                if end <= now - tier.retention_seconds:
+                    self.db.execute(f"DROP TABLE {table}")
+                    self._tables.discard(table)
+                    dropped += 1
+        if dropped:
+            self.db.commit()
+            logger.info(f"Dropped {dropped} time series partitions past retention")
+        return dropped
+
+    def series(
+        self,
+        market_id: str,
+        start: float,
+        end: float,
+        resolution: Optional[int] = None,
+        max_points: int = 2000
+    ) -> List[QuotePoint]:
+        """
+        Returns a market's quotes (or buckets starting) in [start, end), oldest first.
+
+        Args:
+            market_id: Alpha market ID
+            start: Range start, epoch seconds
+            end: Range end, epoch seconds
+            resolution: Tier resolution to read; by default the finest one still holding
+                `start` with at most about `max_points` points
+            max_points: Point budget used to pick the tier
+
+        Returns:
+            List of QuotePoint
+        """
+        return self.series_many([market_id], start, end, resolution, max_points).get(market_id, [])
+
+    def series_many(
+        self,
+        market_ids: Iterable[str],
+        start: float,
+        end: float,
+        resolution: Optional[int] = None,
+        max_points: int = 2000
+    ) -> Dict[str, List[QuotePoint]]:
+        """
+        Returns the quotes in [start, end) of many markets, oldest first per market.
+
+        Args:
+            market_ids: Alpha market IDs; unknown ones are left out of the result
+            start: Range start, epoch seconds
+            end: Range end, epoch seconds
+            resolution: Tier resolution to read; by default picked as in `series`
+            max_points: Point budget per market used to pick the tier
+
+        Returns:
+            Dict of market ID to list of QuotePoint
+        """
+        tier = self._pick_tier(start, end, resolution, max_points)
+        names = {self._series[m]: m for m in market_ids if m in self._series}
+        result: Dict[str, List[QuotePoint]] = {market_id: [] for market_id in names.values()}
+        if tier.resolution:
+            query = ("SELECT series_id, ts, bid, ask, fair, n, mid_n, mid_sum, mid_min, mid_max, fair_sum "
+                     "FROM {table} WHERE series_id IN ({ids}) AND ts >= ? AND ts < ? ORDER BY series_id, ts")
+        else:
+            query = ("SELECT series_id, ts, bid, ask, fair FROM {table} "
+                     "WHERE series_id IN ({ids}) AND ts >= ? AND ts < ? ORDER BY series_id, ts")
+        for rows in self._select(tier, query, list(names), start, end):
+            for row in rows:
+                bid, ask = _probability(row[2]), _probability(row[3])
+                fair = row[4] / MICRO_UNIT
+                if tier.resolution:
+                    mid = row[7] / row[6] / MICRO_UNIT if row[6] else None
+                    point = QuotePoint(row[1], bid, ask, mid, fair, row[10] / row[5] / MICRO_UNIT,
+                                       _probability(row[8]), _probability(row[9]), row[5])
+                else:
+                    mid = (bid + ask) / 2 if bid is not None and ask is not None else None
+                    point = QuotePoint(row[1] / RAW_TS_UNIT, bid, ask, mid, fair, fair, mid, mid, 1)
+                result[names[row[0]]].append(point)
+        return result
+
+    def summary(
+        self,
+        market_ids: Iterable[str],
+        start: float,
+        end: float,
+        resolution: Optional[int] = None,
+        max_points: int = 2000
+    ) -> Dict[str, QuoteSummary]:
+        """
+        Averages many markets' midpoint, fair value and their gap over [start, end), in SQL.
+
+        Args:
+            market_ids: Alpha market IDs; unknown ones and ones without quotes are left out
+            start: Range start, epoch seconds
+            end: Range end, epoch seconds
+            resolution: Tier resolution to read; by default picked as in `series`
+            max_points: Point budget per market used to pick the tier
+
+        Returns:
+            Dict of market ID to QuoteSummary
+        """
+        tier = self._pick_tier(start, end, resolution, max_points)
+        names = {self._series[m]: m for m in market_ids if m in self._series}
+        if tier.resolution:
+            columns = "sum(n), sum(mid_n), sum(mid_sum), sum(gap_sum), sum(fair_sum)"
+        else:
+            # Integer division by 2 matches the midpoint downsampled into the bucket tiers
+            columns = "count(*), count(bid + ask), sum((bid + ask) / 2), sum((bid + ask) / 2 - fair), sum(fair)"
+        query = (f"SELECT series_id, {columns} FROM {{table}} "
+                 "WHERE series_id IN ({ids}) AND ts >= ? AND ts < ? GROUP BY series_id")
+        totals: Dict[int, List[int]] = {}
+        for rows in self._select(tier, query, list(names), start, end):
+            for series_id, *values in rows:
+                total = totals.setdefault(series_id, [0, 0, 0, 0, 0])
+                for index, value in enumerate(values):
+                    total[index] += value or 0
+        return {
+            names[series_id]: QuoteSummary(
+                samples=n,
+                mid=mid_sum / mid_n / MICRO_UNIT if mid_n else None,
+                fair=fair_sum / n / MICRO_UNIT,
+                gap=gap_sum / mid_n / MICRO_UNIT if mid_n else None
+            )
+            for series_id, (n, mid_n, mid_sum, gap_sum, fair_sum) in totals.items() if n
+        }
+
+    def _series_id(self, quote: PairQuote) -> int:
+        """Returns a market's series ID, registering the market on first use; its row is written on flush."""
+        series_id = self._series.get(quote.market_id)
+        if series_id is None:
+            series_id = self._series[quote.market_id] = self._next_series_id
+            self._next_series_id += 1
+            self._new_series.append((series_id, quote.market_id, quote.event_id))
+        return series_id
+
+    @staticmethod
+    def _table(tier: Tier, second: int) -> str:
+        return f"q{tier.resolution}_{second // tier.partition_seconds}"
+
+    def _create(self, table: str) -> None:
+        if table not in self._tables:
+            columns = BUCKET_COLUMNS if not table.startswith("q0_") else RAW_COLUMNS
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns}, PRIMARY KEY (series_id, ts)) WITHOUT ROWID")
+            self._tables.add(table)
+
+    def _pick_tier(self, start: float, end: float, resolution: Optional[int], max_points: int) -> Tier:
+        """Returns the tier to answer a range query from."""
+        if resolution is not None:
+            for tier in self.tiers:
+                if tier.resolution == resolution:
+                    return tier
+            raise ValueError(f"No time series tier with resolution {resolution}")
+        for tier in self.tiers:
+            points = (end - start) / (tier.resolution or self.tick_seconds)
+            # Retention drops whole partitions, so a tier holds `start` if its partition exists
+            if points <= max_points and self._table(tier, int(start)) in self._tables:
+                return tier
+        return self.tiers[-1]
+
+    def _select(self, tier: Tier, query: str, series_ids: List[int], start: float, end: float) -> Iterable[List[Tuple]]:
+        """Runs a query over every partition of a tier overlapping [start, end), in ID chunks."""
+        if not series_ids:
+            return
+        scale = 1 if tier.resolution else RAW_TS_UNIT
+        for partition in range(int(start) // tier.partition_seconds, int(end - 1) // tier.partition_seconds + 1):
+            table = f"q{tier.resolution}_{partition}"
+            if table not in self._tables:
+                continue
+            for offset in range(0, len(series_ids), ID_CHUNK):
+                chunk = series_ids[offset:offset + ID_CHUNK]
+                sql = query.format(table=table, ids=", ".join("?" * len(chunk)))
+                yield self.db.execute(sql, (*chunk, int(start * scale), int(end * scale))).fetchall()
+
+async def flush_periodically(store: TimeSeriesStore, interval_seconds: Optional[float] = None) -> None:
+    """
+    Flushes a store's due quotes every `interval_seconds` until cancelled, so buffered quotes
+    are written when ticks stop (e.g. while pairs are re-matched) instead of waiting for the next one.
+    Writes run in a worker thread (see `TimeSeriesStore.flush_async`).
+
+    Args:
+        store: The store to flush
+        interval_seconds: Check interval; defaults to the store's `flush_seconds`
+    """
+    while True:
+        await asyncio.sleep(interval_seconds or store.flush_seconds)
+        try:
+            if store.flush_due():
+                await store.flush_async()
+        except Exception as e:
+            logger.error(f"Failed to flush the time series store: {str(e)}")
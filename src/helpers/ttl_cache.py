@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from helpers.log_helpers import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a TTLCache."""
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served from the cache, fresh or stale."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / lookups if lookups else 0.0
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+
+class TTLCache:
+    """
+    LRU cache whose entries expire after a TTL, with optional stale-while-revalidate.
+
+    Within `ttl_seconds` of being stored an entry is served as-is. For a further
+    `stale_seconds` it is still served, while a single background task refreshes it.
+    After that the lookup waits for a fresh value. Concurrent misses for the same key
+    share one fetch.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        stale_seconds: float = 0.0,
+        max_entries: int = 128,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: How long an entry is fresh
+            stale_seconds: How long after expiry an entry may still be served while it refreshes
+            max_entries: Maximum number of entries before the least recently used one is evicted
+            clock: Monotonic time source in seconds
+        """
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns a fresh cached value without fetching, or `default`."""
+        entry = self._entries.get(key)
+        if entry is None or self.clock() - entry.stored_at >= self.ttl_seconds:
+            self.stats.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value, evicting the least recently used entry if the cache is full."""
+        self._entries[key] = _Entry(value, self.clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drops one entry, or every entry when no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached value for a key, fetching it when missing or expired.
+
+        Args:
+            key: Cache key
+            fetch: Coroutine factory producing a fresh value; None results are not cached
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self.clock() - entry.stored_at
+            if age < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry.value
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._entries.move_to_end(key)
+                self.stats.stale_hits += 1
+                if key not in self._inflight:
+                    task = asyncio.create_task(self._fetch(key, fetch))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_done)
+                    self.stats.refreshes += 1
+                return entry.value
+
+        self.stats.misses += 1
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        return await self._fetch(key, fetch)
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs a fetch, sharing its result with concurrent lookups, and stores the value."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved so an unawaited refresh does not warn
+            future.exception()
+            raise
+        else:
+            if value is not None:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        """Forgets a finished background refresh, logging it if it failed."""
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background cache refresh failed: {task.exception()}")
@@ -1,49 +1,166 @@
 import asyncio
+import os
+from functools import partial
+from typing import Optional, Union
+from config import get_settings
 from helpers.algorand_helper import AlgorandHelper
 from helpers.alpha_helper import AlphaHelper
+from helpers.capture import CaptureWriter, CapturingDataSource
+from helpers.http_client import get_http_client
+from helpers.log_helpers import configure_logging, get_logger
+from helpers.market_matcher import MarketMatcher
+from helpers.metrics import MetricsServer, get_metrics, log_metrics_summary
 from helpers.odds_helper import OddsAPIHelper
-from math import log10, floor
+from helpers.order_registry import OrderRegistry
+from helpers.scanner import ArbitrageScanner, LiveDataSource, load_scan_pairs
+from helpers.sharding import ShardedScanner, live_shard_source
+from helpers.timeseries import TimeSeriesStore, flush_periodically
+from models.signal import EdgeSignal
+
+logger = get_logger(__name__, print_to_console=True)
+
+def log_signal(signal: EdgeSignal):
+    """Logs an edge signal found by the scanner."""
+    action = "BUY" if signal.side == 1 else "SELL"
+    outcome = "YES" if signal.position == 1 else "NO"
+    logger.info(
+        f"Signal: {action} {outcome} {signal.quantity:g} @ {signal.price:.4f} on market {signal.market_id} "
+        f"(event {signal.event_id}): fair {signal.fair_probability:.4f}, fee {signal.fee:.4f}, "
+        f"edge {signal.edge:.4f}"
+    )
+
+async def refresh_matches(
+    matcher: MarketMatcher,
+    scanner: Union[ArbitrageScanner, ShardedScanner],
+    interval_seconds: float,
+    capture: Optional[CaptureWriter] = None
+):
+    """Periodically re-matches live markets and hands the new pairs to the scanner."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            pairs = await matcher.refresh()
+            scanner.set_pairs(pairs)
+            if capture is not None:
+                capture.record_pairs(pairs)
+        except Exception as e:
+            logger.error(f"Failed to refresh market matches: {str(e)}")
 
 async def main():
+    settings = get_settings()
+    configure_logging(level=settings.LOG_LEVEL, sample_rates=settings.LOG_SAMPLE_RATES)
 
-    MARKET_ID = "01JP1N3DYCC3HA7C1JD2FQHG6P" 
-    ODDS_MARKET_ID = "fe3e8dc29347048c12b0e42752801b15"
+    # Latency histograms and counters, served at http://127.0.0.1:METRICS_PORT/metrics
+    metrics_server = None
+    summary_task = None
+    if settings.METRICS_ENABLED:
+        get_metrics().enabled = True
+        metrics_server = MetricsServer(port=settings.METRICS_PORT)
+        await metrics_server.start()
+        summary_task = asyncio.create_task(log_metrics_summary(settings.METRICS_SUMMARY_SECONDS))
 
-    # Initialize the helpers
-    algo = AlgorandHelper()
-    alpha = AlphaHelper()
+    # Initialize the helpers; our open orders are shared between them, so orders placed through
+    # `algorand` are recorded in the registry and orderbook syncs keep their fills current
+    order_registry = OrderRegistry(settings.ORDER_REGISTRY_PATH or None)
+    alpha = AlphaHelper(
+        market_volatile_ttl_seconds=settings.MARKET_VOLATILE_TTL_SECONDS,
+        order_registry=order_registry
+    )
+    algorand = AlgorandHelper(order_registry=order_registry)
     odds = OddsAPIHelper()
 
-    # Get market information # Replace with actual market ID
-    market = await alpha.get_market_info(MARKET_ID)
+    # Orders loaded from the last run may have been filled or cancelled since
+    try:
+        await asyncio.to_thread(alpha.reconcile_orders)
+    except Exception as e:
+        logger.error(f"Failed to reconcile open orders: {str(e)}")
+    logger.info(f"Tracking {len(algorand.order_registry)} open orders")
 
-    # Get odds for sports
-    matchup_odds = odds.get_matchup_odds(
-        sport="baseball_mlb",  
-        event_id=ODDS_MARKET_ID
-    )
+    # Alpha market / Odds API event pairs to scan: a hand-written pairs file takes precedence,
+    # otherwise live markets are matched to Odds API events automatically
+    matcher = None
+    if os.path.exists(settings.SCAN_PAIRS_FILE):
+        pairs = load_scan_pairs(settings.SCAN_PAIRS_FILE)
+    else:
+        matcher = MarketMatcher(
+            alpha=alpha,
+            odds=odds,
+            sports=[s.strip() for s in settings.SCAN_SPORTS.split(",") if s.strip()],
+            index_path=settings.MATCH_INDEX_FILE,
+            match_window_hours=settings.MATCH_WINDOW_HOURS
+        )
+        pairs = await matcher.refresh()
+    logger.info(f"Scanning {len(pairs)} pairs every {settings.INTERVAL_SECONDS}s")
 
-    # get current orderbook
-    alpha_orderbook = alpha.get_orderbook(
-        market_app_id=market.marketAppId
-    )
-    
-    # create a bet
-    escrow_app_id = await algo.create_bet(
-        is_buying=True, 
-        quantity=1, 
-        price=0.10, 
-        position=0, 
-        slippage=0, 
-        market=market
-    )
-    print(f"Escrow App ID: {escrow_app_id}")
-    
-    cancel_id = await algo.cancel_bet(
-        escrow_app_id=escrow_app_id,
-        market=market
-    )
-    print(f"Cancel ID: {cancel_id}")
+    # Every snapshot the scanner sees can be captured for offline replay (see backtest.py)
+    source = LiveDataSource(alpha, odds)
+    capture = None
+    if settings.CAPTURE_DIR and settings.SCAN_WORKERS > 0:
+        logger.warning("CAPTURE_DIR is not supported with SCAN_WORKERS; capture is disabled")
+    elif settings.CAPTURE_DIR:
+        capture = CaptureWriter(settings.CAPTURE_DIR)
+        capture.record_pairs(pairs)
+        source = CapturingDataSource(source, capture)
+
+    # Per-tick top of book and fair value of every pair, queryable by time range
+    history = None
+    history_task = None
+    if settings.HISTORY_DB:
+        history = TimeSeriesStore(settings.HISTORY_DB, tick_seconds=settings.INTERVAL_SECONDS)
+        history_task = asyncio.create_task(flush_periodically(history))
+
+    # With SCAN_WORKERS set, pairs are partitioned across worker processes that each own
+    # their markets' orderbooks; odds are still fetched once per sport by this process
+    on_quotes = history.ingest_async if history is not None else None
+    if settings.SCAN_WORKERS > 0:
+        scanner = ShardedScanner(
+            pairs=pairs,
+            odds=odds,
+            source_factory=partial(live_shard_source,
+                                   market_volatile_ttl_seconds=settings.MARKET_VOLATILE_TTL_SECONDS),
+            workers=settings.SCAN_WORKERS,
+            edge_threshold=settings.EDGE_THRESHOLD,
+            devig_method=settings.DEVIG_METHOD,
+            source_timeout=settings.SOURCE_TIMEOUT_SECONDS,
+            on_signal=log_signal,
+            on_quotes=on_quotes,
+            log_level=settings.LOG_LEVEL,
+            log_sample_rates=settings.LOG_SAMPLE_RATES
+        )
+    else:
+        scanner = ArbitrageScanner(
+            pairs=pairs,
+            source=source,
+            edge_threshold=settings.EDGE_THRESHOLD,
+            devig_method=settings.DEVIG_METHOD,
+            source_timeout=settings.SOURCE_TIMEOUT_SECONDS,
+            on_signal=log_signal,
+            on_quotes=on_quotes
+        )
+
+    refresh_task = None
+    if matcher is not None:
+        refresh_task = asyncio.create_task(refresh_matches(matcher, scanner, settings.MATCH_REFRESH_SECONDS, capture))
+
+    try:
+        await scanner.run(interval_seconds=settings.INTERVAL_SECONDS)
+    finally:
+        if refresh_task is not None:
+            refresh_task.cancel()
+        if isinstance(scanner, ShardedScanner):
+            await scanner.close()
+        if summary_task is not None:
+            summary_task.cancel()
+        if metrics_server is not None:
+            await metrics_server.close()
+        if capture is not None:
+            capture.close()
+        if history_task is not None:
+            history_task.cancel()
+        if history is not None:
+            history.close()
+        order_registry.save_if_dirty()
+        await get_http_client().aclose()
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())
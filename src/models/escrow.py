@@ -0,0 +1,69 @@
+import base64
+from typing import Any, Dict, Optional
+
+from algosdk import encoding
+
+class EscrowState:
+    """
+    Compact decoded global state of a single escrow (resting order) application.
+
+    Uint fields are stored as plain ints. The owner is kept as the raw base64 value from the
+    indexer and only encoded to an Algorand address when `owner` is first read.
+    """
+    __slots__ = (
+        "app_id", "price", "quantity", "quantity_filled", "side", "position", "slippage",
+        "asset_listed", "market_app_id", "fee_timer_start", "_owner_b64", "_owner"
+    )
+
+    def __init__(self, app_id: int = 0):
+        self.app_id = app_id
+        self.price = 0
+        self.quantity = 0
+        self.quantity_filled = 0
+        self.side = -1  # 1 for buy, 0 for sell
+        self.position = -1  # 1 for YES, 0 for NO
+        self.slippage = 0
+        self.asset_listed = 0
+        self.market_app_id = 0
+        self.fee_timer_start = 0
+        self._owner_b64: Optional[str] = None
+        self._owner: Optional[str] = None
+
+    @property
+    def owner(self) -> Optional[str]:
+        """The owner's Algorand address, or the raw base64 value if it is not a 32-byte key."""
+        if self._owner is None and self._owner_b64 is not None:
+            address_bytes = base64.b64decode(self._owner_b64)
+            self._owner = encoding.encode_address(address_bytes) if len(address_bytes) == 32 else self._owner_b64
+        return self._owner
+
+    @property
+    def remaining(self) -> int:
+        """Unfilled quantity in micro-units."""
+        return self.quantity - self.quantity_filled
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access, for code written against the decoded global state dicts."""
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the state as a dict keyed like the escrow's global state."""
+        return {
+            "price": self.price,
+            "quantity": self.quantity,
+            "quantity_filled": self.quantity_filled,
+            "side": self.side,
+            "position": self.position,
+            "slippage": self.slippage,
+            "asset_listed": self.asset_listed,
+            "market_app_id": self.market_app_id,
+            "fee_timer_start": self.fee_timer_start,
+            "owner": self.owner,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"EscrowState(app_id={self.app_id}, price={self.price}, quantity={self.quantity}, "
+            f"quantity_filled={self.quantity_filled}, side={self.side}, position={self.position}, "
+            f"slippage={self.slippage})"
+        )
@@ -1,4 +1,5 @@
-from typing import Optional, List, Dict
+import time
+from typing import Any, Optional, List, Dict
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
 
@@ -77,4 +78,48 @@ class Market(BaseModel):
 
     class Config:
         """Pydantic model configuration."""
-        arbitrary_types_allowed = True 
\ No newline at end of file
+        arbitrary_types_allowed = True
+
+class MarketCore:
+    """
+    The market fields the trading path reads, without pydantic validation.
+
+    Fields are named as in Market. `IMMUTABLE_FIELDS` never change for the life of a market;
+    `VOLATILE_FIELDS` are refreshed from later market records with `update_volatile`.
+    """
+    IMMUTABLE_FIELDS = (
+        "id", "marketAppId", "yesAssetId", "noAssetId", "feeBasePercent", "feeTimerThreshhold",
+        "liveTs", "endTs"
+    )
+    VOLATILE_FIELDS = (
+        "yesProb", "noProb", "currentMidpoint", "currentSpread", "lastTradePrice", "volume", "updatedAt"
+    )
+    __slots__ = IMMUTABLE_FIELDS + VOLATILE_FIELDS + ("refreshed_at",)
+
+    def __init__(self, **fields: Any):
+        for name in self.IMMUTABLE_FIELDS + self.VOLATILE_FIELDS:
+            setattr(self, name, fields.get(name))
+        self.refreshed_at = time.time()
+
+    @classmethod
+    def from_record(cls, data: Dict[str, Any]) -> "MarketCore":
+        """Builds a MarketCore from a raw Alpha API market record, ignoring every other field."""
+        return cls(**{name: data.get(name) for name in cls.IMMUTABLE_FIELDS + cls.VOLATILE_FIELDS})
+
+    def update_volatile(self, data: Dict[str, Any]) -> None:
+        """Refreshes the volatile fields from a raw Alpha API market record."""
+        for name in self.VOLATILE_FIELDS:
+            setattr(self, name, data.get(name))
+        self.refreshed_at = time.time()
+
+    def is_ended(self, now_ms: Optional[int] = None) -> bool:
+        """Whether the market's end time has passed."""
+        if self.endTs is None:
+            return False
+        return self.endTs <= (now_ms if now_ms is not None else int(time.time() * 1000))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"MarketCore(id={self.id!r}, marketAppId={self.marketAppId}, endTs={self.endTs})"
@@ -0,0 +1,30 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+from models.signal import ScanPair
+
+@dataclass
+class MarketMatch:
+    """An Alpha market matched to the Odds API event it resolves on."""
+    market_id: str
+    market_app_id: int
+    sport: str
+    event_id: str
+    home_team: str
+    away_team: str
+    commence_time: str  # ISO 8601, as returned by the Odds API
+    yes_outcome: str  # Odds API outcome name that resolves the market YES
+    yes_is_home: bool
+    matched_at: float  # Unix time
+
+    def to_scan_pair(self) -> ScanPair:
+        """Returns the ScanPair the scanner needs for this match."""
+        return ScanPair(
+            market_id=self.market_id,
+            sport=self.sport,
+            event_id=self.event_id,
+            yes_outcome=self.yes_outcome
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
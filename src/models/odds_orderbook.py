@@ -62,4 +62,26 @@ class OddsOrderbook(BaseModel):
     commence_time: datetime = Field(description="When the event starts")
     home_team: str = Field(description="Name of the home team")
     away_team: str = Field(description="Name of the away team")
-    bookmakers: List[Bookmaker] = Field(description="List of bookmakers offering odds for this event")
\ No newline at end of file
+    bookmakers: List[Bookmaker] = Field(description="List of bookmakers offering odds for this event")
+
+class OddsQuota(BaseModel):
+    """
+    Tracks Odds API quota usage as reported by the response headers.
+    
+    Attributes:
+        requests_remaining (Optional[int]): Quota units left in the current period (x-requests-remaining)
+        requests_used (Optional[int]): Quota units used in the current period (x-requests-used)
+        last_cost (Optional[int]): Quota units charged for the latest call (x-requests-last)
+        calls_made (int): Number of odds calls made by this process
+        events_fetched (int): Number of events returned across those calls
+    """
+    requests_remaining: Optional[int] = Field(None, description="Quota units left in the current period")
+    requests_used: Optional[int] = Field(None, description="Quota units used in the current period")
+    last_cost: Optional[int] = Field(None, description="Quota units charged for the latest call")
+    calls_made: int = Field(0, description="Number of odds calls made by this process")
+    events_fetched: int = Field(0, description="Number of events returned across those calls")
+
+    @property
+    def calls_saved(self) -> int:
+        """Calls avoided compared to fetching every returned event with its own request."""
+        return max(self.events_fetched - self.calls_made, 0)
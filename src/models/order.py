@@ -0,0 +1,71 @@
+import asyncio
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+@dataclass
+class OrderRequest:
+    """A limit order to place on an Alpha market, in standard units as taken by AlgorandHelper.create_bet."""
+    is_buying: bool
+    quantity: float  # Tokens to trade
+    price: float  # USDC per token
+    position: int  # 1 for YES, 0 for NO
+    slippage: float = 0  # Percentage; 0 rests the order in the book
+
+class SubmissionStatus:
+    """States of a submitted transaction group."""
+    PENDING = "pending"
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+
+@dataclass
+class SubmissionHandle:
+    """A transaction group sent through the SubmissionPipeline, updated as it settles."""
+    label: str
+    tx_ids: List[str]
+    last_valid_round: int
+    submitted_at: float
+    status: str = SubmissionStatus.PENDING
+    confirmed_round: Optional[int] = None
+    confirmed_at: Optional[float] = None
+    error: Optional[str] = None
+    # Set when the group settles: the AtomicTransactionResponse with ABI results, or the error
+    done: Optional["asyncio.Future"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def tx_id(self) -> str:
+        """ID of the group's first transaction, which identifies the group."""
+        return self.tx_ids[0]
+
+    @property
+    def settled(self) -> bool:
+        return self.status != SubmissionStatus.PENDING
+
+@dataclass
+class OpenOrder:
+    """One of our own escrows (resting orders), in micro-units like EscrowState."""
+    escrow_app_id: int
+    market_app_id: int
+    position: int  # 1 for YES, 0 for NO
+    side: int  # 1 for buy, 0 for sell
+    price: int
+    quantity: int
+    quantity_filled: int = 0
+    slippage: int = 0
+    created_round: int = 0
+    checked_round: int = 0  # Last round the escrow's state was read from chain
+
+    @property
+    def remaining(self) -> int:
+        """Unfilled quantity in micro-units."""
+        return self.quantity - self.quantity_filled
+
+    @property
+    def is_filled(self) -> bool:
+        return self.quantity_filled >= self.quantity
+
+    @property
+    def is_partially_filled(self) -> bool:
+        return 0 < self.quantity_filled < self.quantity
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
@@ -1,7 +1,13 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from sortedcontainers import SortedList
+
+MICRO_UNIT = 1_000_000  # 1 USDC = 1_000_000 microUSDC
+MAX_PRICE = MICRO_UNIT  # Highest valid price level: a share pays out at most 1 USDC
+FENWICK_SIZE = 1 << MAX_PRICE.bit_length()  # Power of two covering every valid price
+
 @dataclass
 class OrderbookEntry:
     """Represents a single entry in the orderbook with price, quantity, and total value."""
@@ -15,9 +21,278 @@ class OrderbookEntry:
         if not self.total:
             self.total = self.price * self.quantity
 
+class PriceLevels:
+    """
+    Sorted price levels for one side of one position, in micro-units.
+
+    Prices are kept in a SortedList and quantities in a dict keyed by price, and a sparse
+    Fenwick tree over the price range holds cumulative quantities. Best price lookups are
+    O(1); adding, updating or removing a level is O(log n) in the number of levels; depth up
+    to any price reads at most log2(MAX_PRICE) (20) tree nodes, however many levels the side
+    holds. Prices must lie in 1..MAX_PRICE: a share never costs more than 1 USDC.
+    """
+    def __init__(self, descending: bool = False):
+        """
+        Args:
+            descending: True for bids (best price is the highest), False for asks
+        """
+        self.descending = descending
+        self._prices = SortedList()
+        self._quantities: Dict[int, int] = {}
+        self._tree: Dict[int, int] = {}  # Fenwick tree node -> quantity, only nodes ever touched
+        self._total = 0
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __contains__(self, price: int) -> bool:
+        return price in self._quantities
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Iterates (price, quantity) pairs from the best price outwards."""
+        prices = reversed(self._prices) if self.descending else self._prices
+        for price in prices:
+            yield price, self._quantities[price]
+
+    def quantity(self, price: int) -> int:
+        """Returns the quantity resting at a price level (0 if empty)."""
+        return self._quantities.get(price, 0)
+
+    def set(self, price: int, quantity: int) -> None:
+        """
+        Sets the quantity at a price level, removing the level when quantity is not positive.
+
+        Raises:
+            ValueError: If the price is outside 1..MAX_PRICE
+        """
+        if quantity <= 0:
+            self.remove(price)
+            return
+        previous = self._quantities.get(price)
+        if previous is None:
+            if not 0 < price <= MAX_PRICE:
+                raise ValueError(f"Price {price} is outside 1..{MAX_PRICE} micro-units")
+            self._prices.add(price)
+            previous = 0
+        self._quantities[price] = quantity
+        self._update(price, quantity - previous)
+
+    def add(self, price: int, delta: int) -> None:
+        """Adds (or with a negative delta, removes) quantity at a price level."""
+        self.set(price, self._quantities.get(price, 0) + delta)
+
+    def remove(self, price: int) -> None:
+        """Removes a price level entirely."""
+        quantity = self._quantities.pop(price, None)
+        if quantity is None:
+            return
+        self._prices.remove(price)
+        self._update(price, -quantity)
+
+    def load(self, prices: List[int], quantities: List[int]) -> None:
+        """
+        Replaces every price level with `prices` and their matching `quantities`.
+
+        Raises:
+            ValueError: If a price is outside 1..MAX_PRICE
+        """
+        if prices and not (0 < min(prices) and max(prices) <= MAX_PRICE):
+            raise ValueError(f"Prices must lie in 1..{MAX_PRICE} micro-units")
+        self._prices = SortedList(prices)
+        self._quantities = dict(zip(prices, quantities))
+        self._tree = {}
+        self._total = 0
+        for price, quantity in self._quantities.items():
+            self._update(price, quantity)
+
+    def clear(self) -> None:
+        """Removes every price level."""
+        self._prices.clear()
+        self._quantities.clear()
+        self._tree.clear()
+        self._total = 0
+
+    def best(self) -> Optional[Tuple[int, int]]:
+        """Returns the best (price, quantity) pair, or None if the side is empty."""
+        if not self._prices:
+            return None
+        price = self._prices[-1] if self.descending else self._prices[0]
+        return price, self._quantities[price]
+
+    def depth(self, price: int) -> int:
+        """Returns the cumulative quantity from the best price up to and including `price`."""
+        if self.descending:
+            return self._total - self._prefix(price - 1)
+        return self._prefix(price)
+
+    def _update(self, price: int, delta: int) -> None:
+        """Adds `delta` to the cumulative quantities of every price from `price` up."""
+        self._total += delta
+        node = price
+        while node <= FENWICK_SIZE:
+            self._tree[node] = self._tree.get(node, 0) + delta
+            node += node & -node
+
+    def _prefix(self, price: int) -> int:
+        """Returns the total quantity at prices up to and including `price`."""
+        total = 0
+        node = min(price, FENWICK_SIZE)
+        while node > 0:
+            total += self._tree.get(node, 0)
+            node -= node & -node
+        return total
+
+    def copy(self) -> "PriceLevels":
+        """Returns an independent copy of these price levels."""
+        levels = PriceLevels(self.descending)
+        levels._prices = self._prices.copy()
+        levels._quantities = dict(self._quantities)
+        levels._tree = dict(self._tree)
+        levels._total = self._total
+        return levels
+
+class LevelBook:
+    """Sorted price levels for the bids and asks of both YES and NO positions, in micro-units."""
+    def __init__(self):
+        # Keyed by (position, side): position 1 for YES, 0 for NO; side 1 for buy, 0 for sell
+        self.sides: Dict[Tuple[int, int], PriceLevels] = {
+            (position, side): PriceLevels(descending=side == 1)
+            for position in (0, 1) for side in (0, 1)
+        }
+
+    def levels(self, position: int, side: int) -> PriceLevels:
+        """Returns the price levels for a position (1 YES, 0 NO) and side (1 buy, 0 sell)."""
+        return self.sides[(position, side)]
+
+    def best_bid(self, position: int) -> Optional[int]:
+        """Returns the highest bid price for a position, or None."""
+        best = self.sides[(position, 1)].best()
+        return best[0] if best else None
+
+    def best_ask(self, position: int) -> Optional[int]:
+        """Returns the lowest ask price for a position, or None."""
+        best = self.sides[(position, 0)].best()
+        return best[0] if best else None
+
+    def midpoint(self, position: int) -> Optional[float]:
+        """Returns the midpoint between best bid and best ask, or None if either side is empty."""
+        bid, ask = self.best_bid(position), self.best_ask(position)
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def spread(self, position: int) -> Optional[int]:
+        """Returns best ask minus best bid, or None if either side is empty."""
+        bid, ask = self.best_bid(position), self.best_ask(position)
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def depth(self, position: int, side: int, price: int) -> int:
+        """Returns the cumulative quantity resting from the best price up to `price`."""
+        return self.sides[(position, side)].depth(price)
+
+    def copy(self) -> "LevelBook":
+        """Returns an independent copy of the book."""
+        book = LevelBook()
+        book.sides = {key: levels.copy() for key, levels in self.sides.items()}
+        return book
+
+    def load_entries(self, position: int, sides: Optional[Dict[str, List[OrderbookEntry]]]) -> None:
+        """Replaces a position's levels with {"bids": [...], "asks": [...]} OrderbookEntry lists in standard units."""
+        for side, name in ((1, "bids"), (0, "asks")):
+            levels = self.sides[(position, side)]
+            levels.clear()
+            for entry in (sides or {}).get(name, []):
+                levels.add(round(entry.price * MICRO_UNIT), round(entry.quantity * MICRO_UNIT))
+
+    @classmethod
+    def from_entries(cls, yes: Dict[str, List[OrderbookEntry]], no: Dict[str, List[OrderbookEntry]]) -> "LevelBook":
+        """Builds a level book from OrderbookEntry lists given in standard units."""
+        book = cls()
+        book.load_entries(1, yes)
+        book.load_entries(0, no)
+        return book
+
 class OrderBook:
-    """Represents a complete orderbook with yes and no markets."""
-    def __init__(self, yes: Dict[str, List[OrderbookEntry]], no: Dict[str, List[OrderbookEntry]]):
-        self.yes = yes
-        self.no = no
+    """
+    Represents a complete orderbook with yes and no markets.
+
+    `yes` and `no` keep their original shape, {"bids": [...], "asks": [...]} of OrderbookEntry
+    in standard units, built from the sorted LevelBook held in `levels`: bids are listed from
+    the highest price and asks from the lowest (equal prices given separately are merged into
+    one entry). Assigning `yes` or `no` replaces that position's levels. The lists are built on
+    first access and do not track later edits to them or to `levels`; assign to change a book.
+    """
+    def __init__(
+        self,
+        yes: Optional[Dict[str, List[OrderbookEntry]]] = None,
+        no: Optional[Dict[str, List[OrderbookEntry]]] = None,
+        levels: Optional[LevelBook] = None
+    ):
+        if levels is None:
+            levels = LevelBook.from_entries(yes, no)
+        self.levels = levels
+        self._yes: Optional[Dict[str, List[OrderbookEntry]]] = None
+        self._no: Optional[Dict[str, List[OrderbookEntry]]] = None
         self.timestamp = datetime.now()
+
+    @property
+    def yes(self) -> Dict[str, List[OrderbookEntry]]:
+        if self._yes is None:
+            self._yes = self._view(position=1)
+        return self._yes
+
+    @yes.setter
+    def yes(self, entries: Dict[str, List[OrderbookEntry]]) -> None:
+        self.levels.load_entries(1, entries)
+        self._yes = None
+
+    @property
+    def no(self) -> Dict[str, List[OrderbookEntry]]:
+        if self._no is None:
+            self._no = self._view(position=0)
+        return self._no
+
+    @no.setter
+    def no(self, entries: Dict[str, List[OrderbookEntry]]) -> None:
+        self.levels.load_entries(0, entries)
+        self._no = None
+
+    def _view(self, position: int) -> Dict[str, List[OrderbookEntry]]:
+        """Converts one position's price levels to OrderbookEntry lists in standard units."""
+        return {
+            name: [
+                OrderbookEntry(
+                    price=round(price / MICRO_UNIT, 6),
+                    quantity=round(quantity / MICRO_UNIT, 6),
+                    total=round((price * quantity) / (MICRO_UNIT ** 2), 6)
+                )
+                for price, quantity in self.levels.levels(position, side)
+            ]
+            for side, name in ((1, "bids"), (0, "asks"))
+        }
+
+    def best_bid(self, position: int = 1) -> Optional[float]:
+        """Returns the best bid price in standard units for a position (1 YES, 0 NO)."""
+        price = self.levels.best_bid(position)
+        return price / MICRO_UNIT if price is not None else None
+
+    def best_ask(self, position: int = 1) -> Optional[float]:
+        """Returns the best ask price in standard units for a position (1 YES, 0 NO)."""
+        price = self.levels.best_ask(position)
+        return price / MICRO_UNIT if price is not None else None
+
+    def midpoint(self, position: int = 1) -> Optional[float]:
+        """Returns the midpoint in standard units for a position (1 YES, 0 NO)."""
+        midpoint = self.levels.midpoint(position)
+        return midpoint / MICRO_UNIT if midpoint is not None else None
+
+    def spread(self, position: int = 1) -> Optional[float]:
+        """Returns the bid/ask spread in standard units for a position (1 YES, 0 NO)."""
+        spread = self.levels.spread(position)
+        return spread / MICRO_UNIT if spread is not None else None
+
+    def depth(self, position: int, side: int, price: float) -> float:
+        """Returns the cumulative quantity in standard units from the best price up to `price`."""
+        return self.levels.depth(position, side, round(price * MICRO_UNIT)) / MICRO_UNIT
@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+@dataclass
+class ScanPair:
+    """An Alpha market matched to an Odds API event."""
+    market_id: str
+    sport: str
+    event_id: str
+    yes_outcome: str  # Odds API outcome name that resolves the Alpha market YES
+
+@dataclass
+class EdgeSignal:
+    """A price on the Alpha orderbook that differs from bookmaker fair value by more than the threshold."""
+    market_id: str
+    event_id: str
+    position: int  # 1 for YES, 0 for NO
+    side: int  # 1 to buy (hit the ask), 0 to sell (hit the bid)
+    price: float
+    quantity: float
+    fair_probability: float
+    fee: float
+    edge: float
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass
+class PairQuote:
+    """A pair's Alpha top of book and bookmaker fair value at one tick, as YES probabilities."""
+    market_id: str
+    event_id: str
+    fair: float  # De-vigged consensus probability of YES
+    bid: Optional[float] = None  # Best price to sell YES at: the YES bid, or 1 - the NO ask
+    ask: Optional[float] = None  # Best price to buy YES at: the YES ask, or 1 - the NO bid
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    @property
+    def mid(self) -> Optional[float]:
+        """Midpoint between bid and ask, or None if either side is empty."""
+        if self.bid is None or self.ask is None:
+            return None
+        return (self.bid + self.ask) / 2
+
+@dataclass
+class TickStats:
+    """Timing of one scanner tick."""
+    started_at: datetime
+    duration_ms: float = 0.0
+    pairs_scanned: int = 0
+    pairs_skipped: int = 0
+    signals: int = 0
+    source_ms: Dict[str, float] = field(default_factory=dict)
+    timeouts: List[str] = field(default_factory=list)
+    slowest_pair: Optional[str] = None
+
+@dataclass
+class ReplayStats:
+    """Totals of one replay of captured market data."""
+    records: int = 0
+    ticks: int = 0
+    signals: int = 0
+    first_ts: Optional[float] = None  # Capture time of the first record replayed, in epoch seconds
+    last_ts: Optional[float] = None
+    wall_seconds: float = 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Captured time span replayed per second of wall time."""
+        if self.first_ts is None or self.last_ts is None or not self.wall_seconds:
+            return 0.0
+        return (self.last_ts - self.first_ts) / self.wall_seconds